@@ -0,0 +1,89 @@
+"""
+bench_history_count.py
+
+Compares the nested loop previously used by `ConditionHandler.calculate_signal_from_history`
+with the linear-time `signal_engine.count_history_signals` on a 24h OI history.
+
+Usage (from the project root):
+    python benchmarks/bench_history_count.py --points 288 --limit 7
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+os.environ.setdefault("TG_BOT_API_KEY", "benchmark")
+
+from app_logic.condition_handler import ConditionHandler
+from app_logic.signal_engine import count_history_signals
+
+STEP = 5 * 60 * 1000
+
+
+def make_history(points: int) -> tuple[list[int], list[float]]:
+    """Generates a descending 24h history with a few missing candles and rare OI spikes."""
+    timestamps, open_interest = [], []
+    ts = points * STEP
+    for _ in range(points):
+        timestamps.append(ts)
+        open_interest.append(random.uniform(0.99, 1.01) * (1.1 if random.random() < 0.02 else 1.0) * 1e6)
+        ts -= STEP * (2 if random.random() < 0.01 else 1)
+    return timestamps, open_interest
+
+
+def loop_count(handler: ConditionHandler, timestamps: list[int], open_interest: list[float],
+               limit: int, threshold: float) -> int:
+    """The original nested loop."""
+    count = 0
+    for i in range(len(timestamps) - (limit - 1)):
+        for j in range(1, limit):
+            if timestamps[i] - timestamps[i + j] != j * STEP:
+                continue
+            delta_oi = handler.delta_calculate(open_interest[i], open_interest[i + j])
+            if delta_oi is None or delta_oi <= threshold:
+                continue
+            count += 1
+            break
+    return count
+
+
+def best_of(func, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--points", type=int, default=288)
+    parser.add_argument("--limit", type=int, default=7)
+    parser.add_argument("--threshold", type=float, default=0.05)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    random.seed(42)
+    handler = ConditionHandler()
+    timestamps, open_interest = make_history(args.points)
+
+    expected = loop_count(handler, timestamps, open_interest, args.limit, args.threshold)
+    assert count_history_signals(timestamps, open_interest, args.limit, STEP, args.threshold) == expected
+
+    loop_time = best_of(lambda: loop_count(handler, timestamps, open_interest, args.limit, args.threshold),
+                        args.repeat)
+    linear_time = best_of(lambda: count_history_signals(timestamps, open_interest, args.limit, STEP,
+                                                        args.threshold), args.repeat)
+
+    print(f"points={args.points} limit={args.limit} threshold={args.threshold} signals={expected}")
+    print(f"nested loop:        {loop_time * 1e6:8.1f} us")
+    print(f"monotonic deques:   {linear_time * 1e6:8.1f} us  x{loop_time / linear_time:.1f}")
+
+
+if __name__ == "__main__":
+    main()
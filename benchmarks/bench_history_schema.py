@@ -0,0 +1,173 @@
+"""
+bench_history_schema.py
+
+Compares two layouts of the OI history with two days of history of N symbols:
+- text: one 'history_temp' table with symbol and exchange as TEXT on every row, a rowid and
+  two secondary indexes (the original layout);
+- encoded: integer ids from lookup tables in `WITHOUT ROWID` day partitions clustered on
+  (exchange_id, symbol_id, timestamp) (`hist_signal_db`).
+
+Reported: database file size, the best time to insert one cycle of rows, the time to read the
+24h history of every symbol (`get_historical_oi`), the time of the daily retention of the first
+day (`DELETE` vs dropping its partition), and the time `init_db()` takes to migrate the text database.
+
+The benchmark uses temporary databases, the application database is not touched.
+
+Usage (from the project root):
+    python benchmarks/bench_history_schema.py --symbols 1100 --cycles 576
+"""
+
+import argparse
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+os.environ.setdefault("TG_BOT_API_KEY", "benchmark")
+
+import aiosqlite
+from config import config
+from db import hist_signal_db
+
+STEP = 5 * 60 * 1000
+EXCHANGES = ["Binance", "Bybit"]
+
+
+def make_rows(symbols: int, cycle: int) -> list[tuple[str, str, int, float]]:
+    timestamp = cycle * STEP
+    return [(f"SYM{n}USDT", exchange, timestamp, 1000.0 + n) for exchange in EXCHANGES for n in range(symbols)]
+
+
+class TextLayout:
+    """The previous layout, accessed over one WAL connection like `hist_signal_db`."""
+
+    async def open(self, path: Path):
+        exists = path.exists()
+        self.db = await aiosqlite.connect(path)
+        await self.db.execute("PRAGMA journal_mode=WAL")
+        await self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.row_factory = aiosqlite.Row
+        if exists:
+            return
+        await self.db.execute("CREATE TABLE history_temp (id INTEGER PRIMARY KEY AUTOINCREMENT, symbol TEXT, "
+                              "exchange TEXT, timestamp INTEGER, open_interest REAL)")
+        await self.db.execute("CREATE INDEX idx_timestamp ON history_temp (timestamp)")
+        await self.db.execute("CREATE INDEX idx_symbol_exchange_time ON history_temp(symbol, exchange, timestamp)")
+        await self.db.commit()
+
+
+    async def insert(self, rows: list[tuple[str, str, int, float]]):
+        await self.db.executemany("INSERT INTO history_temp (symbol, exchange, timestamp, open_interest) "
+                                  "VALUES (?, ?, ?, ?)", rows)
+        await self.db.commit()
+
+
+    async def query(self, symbol: str, exchange: str, before_date: int) -> list[dict]:
+        async with self.db.execute("""
+            SELECT * FROM history_temp
+            WHERE symbol = ? AND exchange = ? AND timestamp <= ? AND timestamp >= ?
+            ORDER BY timestamp DESC
+        """, (symbol, exchange, before_date, before_date - 24 * 60 * 60 * 1000)) as cursor:
+            return [dict(row) for row in await cursor.fetchall()]
+
+
+    async def trim(self, current_timestamp: int):
+        threshold_timestamp = (current_timestamp - 24 * 60 * 60) * 1000
+        await self.db.execute("DELETE FROM history_temp WHERE timestamp < ?", (threshold_timestamp,))
+        await self.db.commit()
+
+
+    async def close(self):
+        await self.db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        await self.db.close()
+
+
+class EncodedLayout:
+    """The dictionary-encoded, day-partitioned layout of `hist_signal_db`."""
+
+    async def open(self, path: Path):
+        config.DB_PATH = path
+        await hist_signal_db.init_db()
+
+
+    async def insert(self, rows: list[tuple[str, str, int, float]]):
+        await hist_signal_db.add_history_batch(rows)
+
+
+    async def query(self, symbol: str, exchange: str, before_date: int) -> list[dict]:
+        return await hist_signal_db.get_historical_oi(symbol, exchange, before_date)
+
+
+    async def trim(self, current_timestamp: int):
+        await hist_signal_db.trim_old_records(current_timestamp)
+
+
+    async def close(self):
+        db = await hist_signal_db.get_connection()
+        await db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        await hist_signal_db.close_db()
+
+
+async def measure(layout, path: Path, symbols: int, cycles: int) -> tuple[float, float, float, int]:
+    await layout.open(path)
+    insert = []
+    for cycle in range(cycles):
+        rows = make_rows(symbols, cycle)
+        start = time.perf_counter()
+        await layout.insert(rows)
+        insert.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for exchange in EXCHANGES:
+        for n in range(symbols):
+            await layout.query(f"SYM{n}USDT", exchange, (cycles - 1) * STEP)
+    query = time.perf_counter() - start
+    await layout.close()
+    size = path.stat().st_size
+
+    # Retention on the copy of the database, the migration benchmark needs the full history
+    trimmed_path = path.with_name("trimmed_" + path.name)
+    shutil.copy(path, trimmed_path)
+    await layout.open(trimmed_path)
+    start = time.perf_counter()
+    await layout.trim(cycles * STEP // 1000)
+    trim = time.perf_counter() - start
+    await layout.close()
+    return min(insert[-10:]), query, trim, size
+
+
+async def run(args):
+    with tempfile.TemporaryDirectory() as tmp:
+        text_path = Path(tmp) / "text.db"
+        text = await measure(TextLayout(), text_path, args.symbols, args.cycles)
+        encoded = await measure(EncodedLayout(), Path(tmp) / "encoded.db", args.symbols, args.cycles)
+
+        migrated_path = Path(tmp) / "migrated.db"
+        shutil.copy(text_path, migrated_path)
+        config.DB_PATH = migrated_path
+        start = time.perf_counter()
+        await hist_signal_db.init_db()
+        migration = time.perf_counter() - start
+        await hist_signal_db.close_db()
+
+    rows = args.symbols * len(EXCHANGES)
+    print(f"symbols={args.symbols}/exchange cycles={args.cycles} ({rows * args.cycles} rows)")
+    print(f"{'layout':<8} {'size MB':>9} {'insert ms':>10} {'24h reads ms':>13} {'retention ms':>13}")
+    for name, (insert, query, trim, size) in (("text", text), ("encoded", encoded)):
+        print(f"{name:<8} {size / 1e6:>9.1f} {insert * 1000:>10.1f} {query * 1000:>13.1f} {trim * 1000:>13.1f}")
+    print(f"migration of the text database: {migration * 1000:.0f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--symbols", type=int, default=1100)
+    parser.add_argument("--cycles", type=int, default=576)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+bench_history_writes.py
+
+Compares the time to write one cycle of OI history rows to SQLite:
+- per row: a new connection, one INSERT and one commit per symbol (the previous `add_history_in_db`);
+- batched: one `executemany` in one transaction over the shared WAL connection (`add_history_batch`).
+
+The benchmark uses a temporary database, the application database is not touched.
+
+Usage (from the project root):
+    python benchmarks/bench_history_writes.py --symbols 1100 --cycles 5
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+os.environ.setdefault("TG_BOT_API_KEY", "benchmark")
+
+import aiosqlite
+from config import config
+from db import hist_signal_db
+
+
+def make_rows(symbols: int, cycle: int) -> list[tuple[str, str, int, float]]:
+    timestamp = cycle * 5 * 60 * 1000
+    return [(f"SYM{n}USDT", "Binance", timestamp, 1000.0 + n) for n in range(symbols)]
+
+
+async def write_per_row(rows: list[tuple[str, str, int, float]]):
+    """The previous implementation: one connection and one commit per row."""
+    for row in rows:
+        async with aiosqlite.connect(config.DB_PATH) as db:
+            await db.execute("""
+                INSERT INTO  history_temp (symbol, exchange, timestamp, open_interest)
+                VALUES (?, ?, ?, ?)
+            """, row)
+            await db.commit()
+
+
+async def measure(write, symbols: int, cycles: int) -> float:
+    timings = []
+    for cycle in range(cycles):
+        rows = make_rows(symbols, cycle)
+        start = time.perf_counter()
+        await write(rows)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+async def run(args):
+    with tempfile.TemporaryDirectory() as tmp:
+        config.DB_PATH = Path(tmp) / "per_row.db"
+        async with aiosqlite.connect(config.DB_PATH) as db:
+            await db.execute("CREATE TABLE history_temp (id INTEGER PRIMARY KEY AUTOINCREMENT, symbol TEXT, "
+                             "exchange TEXT, timestamp INTEGER, open_interest REAL)")
+            await db.execute("CREATE INDEX idx_timestamp ON history_temp (timestamp)")
+            await db.execute("CREATE INDEX idx_symbol_exchange_time ON history_temp(symbol, exchange, timestamp)")
+            await db.commit()
+        per_row = await measure(write_per_row, args.symbols, args.cycles)
+
+        config.DB_PATH = Path(tmp) / "batched.db"
+        await hist_signal_db.init_db()
+        batched = await measure(hist_signal_db.add_history_batch, args.symbols, args.cycles)
+        await hist_signal_db.close_db()
+
+    print(f"symbols={args.symbols} cycles={args.cycles} (best cycle)")
+    print(f"per row (connect + commit):   {per_row * 1000:10.1f} ms")
+    print(f"batched (WAL, executemany):   {batched * 1000:10.1f} ms  x{per_row / batched:.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--symbols", type=int, default=1100)
+    parser.add_argument("--cycles", type=int, default=5)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""
+bench_scan_cycle.py
+
+End-to-end benchmark of full scan cycles against the local mock exchange (see mock_exchange.py),
+which runs on its own event loop in a background thread.
+
+Each cycle runs the market poller for all exchanges while the scan coordinator task evaluates
+the streamed series for N users with mixed (period, threshold) settings, exactly as in production:
+OI polling, shared evaluation, kline fetches for signal confirmation, 24h signal counts, history
+writes and message rendering. Telegram is not contacted, messages are only counted.
+
+Reported per cycle: poll wall time, scan time left after the poll, total time, time to first
+alert, HTTP requests issued, time spent in the history database, messages produced; and the
+peak Python memory (tracemalloc) of the whole run.
+
+By default the listeners' rate limiters are replaced by unlimited ones, so the benchmark measures
+the application itself; `--paced` keeps the production request pacing. Application log messages
+up to WARNING (e.g., about injected errors) are hidden unless `--verbose` is given.
+The benchmark uses temporary databases, the application databases are not touched.
+
+Usage (from the project root):
+    python benchmarks/bench_scan_cycle.py --symbols 600 --users 100 --cycles 3 --latency-ms 20 --error-rate 0.01
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+os.environ.setdefault("TG_BOT_API_KEY", "123456:benchmark")
+
+from config import config
+from mock_exchange import MockExchange
+from app_logic import condition_handler, market_poller as market_poller_module
+from app_logic.market_poller import market_poller
+from app_logic.scanner.scanner import scan_coordinator
+from app_logic.symbol_list_handler import symbol_list
+from db import bot_users, hist_signal_db
+from exchange_listeners.listener_manager import LISTENERS, close_listeners
+from exchange_listeners.rate_limiter import RateLimiter
+
+PERIODS = [5, 10, 15, 20, 25, 30]
+THRESHOLDS = [0.03, 0.05, 0.08]
+
+db_time = 0.0
+
+
+def timed(module, name: str):
+    """Replaces a database function imported by `module` with a wrapper adding its duration to `db_time`."""
+    func = getattr(module, name)
+
+    async def wrapper(*args, **kwargs):
+        global db_time
+        start = time.perf_counter()
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            db_time += time.perf_counter() - start
+
+    setattr(module, name, wrapper)
+
+
+async def run(args):
+    global db_time
+    if not args.verbose:
+        logging.disable(logging.WARNING)
+
+    mock = MockExchange(symbols=args.symbols, latency_ms=args.latency_ms, error_rate=args.error_rate)
+    base_url = mock.start_in_thread()
+    for name, listener in LISTENERS.items():
+        listener.BASE_URL = base_url
+        if not args.paced:
+            listener.rate_limiter = RateLimiter(name, rate=1e9, capacity=1e9)
+
+    timed(market_poller_module, "add_history_batch")
+    timed(condition_handler, "get_historical_oi")
+
+    messages = 0
+
+    async def notify(user_id: int, text: str):
+        nonlocal messages
+        messages += 1
+
+    with tempfile.TemporaryDirectory() as tmp:
+        config.DB_PATH = Path(tmp) / "signals.db"
+        try:
+            await hist_signal_db.init_db()
+            await bot_users.init_db()
+
+            for name, listener in LISTENERS.items():
+                symbol_list.symbols_by_exchange[name] = await listener.fetch_usdt_symbols()
+
+            for user_id in range(args.users):
+                period = PERIODS[user_id % len(PERIODS)]
+                threshold = THRESHOLDS[user_id // len(PERIODS) % len(THRESHOLDS)]
+                await bot_users.update_user_settings(user_id, period, threshold, list(LISTENERS))
+                settings = await bot_users.get_user_settings(user_id)
+                scan_coordinator.register(user_id, settings, settings["active_exchanges"], notify)
+
+            print(f"symbols={args.symbols}/exchange users={args.users} latency={args.latency_ms}ms "
+                  f"error_rate={args.error_rate} paced={args.paced}")
+            print(f"{'cycle':>5} {'poll ms':>10} {'scan ms':>10} {'total ms':>10} {'first ms':>9} "
+                  f"{'requests':>9} {'db ms':>8} {'messages':>9}")
+
+            coordinator = asyncio.create_task(scan_coordinator.run_coordinator())
+            while scan_coordinator.snapshots is None:
+                await asyncio.sleep(0)
+
+            tracemalloc.start()
+            for cycle in range(args.cycles):
+                mock.requests.clear()
+                db_time = 0.0
+                messages = 0
+                for sub in scan_coordinator.subscriptions.values():
+                    sub["seen"].clear()
+
+                start = time.perf_counter()
+                snapshot = {}
+                await market_poller.poll_cycle(set(LISTENERS), snapshot)
+                polled = time.perf_counter()
+                market_poller.snapshots.update(snapshot)
+                market_poller.publish(snapshot)
+                await scan_coordinator.snapshots.join()
+                scanned = time.perf_counter()
+
+                first = float("nan")
+                if scan_coordinator.alerted_cycle == market_poller.cycle_started:
+                    first = scan_coordinator.time_to_first_alert * 1000
+                print(f"{cycle + 1:>5} {(polled - start) * 1000:>10.1f} {(scanned - polled) * 1000:>10.1f} "
+                      f"{(scanned - start) * 1000:>10.1f} {first:>9.1f} {sum(mock.requests.values()):>9} "
+                      f"{db_time * 1000:>8.1f} {messages:>9}")
+
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(f"peak memory: {peak / 1e6:.1f} MB")
+
+            coordinator.cancel()
+            await asyncio.gather(coordinator, return_exceptions=True)
+        finally:
+            await close_listeners()
+            await hist_signal_db.close_db()
+            mock.stop_thread()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--symbols", type=int, default=600)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--cycles", type=int, default=3)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--paced", action="store_true")
+    parser.add_argument("--verbose", action="store_true")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+bench_signal_engine.py
+
+Compares the per-symbol Python loop of `ConditionHandler.process_coin_data` with the
+vectorized `signal_engine` on synthetic OI data.
+
+Usage (from the project root):
+    python benchmarks/bench_signal_engine.py --symbols 1000 --limit 7
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+os.environ.setdefault("TG_BOT_API_KEY", "benchmark")
+
+from app_logic.condition_handler import ConditionHandler
+from app_logic.signal_engine import build_oi_matrix, find_triggers
+
+
+def make_coins(symbols: int, limit: int) -> list[list[dict]]:
+    """
+    Generates OI series sorted by timestamp descending.
+
+    Most symbols move within +-1% (no signal), about 2% of them get a spike.
+    """
+    step = 5 * 60 * 1000
+    coins = []
+    for n in range(symbols):
+        base = random.uniform(1e3, 1e8)
+        spike = 1.2 if random.random() < 0.02 else 1.0
+        coins.append([
+            {"symbol": f"SYM{n}USDT", "exchange": "Binance", "timestamp": (limit - k) * step,
+             "open_interest": base * random.uniform(0.99, 1.01) * (spike if k == 0 else 1.0)}
+            for k in range(limit)
+        ])
+    return coins
+
+
+def loop_triggers(handler: ConditionHandler, coins: list[list[dict]], threshold: float) -> dict[int, int]:
+    """The original per-symbol loop: first lookback index whose delta exceeds the threshold."""
+    triggers = {}
+    for row, coin in enumerate(coins):
+        for i in range(1, len(coin)):
+            delta_oi = handler.delta_calculate(coin[0]['open_interest'], coin[i]['open_interest'])
+            if delta_oi is None or delta_oi <= threshold:
+                continue
+            triggers[row] = i
+            break
+    return triggers
+
+
+def vector_triggers(coins: list[list[dict]], limit: int, threshold: float) -> dict[int, int]:
+    rows, first = find_triggers(build_oi_matrix(coins, limit), threshold)
+    return dict(zip(rows.tolist(), first.tolist()))
+
+
+def best_of(func, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--symbols", type=int, default=1000)
+    parser.add_argument("--limit", type=int, default=7)
+    parser.add_argument("--threshold", type=float, default=0.05)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    random.seed(42)
+    handler = ConditionHandler()
+    coins = make_coins(args.symbols, args.limit)
+
+    assert loop_triggers(handler, coins, args.threshold) == vector_triggers(coins, args.limit, args.threshold)
+
+    loop_time = best_of(lambda: loop_triggers(handler, coins, args.threshold), args.repeat)
+    vector_time = best_of(lambda: vector_triggers(coins, args.limit, args.threshold), args.repeat)
+    matrix = build_oi_matrix(coins, args.limit)
+    eval_time = best_of(lambda: find_triggers(matrix, args.threshold), args.repeat)
+
+    print(f"symbols={args.symbols} limit={args.limit} threshold={args.threshold}")
+    print(f"python loop:             {loop_time * 1000:8.3f} ms")
+    print(f"numpy (build + eval):    {vector_time * 1000:8.3f} ms  x{loop_time / vector_time:.1f}")
+    print(f"numpy (eval only):       {eval_time * 1000:8.3f} ms  x{loop_time / eval_time:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+"""
+mock_exchange.py
+
+Local aiohttp stand-in for the Binance and Bybit REST endpoints used by `BinanceListener`
+and `BybitListener`, for offline benchmarks and tests.
+
+Both exchanges are served by one server; point a listener at it by setting its `BASE_URL`
+to `MockExchange.base_url`. The market data is deterministic: the OI, close price and volume
+of a (symbol, candle) pair are derived from a hash, with random OI spikes so that signals fire.
+The number of symbols, the response latency and the error rate are configurable, and every
+request is counted per endpoint.
+
+Served endpoints:
+    Binance: /fapi/v1/exchangeInfo, /futures/data/openInterestHist, /fapi/v1/klines
+    Bybit: /v5/market/instruments-info, /v5/market/open-interest, /v5/market/tickers, /v5/market/kline
+
+The server runs either on the caller's event loop (`start`/`stop`) or on its own loop in a
+background thread (`start_in_thread`/`stop_thread`), so it does not compete with the measured code.
+
+Usage:
+    mock = MockExchange(symbols=600, latency_ms=20, error_rate=0.01)
+    await mock.start()
+    listener.BASE_URL = mock.base_url
+    ...
+    await mock.stop()
+"""
+
+import asyncio
+import random
+import threading
+import time
+import zlib
+from collections import Counter
+from aiohttp import web
+
+STEP = 5 * 60 * 1000
+
+
+class MockExchange:
+    """
+    Mock Binance/Bybit REST server.
+
+    Attributes:
+        symbols (list[str]): Listed USDT perpetual symbols.
+        latency_ms (float): Mean response latency in milliseconds (uniformly jittered by ±50%).
+        error_rate (float): Share of requests answered with HTTP 500.
+        spike_rate (float): Share of candles with an OI spike of +10%.
+        seed (int): Seed of the generated market data.
+        requests (Counter): Number of requests per endpoint path.
+        base_url (str | None): URL of the running server.
+    """
+    def __init__(self, symbols: int = 600, latency_ms: float = 0.0, error_rate: float = 0.0,
+                 spike_rate: float = 0.02, seed: int = 0):
+        self.symbols = [f"MOCK{i:04d}USDT" for i in range(symbols)]
+        self.latency_ms = latency_ms
+        self.error_rate = error_rate
+        self.spike_rate = spike_rate
+        self.seed = seed
+        self.requests = Counter()
+        self.base_url: str | None = None
+        self._random = random.Random(seed)
+        self._runner: web.AppRunner | None = None
+        self._thread: threading.Thread | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+
+    def point(self, symbol: str, candle: int) -> tuple[float, float, float]:
+        """
+        Returns the OI, close price and volume of a symbol at a candle number.
+
+        Args:
+            symbol (str): Trading symbol.
+            candle (int): Candle number (timestamp // 5 minutes).
+        """
+        rng = random.Random(zlib.crc32(f"{symbol}:{candle}".encode()) ^ self.seed)
+        base = 1e6 * (1 + zlib.crc32(symbol.encode()) % 100)
+        spike = 1.1 if rng.random() < self.spike_rate else 1.0
+        open_interest = base * (1 + rng.uniform(-0.002, 0.002)) * spike
+        close = base / 1e4 * (1 + rng.uniform(-0.01, 0.01))
+        volume = rng.uniform(1e3, 1e5) * spike
+        return open_interest, close, volume
+
+
+    @staticmethod
+    def last_candle() -> int:
+        """Returns the number of the latest closed candle."""
+        return int(time.time() * 1000) // STEP - 1
+
+
+    def build_app(self) -> web.Application:
+        """Creates the aiohttp application with all routes."""
+        app = web.Application(middlewares=[self.middleware])
+        app.router.add_get("/fapi/v1/exchangeInfo", self.binance_exchange_info)
+        app.router.add_get("/futures/data/openInterestHist", self.binance_open_interest)
+        app.router.add_get("/fapi/v1/klines", self.binance_klines)
+        app.router.add_get("/v5/market/instruments-info", self.bybit_instruments)
+        app.router.add_get("/v5/market/open-interest", self.bybit_open_interest)
+        app.router.add_get("/v5/market/tickers", self.bybit_tickers)
+        app.router.add_get("/v5/market/kline", self.bybit_klines)
+        return app
+
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """
+        Starts the server.
+
+        Args:
+            host (str, optional): Interface to listen on.
+            port (int, optional): Port to listen on. Defaults to a free port.
+
+        Returns:
+            str: Base URL of the server.
+        """
+        self._runner = web.AppRunner(self.build_app(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        host, port = self._runner.addresses[0][:2]
+        self.base_url = f"http://{host}:{port}"
+        return self.base_url
+
+
+    async def stop(self):
+        """Stops the server."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+    def start_in_thread(self) -> str:
+        """
+        Starts the server on its own event loop in a daemon thread.
+
+        Returns:
+            str: Base URL of the server.
+        """
+        self._loop = asyncio.new_event_loop()
+        started = threading.Event()
+
+        def serve():
+            asyncio.set_event_loop(self._loop)
+            self._loop.run_until_complete(self.start())
+            started.set()
+            self._loop.run_forever()
+
+        self._thread = threading.Thread(target=serve, name="mock-exchange", daemon=True)
+        self._thread.start()
+        started.wait()
+        return self.base_url
+
+
+    def stop_thread(self):
+        """Stops a server started with `start_in_thread`."""
+        if self._thread is None:
+            return
+        asyncio.run_coroutine_threadsafe(self.stop(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self._thread = self._loop = None
+
+
+    @web.middleware
+    async def middleware(self, request: web.Request, handler):
+        """Counts the request, applies the latency and injects errors."""
+        self.requests[request.path] += 1
+        if self.latency_ms:
+            await asyncio.sleep(self.latency_ms * self._random.uniform(0.5, 1.5) / 1000)
+        if self._random.random() < self.error_rate:
+            return web.Response(status=500, text="mock error")
+        return await handler(request)
+
+
+    def candles(self, start: int, end: int) -> range:
+        """Returns the candle numbers opened within [start, end] milliseconds."""
+        return range(-(-start // STEP), end // STEP + 1)
+
+
+    async def binance_exchange_info(self, request: web.Request) -> web.Response:
+        return web.json_response({"symbols": [
+            {"symbol": symbol, "contractType": "PERPETUAL", "quoteAsset": "USDT"} for symbol in self.symbols
+        ]})
+
+
+    async def binance_open_interest(self, request: web.Request) -> web.Response:
+        symbol = request.query["symbol"]
+        limit = min(int(request.query.get("limit", 30)), 500)
+        last = self.last_candle()
+        return web.json_response([
+            {"symbol": symbol, "sumOpenInterest": f"{self.point(symbol, candle)[0]:.4f}", "timestamp": candle * STEP}
+            for candle in range(last - limit + 1, last + 1)
+        ])
+
+
+    async def binance_klines(self, request: web.Request) -> web.Response:
+        symbol = request.query["symbol"]
+        result = []
+        for candle in self.candles(int(request.query["startTime"]), int(request.query["endTime"])):
+            _, close, volume = self.point(symbol, candle)
+            result.append([candle * STEP, f"{close}", f"{close}", f"{close}", f"{close:.6f}", f"{volume:.2f}"])
+        return web.json_response(result)
+
+
+    async def bybit_instruments(self, request: web.Request) -> web.Response:
+        return web.json_response({"retCode": 0, "result": {"list": [
+            {"symbol": symbol, "quoteCoin": "USDT", "contractType": "LinearPerpetual"} for symbol in self.symbols
+        ]}})
+
+
+    async def bybit_open_interest(self, request: web.Request) -> web.Response:
+        symbol = request.query["symbol"]
+        limit = min(int(request.query.get("limit", 50)), 200)
+        offset = int(request.query.get("cursor") or 0)
+        first = self.last_candle() - offset
+        return web.json_response({"retCode": 0, "result": {
+            "list": [{"openInterest": f"{self.point(symbol, candle)[0]:.4f}", "timestamp": str(candle * STEP)}
+                     for candle in range(first, first - limit, -1)],
+            "nextPageCursor": str(offset + limit),
+        }})
+
+
+    async def bybit_tickers(self, request: web.Request) -> web.Response:
+        # The tickers reflect the candle that is currently forming
+        candle = self.last_candle() + 1
+        tickers = []
+        for symbol in self.symbols:
+            open_interest, close, volume = self.point(symbol, candle)
+            tickers.append({"symbol": symbol, "openInterest": f"{open_interest:.4f}",
+                            "lastPrice": f"{close:.6f}", "turnover24h": f"{volume * close:.2f}"})
+        return web.json_response({"retCode": 0, "result": {"list": tickers}})
+
+
+    async def bybit_klines(self, request: web.Request) -> web.Response:
+        symbol = request.query["symbol"]
+        result = []
+        for candle in reversed(self.candles(int(request.query["start"]), int(request.query["end"]))):
+            _, close, volume = self.point(symbol, candle)
+            result.append([str(candle * STEP), f"{close}", f"{close}", f"{close}", f"{close:.6f}", f"{volume:.2f}", "0"])
+        return web.json_response({"retCode": 0, "result": {"list": result}})
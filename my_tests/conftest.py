@@ -0,0 +1,11 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# The application imports its modules relative to src/ (see Dockerfile and README)
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+os.environ.setdefault("TG_BOT_API_KEY", "123456:test-token")
+# Keep the log messages of the tests out of the application log (logs/app.log)
+os.environ.setdefault("LOG_PATH", str(Path(tempfile.gettempdir()) / "open_interest_screener_tests.log"))
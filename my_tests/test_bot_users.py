@@ -0,0 +1,28 @@
+import asyncio
+from config import config
+from db import bot_users
+
+
+def test_settings_cache_is_written_through(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "DB_PATH", tmp_path / "signals.db")
+    monkeypatch.setattr(bot_users, "_settings_cache", {})
+    monkeypatch.setattr(bot_users, "_cache_loaded", False)
+
+    async def scenario():
+        await bot_users.init_db()
+        assert await bot_users.get_user_settings(1) is None
+
+        await bot_users.update_user_settings(1, period=10)
+        await bot_users.update_user_settings(1, active_exchanges=["bybit"], time_zone="Europe/Kyiv")
+        cached = await bot_users.get_user_settings(1)
+
+        # Callers get copies, the cache is not changed through them
+        cached["active_exchanges"].append("binance")
+
+        # A fresh load from the database returns the same settings
+        await bot_users.load_settings_cache()
+        return await bot_users.get_user_settings(1)
+
+    settings = asyncio.run(scenario())
+
+    assert settings == {"period": 10, "threshold": 0.05, "active_exchanges": ["bybit"], "time_zone": "Europe/Kyiv"}
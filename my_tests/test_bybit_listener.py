@@ -0,0 +1,72 @@
+import asyncio
+from types import SimpleNamespace
+from exchange_listeners import bybit_listener
+from exchange_listeners.bybit_listener import BybitListener
+
+STEP = 5 * 60 * 1000
+CANDLE = 1_700_000_100_000 // STEP * STEP
+
+
+def point(symbol: str, timestamp: int, open_interest: float) -> dict:
+    return {"exchange": "Bybit", "symbol": symbol, "timestamp": timestamp, "open_interest": open_interest}
+
+
+class FakeBybit(BybitListener):
+    def __init__(self, history: dict[str, list[int]]):
+        super().__init__()
+        self.history = history
+        self.requested = []
+
+    async def fetch_tickers(self, session=None):
+        return {symbol: {"open_interest": 99.0, "price": 1.0, "turnover_24h": 1.0} for symbol in self.history}
+
+    async def fetch_oi(self, symbol, interval="5", limit=7, session=None):
+        self.requested.append(symbol)
+        return [point(symbol, timestamp, 1.0) for timestamp in self.history[symbol]][:limit]
+
+
+def collect(listener: BybitListener, monkeypatch, now_ms: int, symbols: list[str]) -> dict[str, list[dict]]:
+    monkeypatch.setattr(bybit_listener, "time", SimpleNamespace(time=lambda: now_ms / 1000))
+
+    async def scenario():
+        return {coin[0]["symbol"]: coin async for coin in listener.iter_oi_bulk(symbols, "5", 3)}
+
+    return asyncio.run(scenario())
+
+
+def test_settled_tickers_complete_the_series_and_gaps_are_backfilled(monkeypatch):
+    # The history endpoint lags behind the tickers by one candle
+    listener = FakeBybit({"AUSDT": [CANDLE - STEP, CANDLE - 2 * STEP, CANDLE - 3 * STEP],
+                          "BUSDT": [CANDLE - STEP, CANDLE - 2 * STEP, CANDLE - 3 * STEP]})
+    listener.oi_series["AUSDT"] = {CANDLE - k * STEP: point("AUSDT", CANDLE - k * STEP, 1.0) for k in (1, 2)}
+
+    coins = collect(listener, monkeypatch, CANDLE + 10_000, ["AUSDT", "BUSDT"])
+
+    # AUSDT only needed the ticker, BUSDT was backfilled through the history endpoint
+    assert listener.requested == ["BUSDT"]
+    for symbol in ("AUSDT", "BUSDT"):
+        assert [p["timestamp"] for p in coins[symbol]] == [CANDLE, CANDLE - STEP, CANDLE - 2 * STEP]
+        assert coins[symbol][0]["open_interest"] == 99.0
+
+
+def test_tickers_after_the_settle_window_are_not_stamped_on_the_candle(monkeypatch):
+    # Mid-candle, the history endpoint may already report the forming candle
+    listener = FakeBybit({"AUSDT": [CANDLE, CANDLE - STEP, CANDLE - 2 * STEP, CANDLE - 3 * STEP]})
+
+    coins = collect(listener, monkeypatch, CANDLE + STEP // 2, ["AUSDT"])
+
+    assert [p["timestamp"] for p in coins["AUSDT"]] == [CANDLE - STEP, CANDLE - 2 * STEP]
+    assert all(p["open_interest"] == 1.0 for p in coins["AUSDT"])
+    assert CANDLE not in listener.oi_series["AUSDT"]
+
+
+def test_candle_stamped_in_the_settle_window_is_kept_by_later_polls(monkeypatch):
+    listener = FakeBybit({"AUSDT": [CANDLE - STEP, CANDLE - 2 * STEP, CANDLE - 3 * STEP]})
+    collect(listener, monkeypatch, CANDLE + 10_000, ["AUSDT"])
+    listener.requested.clear()
+
+    coins = collect(listener, monkeypatch, CANDLE + STEP // 2, ["AUSDT"])
+
+    assert listener.requested == []
+    assert [p["timestamp"] for p in coins["AUSDT"]] == [CANDLE, CANDLE - STEP, CANDLE - 2 * STEP]
+    assert coins["AUSDT"][0]["open_interest"] == 99.0
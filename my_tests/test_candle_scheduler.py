@@ -0,0 +1,34 @@
+import asyncio
+import time
+from app_logic.candle_scheduler import CandleScheduler
+
+
+def test_next_fire_time_is_aligned_to_candle_close():
+    scheduler = CandleScheduler(interval="5", settle_delay=10)
+
+    assert scheduler.next_fire_time(1_000_000_000 + 3) == 1_000_000_210
+    assert scheduler.next_fire_time(1_000_000_200) == 1_000_000_210
+    # Exactly at the fire time the next candle is scheduled
+    assert scheduler.next_fire_time(1_000_000_210) == 1_000_000_510
+
+
+def test_run_cycle_cancels_work_after_deadline():
+    scheduler = CandleScheduler(interval="5", settle_delay=0, deadline=0.05)
+
+    async def slow():
+        await asyncio.sleep(1)
+
+    finished = asyncio.run(scheduler.run_cycle(slow(), time.time()))
+
+    assert not finished
+    assert scheduler.last_duration < 0.5
+
+
+def test_run_cycle_reports_lateness():
+    scheduler = CandleScheduler(interval="5", settle_delay=0, deadline=10)
+
+    async def fast():
+        pass
+
+    assert asyncio.run(scheduler.run_cycle(fast(), time.time() - 2))
+    assert scheduler.last_lateness >= 2
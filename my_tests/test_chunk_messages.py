@@ -0,0 +1,23 @@
+from app_logic.scanner.scanner import chunk_messages
+
+
+def test_parts_are_joined_up_to_the_limit():
+    parts = ["a" * 40, "b" * 40, "c" * 40]
+    assert chunk_messages(parts, limit=100) == ["a" * 40 + "\n\n" + "b" * 40, "c" * 40]
+    assert chunk_messages(parts, limit=200) == ["\n\n".join(parts)]
+    assert chunk_messages([]) == []
+
+
+def test_oversized_part_is_split():
+    assert chunk_messages(["x" * 5, "y" * 25], limit=10) == ["x" * 5, "y" * 10, "y" * 10, "y" * 5]
+
+
+def test_oversized_part_is_split_on_line_boundaries():
+    line = "<code>BTCUSDT</code> " + "z" * 10
+    part = "\n".join([line] * 3)
+
+    messages = chunk_messages(["head", part], limit=2 * len(line) + 1)
+
+    # Lines with markup are never cut, so every message keeps its tags balanced
+    assert messages == ["head", line + "\n" + line, line]
+    assert all(msg.count("<code>") == msg.count("</code>") for msg in messages)
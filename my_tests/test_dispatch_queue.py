@@ -0,0 +1,55 @@
+import asyncio
+import time
+from aiogram.exceptions import TelegramRetryAfter
+from bot.dispatch_queue import DispatchQueue
+
+
+class FakeBot:
+    def __init__(self, flood_once: bool = False):
+        self.sent = []
+        self.flood_once = flood_once
+
+    async def send_message(self, chat_id, text, reply_markup=None, disable_web_page_preview=None):
+        if self.flood_once:
+            self.flood_once = False
+            raise TelegramRetryAfter(method=None, message="Too Many Requests", retry_after=0.2)
+        self.sent.append((chat_id, text, time.monotonic()))
+
+
+def test_enqueue_returns_immediately_and_keeps_order_per_chat():
+    bot = FakeBot()
+    queue = DispatchQueue(bot, global_rate=100, chat_rate=20)
+
+    async def scenario():
+        start = time.monotonic()
+        for n in range(4):
+            queue.enqueue(1, f"a{n}")
+            queue.enqueue(2, f"b{n}")
+        enqueued = time.monotonic() - start
+        await asyncio.gather(*queue.workers.values())
+        return start, enqueued
+
+    start, enqueued = asyncio.run(scenario())
+
+    assert enqueued < 0.01
+    assert [text for chat, text, _ in bot.sent if chat == 1] == ["a0", "a1", "a2", "a3"]
+    # Per-chat bucket: 4 messages at 20/s take at least 3 intervals
+    assert bot.sent[-1][2] - start >= 3 / 20 * 0.9
+    # Idle chats keep no state
+    assert not queue.workers and not queue.queues and not queue.buckets
+
+
+def test_retry_after_pauses_and_resends():
+    bot = FakeBot(flood_once=True)
+    queue = DispatchQueue(bot, global_rate=100, chat_rate=100)
+
+    async def scenario():
+        start = time.monotonic()
+        queue.enqueue(1, "hello")
+        await asyncio.gather(*queue.workers.values())
+        return start
+
+    start = asyncio.run(scenario())
+
+    assert [text for _, text, _ in bot.sent] == ["hello"]
+    assert bot.sent[0][2] - start >= 0.2
@@ -0,0 +1,122 @@
+import asyncio
+import aiosqlite
+from config import config
+from db import hist_signal_db
+
+
+def test_batch_insert_and_read_back(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "DB_PATH", tmp_path / "signals.db")
+
+    async def scenario():
+        try:
+            await hist_signal_db.init_db()
+            await hist_signal_db.add_history_batch([
+                ("BTCUSDT", "Binance", 1000, 1.0),
+                ("BTCUSDT", "Binance", 2000, 2.0),
+                ("ETHUSDT", "Binance", 2000, 3.0),
+            ])
+            db = await hist_signal_db.get_connection()
+            async with db.execute("PRAGMA journal_mode") as cursor:
+                journal_mode = (await cursor.fetchone())[0]
+            return journal_mode, await hist_signal_db.get_historical_oi("BTCUSDT", "Binance", 2000)
+        finally:
+            await hist_signal_db.close_db()
+
+    journal_mode, rows = asyncio.run(scenario())
+
+    assert journal_mode == "wal"
+    assert [(row["timestamp"], row["open_interest"]) for row in rows] == [(2000, 2.0), (1000, 1.0)]
+
+
+def test_previous_layout_is_migrated(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "DB_PATH", tmp_path / "signals.db")
+
+    async def scenario():
+        async with aiosqlite.connect(config.DB_PATH) as db:
+            await db.execute("CREATE TABLE history_temp (id INTEGER PRIMARY KEY AUTOINCREMENT, symbol TEXT, "
+                             "exchange TEXT, timestamp INTEGER, open_interest REAL)")
+            await db.execute("CREATE INDEX idx_timestamp ON history_temp (timestamp)")
+            await db.execute("CREATE INDEX idx_symbol_exchange_time ON history_temp (symbol, exchange, timestamp)")
+            await db.executemany("INSERT INTO history_temp (symbol, exchange, timestamp, open_interest) "
+                                 "VALUES (?, ?, ?, ?)", [
+                ("BTCUSDT", "Binance", 1000, 1.0),
+                ("BTCUSDT", "Binance", 1000, 1.5),
+                ("BTCUSDT", "Bybit", 1000, 9.0),
+            ])
+            await db.commit()
+        try:
+            await hist_signal_db.init_db()
+            db = await hist_signal_db.get_connection()
+            async with db.execute("SELECT name FROM sqlite_master") as cursor:
+                objects = {row["name"] for row in await cursor.fetchall()}
+            async with db.execute(f"""
+                SELECT e.name, s.name, h.timestamp, h.open_interest FROM {hist_signal_db.partition_name(0)} h
+                JOIN exchanges e ON e.id = h.exchange_id JOIN symbols s ON s.id = h.symbol_id
+                ORDER BY e.name, h.timestamp
+            """) as cursor:
+                migrated = [tuple(row) for row in await cursor.fetchall()]
+            await hist_signal_db.add_history_batch([("BTCUSDT", "Binance", 2000, 2.0)])
+            return objects, migrated, await hist_signal_db.get_historical_oi("BTCUSDT", "Binance", 2000)
+        finally:
+            await hist_signal_db.close_db()
+
+    objects, migrated, rows = asyncio.run(scenario())
+
+    # The old table is dropped together with its indexes
+    assert not objects & {"history_temp", "idx_timestamp", "idx_symbol_exchange_time"}
+    assert hist_signal_db.partition_name(0) in objects
+    # Every seeded row is migrated, duplicates are collapsed to the latest inserted row
+    assert migrated == [("Binance", "BTCUSDT", 1000, 1.5), ("Bybit", "BTCUSDT", 1000, 9.0)]
+    assert [(row["exchange"], row["timestamp"], row["open_interest"]) for row in rows] == [
+        ("Binance", 2000, 2.0), ("Binance", 1000, 1.5)]
+
+
+def test_history_is_partitioned_by_day(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "DB_PATH", tmp_path / "signals.db")
+    day = hist_signal_db.PARTITION_MS
+
+    async def scenario():
+        try:
+            await hist_signal_db.init_db()
+            await hist_signal_db.add_history_batch([
+                ("BTCUSDT", "Binance", day - 1000, 1.0),
+                ("BTCUSDT", "Binance", day + 1000, 2.0),
+                ("BTCUSDT", "Binance", 2 * day + 1000, 3.0),
+            ])
+            spanning = await hist_signal_db.get_historical_oi("BTCUSDT", "Binance", day + 1000)
+            # Day 0 ended more than one day before now, day 1 did not
+            await hist_signal_db.trim_old_records((2 * day + 1000) // 1000)
+            partitions = set(hist_signal_db._partitions)
+            await hist_signal_db.close_db()
+            await hist_signal_db.init_db()
+            kept = await hist_signal_db.get_historical_oi("BTCUSDT", "Binance", 2 * day + 1000)
+            return spanning, partitions, set(hist_signal_db._partitions), kept
+        finally:
+            await hist_signal_db.close_db()
+
+    spanning, partitions, reloaded, kept = asyncio.run(scenario())
+
+    assert [row["open_interest"] for row in spanning] == [2.0, 1.0]
+    # The dropped partition is gone from the file, the retained days are still read
+    assert partitions == reloaded == {1, 2}
+    assert [row["open_interest"] for row in kept] == [3.0, 2.0]
+
+
+def test_repeated_points_are_stored_once(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "DB_PATH", tmp_path / "signals.db")
+
+    async def scenario():
+        try:
+            await hist_signal_db.init_db()
+            await hist_signal_db.add_history_batch([("BTCUSDT", "Binance", 1000, 1.0)] * 3)
+            await hist_signal_db.add_history_batch([("BTCUSDT", "Binance", 1000, 1.0)])
+            unchanged = await hist_signal_db.get_historical_oi("BTCUSDT", "Binance", 1000)
+            await hist_signal_db.add_history_batch([("BTCUSDT", "Binance", 1000, 1.5)])
+            return unchanged, await hist_signal_db.get_historical_oi("BTCUSDT", "Binance", 1000)
+        finally:
+            await hist_signal_db.close_db()
+
+    unchanged, updated = asyncio.run(scenario())
+
+    assert [row["open_interest"] for row in unchanged] == [1.0]
+    assert [row["open_interest"] for row in updated] == [1.5]
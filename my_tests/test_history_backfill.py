@@ -0,0 +1,125 @@
+import asyncio
+import time
+from config import config
+from app_logic.history_backfill import HistoryBackfill
+from app_logic.market_store import MarketStore
+from db import hist_signal_db
+
+STEP = 5 * 60 * 1000
+NOW = 1_700_000_000_000 // STEP * STEP
+
+
+class FakeListener:
+    session = None
+
+    def __init__(self):
+        self.calls = []
+
+    async def fetch_oi_history(self, symbol, interval, limit, session=None):
+        self.calls.append((symbol, limit))
+        await asyncio.sleep(0)
+        return [{"exchange": "Binance", "symbol": symbol, "timestamp": NOW - k * STEP, "open_interest": 100.0 + k}
+                for k in range(limit)]
+
+
+def test_backfill_fills_store_and_skips_points_already_stored(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "DB_PATH", tmp_path / "signals.db")
+    store = MarketStore()
+    # Point already written by the market poller
+    store.put("Binance", "BTCUSDT", NOW, 100.0)
+    backfill = HistoryBackfill(store, limit=12, concurrency=2)
+    listener = FakeListener()
+
+    async def scenario():
+        try:
+            await hist_signal_db.init_db()
+            backfill.start().cancel()
+            assert not backfill.ready.is_set()
+            await backfill.backfill_exchange("binance", listener, ["BTCUSDT", "ETHUSDT", "XRPUSDT"])
+            return (await hist_signal_db.get_historical_oi("BTCUSDT", "Binance", NOW),
+                    await hist_signal_db.get_historical_oi("ETHUSDT", "Binance", NOW))
+        finally:
+            await hist_signal_db.close_db()
+
+    btc_rows, eth_rows = asyncio.run(scenario())
+
+    assert sorted(listener.calls) == [("BTCUSDT", 12), ("ETHUSDT", 12), ("XRPUSDT", 12)]
+    assert backfill.progress["binance"] == (3, 3)
+    timestamps, open_interest = store.get_history("binance", "ETHUSDT", NOW)
+    assert timestamps == [NOW - k * STEP for k in range(12)]
+    assert open_interest == [100.0 + k for k in range(12)]
+    assert len(eth_rows) == 12
+    assert [row["timestamp"] for row in btc_rows] == [NOW - k * STEP for k in range(1, 12)]
+
+
+def test_backfill_fetches_only_the_gap_since_the_stored_data():
+    store = MarketStore()
+    backfill = HistoryBackfill(store)
+    now = NOW + 100 * STEP + 30_000
+    first = 100 - backfill.limit + 1
+    for k in range(first, 61):
+        store.put("binance", "BTCUSDT", NOW + k * STEP, 1.0)
+    for k in range(first, 98):
+        if k != 50:
+            store.put("binance", "ETHUSDT", NOW + k * STEP, 1.0)
+        store.put("binance", "SOLUSDT", NOW + k * STEP, 1.0)
+    # Only the recent points written by the market poller
+    for k in range(94, 101):
+        store.put("binance", "XRPUSDT", NOW + k * STEP, 1.0)
+
+    assert backfill.missing_points("binance", "BTCUSDT", now) == 40
+    assert backfill.missing_points("binance", "SOLUSDT", now) == 3
+    # A hole in the window is downloaded with everything after it
+    assert backfill.missing_points("binance", "ETHUSDT", now) == 51
+    assert backfill.missing_points("binance", "XRPUSDT", now) == backfill.limit
+    assert backfill.missing_points("binance", "ADAUSDT", now) == backfill.limit
+
+
+def test_backfill_after_poller_wrote_recent_points():
+    store = MarketStore()
+    backfill = HistoryBackfill(store, limit=12)
+    now = int(time.time() * 1000) // STEP * STEP
+
+    class Listener:
+        session = None
+        calls = []
+
+        async def fetch_oi_history(self, symbol, interval, limit, session=None):
+            self.calls.append((symbol, limit))
+            return [{"exchange": "Binance", "symbol": symbol, "timestamp": now - k * STEP, "open_interest": 1.0}
+                    for k in range(limit)]
+
+    # The poller woke up during the backfill and wrote the latest points at the real current time
+    for k in range(1, backfill.poller_limit + 1):
+        store.put("Binance", "BTCUSDT", now - k * STEP, 2.0)
+
+    async def scenario():
+        rows = await backfill.backfill_symbol("binance", Listener(), "BTCUSDT", asyncio.Semaphore(1))
+        return rows, backfill.missing_points("binance", "BTCUSDT", int(time.time() * 1000))
+
+    rows, missing = asyncio.run(scenario())
+
+    assert Listener.calls == [("BTCUSDT", 12)]
+    assert len(rows) == 12 - backfill.poller_limit
+    timestamps, _ = store.get_history("binance", "BTCUSDT", now)
+    assert timestamps == [now - k * STEP for k in range(12)]
+    assert missing <= 1
+
+
+def test_signal_counts_are_pending_during_the_backfill(monkeypatch):
+    from app_logic import condition_handler
+    from app_logic.condition_handler import ConditionHandler
+
+    backfill = HistoryBackfill(MarketStore())
+    monkeypatch.setattr(condition_handler, "history_backfill", backfill)
+    handler = ConditionHandler()
+    handler.configure(["BTCUSDT"], 15, "5", 0.05)
+
+    async def scenario():
+        backfill.ready.clear()
+        # Returns at once instead of waiting for the backfill
+        pending = await asyncio.wait_for(handler.calculate_signal_from_history("BTCUSDT", "Binance", NOW), 1)
+        backfill.ready.set()
+        return pending
+
+    assert asyncio.run(scenario()) is None
@@ -0,0 +1,42 @@
+import asyncio
+import time
+from app_logic.kline_cache import KlineCache
+from app_logic.market_store import MarketStore
+
+STEP = 5 * 60 * 1000
+
+
+class FakeListener:
+    session = None
+
+    def __init__(self):
+        self.calls = []
+
+    async def fetch_ohlcv(self, symbol, start_date, end_date, interval, session=None):
+        self.calls.append((symbol, start_date, end_date))
+        await asyncio.sleep(0)
+        return [{"timestamp": ts, "close": ts / STEP, "volume": 1.0}
+                for ts in range(start_date, end_date + 1, STEP)]
+
+
+def test_prefetch_fetches_only_missing_klines():
+    store = MarketStore()
+    cache = KlineCache(store)
+    listener = FakeListener()
+    now = int(time.time() * 1000) // STEP * STEP - 10 * STEP
+
+    async def scenario():
+        # Concurrent requests for the same range share one fetch
+        await asyncio.gather(
+            cache.prefetch(listener, "binance", [("BTCUSDT", now - 6 * STEP, now)]),
+            cache.prefetch(listener, "binance", [("BTCUSDT", now - 6 * STEP, now)]),
+        )
+        await cache.prefetch(listener, "binance", [("BTCUSDT", now - 6 * STEP, now + STEP)])
+
+    asyncio.run(scenario())
+
+    assert listener.calls == [("BTCUSDT", now - 6 * STEP, now), ("BTCUSDT", now + STEP, now + STEP)]
+    ohlcv = cache.get_ohlcv("binance", "BTCUSDT", now - 6 * STEP, now + STEP)
+    assert [candle["timestamp"] for candle in ohlcv] == list(range(now + STEP, now - 7 * STEP, -STEP))
+    # Kline data does not create OI points
+    assert store.get_history("binance", "BTCUSDT", now + STEP) == ([], [])
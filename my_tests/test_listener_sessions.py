@@ -0,0 +1,49 @@
+import asyncio
+from benchmarks.mock_exchange import MockExchange
+from exchange_listeners.listener_manager import LISTENERS, ListenerManager, start_listeners, close_listeners
+
+
+def test_session_is_created_once_and_shared():
+    async def scenario():
+        await start_listeners()
+        try:
+            sessions = {name: listener.session for name, listener in LISTENERS.items()}
+            # Every access and every manager sees the same session
+            manager = ListenerManager(enabled_exchanges=list(LISTENERS))
+            shared = all(manager.get_listener(name).session is session for name, session in sessions.items())
+            return sessions, shared
+        finally:
+            await close_listeners()
+
+    sessions, shared = asyncio.run(scenario())
+
+    assert shared
+    assert len({id(session) for session in sessions.values()}) == len(LISTENERS)
+    assert all(session.closed for session in sessions.values())
+    assert all(listener._session is None for listener in LISTENERS.values())
+
+
+def test_session_is_recreated_after_close():
+    mock = MockExchange(symbols=2)
+    listener = LISTENERS["binance"]
+    base_url = listener.BASE_URL
+
+    async def scenario():
+        listener.BASE_URL = await mock.start()
+        try:
+            await start_listeners()
+            first = listener.session
+            await close_listeners()
+            await close_listeners()  # closing twice is harmless
+            symbols = await listener.fetch_usdt_symbols()
+            second = listener.session
+            return first, second, symbols
+        finally:
+            await close_listeners()
+            await mock.stop()
+            listener.BASE_URL = base_url
+
+    first, second, symbols = asyncio.run(scenario())
+
+    assert first.closed and second is not first and second.closed
+    assert symbols == mock.symbols
@@ -0,0 +1,146 @@
+import asyncio
+from app_logic import market_poller as market_poller_module
+from app_logic.market_poller import MarketPoller
+from app_logic.market_store import MarketStore
+
+
+class FakeListener:
+    session = None
+
+    async def iter_oi_bulk(self, symbols, interval, limit, session=None):
+        for symbol in symbols:
+            await asyncio.sleep(0)
+            yield [{"exchange": "binance", "symbol": symbol, "timestamp": 300_000, "open_interest": 1.0}]
+
+
+def test_series_are_streamed_before_the_snapshot(monkeypatch):
+    rows = []
+
+    async def fake_add_history_batch(batch):
+        rows.extend(batch)
+
+    monkeypatch.setattr(market_poller_module, "add_history_batch", fake_add_history_batch)
+    monkeypatch.setattr(market_poller_module, "market_store", MarketStore())
+    poller = MarketPoller()
+
+    async def scenario():
+        stream = poller.subscribe(1, ["binance"], stream=True)
+        plain = poller.subscribe(2, ["binance"])
+        poller.cycle_started = 10.0
+        coins = await poller.poll_exchange("binance", FakeListener(), ["AUSDT", "BUSDT"])
+        poller.publish({"binance": coins})
+        events = [stream.get_nowait() for _ in range(stream.qsize())]
+        return events, plain.get_nowait()
+
+    events, snapshot = asyncio.run(scenario())
+
+    assert [(event.kind, event.exchange) for event in events] == [
+        ("coins", "binance"), ("coins", "binance"), ("done", "binance"), ("snapshot", None)]
+    assert [event.data[0][0]["symbol"] for event in events[:2]] == ["AUSDT", "BUSDT"]
+    assert events[0].started == 10.0
+    assert events[3].data == snapshot == {"binance": events[0].data + events[1].data}
+    assert len(rows) == 2
+
+
+def test_snapshots_fan_out_filtered_by_exchange():
+    poller = MarketPoller()
+
+    async def scenario():
+        both = poller.subscribe(1, ["Binance", "Bybit"])
+        bybit = poller.subscribe(2, ["bybit"])
+        assert poller.wakeup.is_set() and poller.get_requested_exchanges() == {"binance", "bybit"}
+        poller.publish({"binance": [["b1"]], "bybit": [["y1"]]})
+        return both.get_nowait(), bybit.get_nowait()
+
+    both, bybit = asyncio.run(scenario())
+
+    assert both == {"binance": [["b1"]], "bybit": [["y1"]]}
+    assert bybit == {"bybit": [["y1"]]}
+
+
+def test_unconsumed_snapshot_is_replaced():
+    poller = MarketPoller()
+
+    async def scenario():
+        queue = poller.subscribe(1, ["binance"])
+        poller.publish({"binance": [["old"]]})
+        poller.publish({"binance": [["new"]]})
+        return queue.qsize(), queue.get_nowait()
+
+    size, snapshot = asyncio.run(scenario())
+
+    assert size == 1 and snapshot == {"binance": [["new"]]}
+
+
+def test_latest_snapshot_is_delivered_on_subscribe_and_not_after_unsubscribe():
+    poller = MarketPoller()
+
+    async def scenario():
+        poller.snapshots.update({"binance": [["latest"]]})
+        queue = poller.subscribe(1, ["binance"])
+        delivered = queue.get_nowait()
+        assert not poller.wakeup.is_set()
+
+        poller.unsubscribe(1)
+        poller.unsubscribe(1)  # unknown IDs are ignored
+        poller.publish({"binance": [["next"]]})
+        return delivered, queue.empty(), poller.get_requested_exchanges()
+
+    delivered, empty, requested = asyncio.run(scenario())
+
+    assert delivered == {"binance": [["latest"]]}
+    assert empty and requested == set()
+
+
+class StalledListener(FakeListener):
+    async def iter_oi_bulk(self, symbols, interval, limit, session=None):
+        async for coin in super().iter_oi_bulk(symbols, interval, limit, session):
+            yield coin
+        await asyncio.Event().wait()
+
+
+def test_rows_of_a_cancelled_cycle_are_saved(monkeypatch):
+    rows = []
+
+    async def fake_add_history_batch(batch):
+        await asyncio.sleep(0)
+        rows.extend(batch)
+
+    monkeypatch.setattr(market_poller_module, "add_history_batch", fake_add_history_batch)
+    monkeypatch.setattr(market_poller_module, "market_store", MarketStore())
+    poller = MarketPoller()
+
+    async def scenario():
+        try:
+            await asyncio.wait_for(poller.poll_exchange("binance", StalledListener(), ["AUSDT", "BUSDT"]), 0.1)
+        except asyncio.TimeoutError:
+            pass
+        await asyncio.gather(*poller.saving)
+
+    asyncio.run(scenario())
+
+    assert [row[0] for row in rows] == ["AUSDT", "BUSDT"]
+
+
+class GapListener(FakeListener):
+    async def iter_oi_bulk(self, symbols, interval, limit, session=None):
+        for symbol in symbols:
+            yield [{"exchange": "binance", "symbol": symbol, "timestamp": timestamp, "open_interest": 1.0}
+                   for timestamp in (300_000, 600_000, 900_000)]
+
+
+def test_points_new_to_the_store_are_saved(monkeypatch):
+    rows = []
+
+    async def fake_add_history_batch(batch):
+        rows.extend(batch)
+
+    store = MarketStore()
+    store.put("binance", "AUSDT", 300_000, 1.0)
+    monkeypatch.setattr(market_poller_module, "add_history_batch", fake_add_history_batch)
+    monkeypatch.setattr(market_poller_module, "market_store", store)
+
+    asyncio.run(MarketPoller().poll_exchange("binance", GapListener(), ["AUSDT"]))
+
+    # The candles filled after a gap are saved, the one already stored is not
+    assert [row[2] for row in rows] == [600_000, 900_000]
@@ -0,0 +1,38 @@
+import asyncio
+import math
+from app_logic.market_snapshot import save_snapshot, load_snapshot
+from app_logic.market_store import MarketStore
+
+STEP = 5 * 60 * 1000
+NOW = 1_700_000_000_000 // STEP * STEP
+
+
+def test_snapshot_round_trip(tmp_path):
+    path = tmp_path / "market_snapshot.npz"
+    store = MarketStore()
+    for k in range(300):
+        store.put("binance", "BTCUSDT", NOW - k * STEP, 1000.0 + k)
+    store.put_klines("binance", "BTCUSDT", [{"timestamp": NOW, "close": 42.5, "volume": 7.0}])
+    store.put("bybit", "ETHUSDT", NOW, 5.0)
+
+    asyncio.run(save_snapshot(store, path))
+    restored = MarketStore()
+    assert load_snapshot(restored, path) == 2
+
+    assert restored.get_history("binance", "BTCUSDT", NOW) == store.get_history("binance", "BTCUSDT", NOW)
+    assert restored.get_history("bybit", "ETHUSDT", NOW) == ([NOW], [5.0])
+    assert restored.get_klines("binance", "BTCUSDT", NOW, NOW) == [{"timestamp": NOW, "close": 42.5, "volume": 7.0}]
+    assert restored.get_buffer("binance", "BTCUSDT").last_candle == NOW // STEP
+    # Restored buffers keep accepting new points
+    assert restored.put("binance", "BTCUSDT", NOW + STEP, 1.0)
+    assert math.isnan(restored.get_buffer("binance", "BTCUSDT").price[(NOW // STEP + 1) % 288])
+
+
+def test_missing_or_incompatible_snapshot_is_ignored(tmp_path):
+    path = tmp_path / "market_snapshot.npz"
+    assert load_snapshot(MarketStore(), path) == 0
+
+    store = MarketStore(slots=12)
+    store.put("binance", "BTCUSDT", NOW, 1.0)
+    asyncio.run(save_snapshot(store, path))
+    assert load_snapshot(MarketStore(), path) == 0
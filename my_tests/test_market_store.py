@@ -0,0 +1,56 @@
+import math
+from app_logic.market_store import MarketStore, SeriesBuffer
+
+STEP = 5 * 60 * 1000
+
+
+def test_put_and_get_by_timestamp():
+    buffer = SeriesBuffer(slots=288, step_ms=STEP)
+    assert buffer.put(10 * STEP, 100.0, price=2.5, volume=7.0)
+
+    slot = buffer.slot_of(10 * STEP)
+    assert buffer.get_oi(10 * STEP) == 100.0
+    assert buffer.price[slot] == 2.5
+    assert buffer.get_oi(11 * STEP) is None
+
+
+def test_ring_buffer_overwrites_oldest_candle():
+    buffer = SeriesBuffer(slots=4, step_ms=STEP)
+    for candle in range(6):
+        buffer.put(candle * STEP, float(candle))
+
+    assert buffer.get_oi(1 * STEP) is None
+    assert buffer.get_oi(5 * STEP) == 5.0
+    # Older data never replaces newer data in the same slot
+    assert not buffer.put(1 * STEP, -1.0)
+    assert buffer.get_oi(5 * STEP) == 5.0
+
+
+def test_history_skips_missing_candles():
+    store = MarketStore()
+    for candle in (1, 2, 4, 5):
+        store.put("Binance", "btcusdt", candle * STEP, float(candle))
+
+    timestamps, open_interest = store.get_history("binance", "BTCUSDT", 5 * STEP)
+
+    assert timestamps == [5 * STEP, 4 * STEP, 2 * STEP, 1 * STEP]
+    assert open_interest == [5.0, 4.0, 2.0, 1.0]
+    assert store.get_history("bybit", "BTCUSDT", 5 * STEP) == ([], [])
+
+
+def test_unknown_price_is_nan():
+    store = MarketStore()
+    store.put("bybit", "ETHUSDT", STEP, 1.0)
+    buffer = store.get_buffer("bybit", "ETHUSDT")
+    assert math.isnan(buffer.price[buffer.slot_of(STEP)])
+
+
+def test_oi_and_klines_are_written_independently():
+    store = MarketStore()
+    store.put("binance", "BTCUSDT", 3 * STEP, 50.0)
+    store.put_klines("binance", "BTCUSDT", [{"timestamp": 3 * STEP, "close": 9.5, "volume": 4.0}])
+
+    assert store.get_buffer("binance", "BTCUSDT").get_oi(3 * STEP) == 50.0
+    assert store.get_klines("binance", "BTCUSDT", 0, 3 * STEP) == [
+        {"timestamp": 3 * STEP, "close": 9.5, "volume": 4.0}
+    ]
@@ -0,0 +1,38 @@
+import asyncio
+from benchmarks.mock_exchange import MockExchange, STEP
+from exchange_listeners.binance_listener import BinanceListener
+from exchange_listeners.bybit_listener import BybitListener
+
+
+def test_listeners_against_mock_exchange():
+    mock = MockExchange(symbols=3)
+
+    async def scenario():
+        base_url = await mock.start()
+        binance, bybit = BinanceListener(), BybitListener()
+        binance.BASE_URL = bybit.BASE_URL = base_url
+        try:
+            symbols = await binance.fetch_usdt_symbols()
+            bybit_symbols = await bybit.fetch_usdt_symbols()
+            oi = await binance.fetch_oi(symbols[0], "5", 7)
+            history = await bybit.fetch_oi_history(symbols[0], "5", 288)
+            end = history[0]["timestamp"]
+            ohlcv = await bybit.fetch_ohlcv(symbols[0], end - 2 * STEP, end)
+            bulk = await bybit.fetch_oi_bulk(symbols, "5", 7)
+            return symbols, bybit_symbols, oi, history, ohlcv, bulk
+        finally:
+            await binance.close()
+            await bybit.close()
+            await mock.stop()
+
+    symbols, bybit_symbols, oi, history, ohlcv, bulk = asyncio.run(scenario())
+
+    assert symbols == bybit_symbols == mock.symbols
+    assert len(oi) == 7
+    assert oi[-1]["open_interest"] == round(mock.point(symbols[0], oi[-1]["timestamp"] // STEP)[0], 4)
+    # Two pages of the Bybit cursor
+    assert len(history) == 288 and mock.requests["/v5/market/open-interest"] >= 2
+    assert all(newer["timestamp"] - older["timestamp"] == STEP for newer, older in zip(history, history[1:]))
+    end = history[0]["timestamp"]
+    assert [candle["timestamp"] for candle in ohlcv] == [end, end - STEP, end - 2 * STEP]
+    assert len(bulk) == 3 and all(len(coin) == 7 for coin in bulk)
@@ -0,0 +1,68 @@
+import asyncio
+import time
+from exchange_listeners.rate_limiter import TokenBucket, BinanceRateLimiter, BybitRateLimiter
+from exchange_listeners.binance_listener import BinanceListener
+
+
+def test_token_bucket_paces_bursts():
+    bucket = TokenBucket(rate=100, capacity=1)
+
+    async def burst():
+        for _ in range(11):
+            await bucket.acquire()
+
+    start = time.monotonic()
+    asyncio.run(burst())
+    assert time.monotonic() - start >= 0.09
+
+
+def test_rate_limit_response_blocks_and_slows_down():
+    limiter = BinanceRateLimiter()
+    base_rate = limiter.bucket.rate
+
+    assert limiter.is_rate_limited(429, "Too many requests")
+    limiter.on_rate_limited({"Retry-After": "7"})
+
+    assert limiter.bucket.rate == base_rate / 2
+    assert 6 < limiter.blocked_until - time.monotonic() <= 7
+
+    limiter.on_success({})
+    assert limiter.bucket.rate > base_rate / 2
+
+
+def test_binance_used_weight_header_pauses_requests():
+    limiter = BinanceRateLimiter()
+    limiter.on_success({"X-MBX-USED-WEIGHT-1M": "100"})
+    assert limiter.blocked_until == 0
+
+    limiter.on_success({"X-MBX-USED-WEIGHT-1M": str(limiter.WEIGHT_LIMIT_1M)})
+    assert limiter.blocked_until > time.monotonic()
+
+
+def test_binance_klines_weight_follows_limit():
+    assert [BinanceListener.klines_weight(limit) for limit in (1, 99, 100, 499, 500, 1000, 1500)] == [1, 1, 2, 2, 5, 5, 10]
+
+
+def test_binance_oi_history_has_its_own_bucket():
+    limiter = BinanceRateLimiter()
+    bucket = limiter.endpoint_buckets[limiter.OI_HISTORY_ENDPOINT]
+    # No 5-minute window can exceed the endpoint limit
+    assert bucket.capacity + bucket.rate * 300 <= limiter.OI_HISTORY_LIMIT_5M
+
+    async def requests():
+        await limiter.acquire(1, limiter.OI_HISTORY_ENDPOINT)
+        await limiter.acquire(5)
+
+    asyncio.run(requests())
+    assert bucket.tokens < bucket.capacity
+    assert limiter.bucket.tokens < limiter.bucket.capacity - 5
+
+
+def test_bybit_limit_headers_and_ret_code():
+    limiter = BybitRateLimiter()
+    assert limiter.is_rate_limited(200, {"retCode": 10006})
+    assert not limiter.is_rate_limited(200, {"retCode": 0})
+
+    reset = int((time.time() + 1) * 1000)
+    limiter.on_success({"X-Bapi-Limit-Status": "1", "X-Bapi-Limit-Reset-Timestamp": str(reset)})
+    assert limiter.blocked_until > time.monotonic()
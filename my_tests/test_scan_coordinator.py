@@ -0,0 +1,217 @@
+import asyncio
+import pytest
+from datetime import datetime, timezone
+from config import config
+from db import bot_users
+from app_logic.market_poller import StreamEvent
+from app_logic.scanner.scanner import ScanCoordinator
+from app_logic.subscription_index import subscription_index
+
+
+@pytest.fixture(autouse=True)
+def user_settings_db(tmp_path, monkeypatch):
+    # Rendering reads the users' time zones; keep the test users out of the application database
+    monkeypatch.setattr(config, "DB_PATH", tmp_path / "signals.db")
+    monkeypatch.setattr(bot_users, "_settings_cache", {})
+    monkeypatch.setattr(bot_users, "_cache_loaded", False)
+    asyncio.run(bot_users.init_db())
+
+
+def make_signal(symbol: str) -> dict:
+    return {"exchange": "Binance", "symbol": symbol, "datetime": datetime(2025, 1, 1, tzinfo=timezone.utc),
+            "delta_time_minutes": 5.0, "delta_oi_%": "6.00%", "delta_price_%": "1.00%",
+            "delta_volume_%": "2.00%", "count_signal_24h": 1}
+
+
+def test_one_pass_serves_all_users_once_per_candle(monkeypatch):
+    evaluated = []
+
+    async def fake_evaluate(exchange_name, coins, listener, configs=None):
+        evaluated.append((exchange_name, configs))
+        return {(15, 0.05): [make_signal("AUSDT"), make_signal("BUSDT")], (30, 0.1): []}
+
+    monkeypatch.setattr(subscription_index, "evaluate", fake_evaluate)
+    coordinator = ScanCoordinator()
+    sent = []
+
+    async def notify(user_id, msg):
+        sent.append((user_id, msg))
+
+    snapshot = {"binance": [[{"timestamp": 1000}]]}
+
+    async def scenario():
+        for user_id, period, threshold in ((1, 15, 0.05), (2, 15, 0.05), (3, 30, 0.1)):
+            coordinator.register(user_id, {"period": period, "threshold": threshold}, ["binance"], notify)
+        try:
+            await coordinator.scan_snapshot(snapshot)
+            # The same candle again (e.g. after another user subscribed) is not re-sent
+            await coordinator.scan_snapshot(snapshot)
+        finally:
+            for user_id in (1, 2, 3):
+                coordinator.unregister(user_id)
+
+    asyncio.run(scenario())
+
+    assert evaluated == [("binance", {(15, 0.05), (30, 0.1)})]
+    assert [user_id for user_id, _ in sent] == [1, 2]
+    assert "AUSDT" in sent[0][1] and "BUSDT" in sent[0][1]
+    assert not subscription_index.settings
+
+
+def test_settings_are_hot_swapped_without_reevaluation(monkeypatch):
+    evaluated = []
+
+    async def fake_evaluate(exchange_name, coins, listener, configs=None):
+        evaluated.append(configs)
+        return {}
+
+    monkeypatch.setattr(subscription_index, "evaluate", fake_evaluate)
+    coordinator = ScanCoordinator()
+
+    async def notify(user_id, msg):
+        pass
+
+    async def scenario():
+        coordinator.register(1, {"period": 15, "threshold": 0.05}, ["binance"], notify)
+        try:
+            await coordinator.scan_snapshot({"binance": [[{"timestamp": 1000}]]})
+            assert coordinator.update_settings(1, {"period": 30, "threshold": 0.1}, ["binance", "bybit"])
+            assert subscription_index.settings[1] == (30, 0.1)
+            # Same candle: not evaluated again; next candle uses the new settings
+            await coordinator.scan_snapshot({"binance": [[{"timestamp": 1000}]]})
+            await coordinator.scan_snapshot({"binance": [[{"timestamp": 2000}]]})
+        finally:
+            coordinator.unregister(1)
+
+    asyncio.run(scenario())
+
+    assert evaluated == [{(15, 0.05)}, {(30, 0.1)}]
+    assert not coordinator.update_settings(1, {"period": 5, "threshold": 0.01}, ["binance"])
+
+
+def test_exchanges_are_evaluated_concurrently_and_merged(monkeypatch):
+    running = []
+    overlap = []
+
+    async def fake_evaluate(exchange_name, coins, listener, configs=None):
+        running.append(exchange_name)
+        overlap.append(len(running))
+        await asyncio.sleep(0.01)
+        running.remove(exchange_name)
+        return {(15, 0.05): [dict(make_signal(f"{exchange_name.upper()}USDT"), exchange=exchange_name.title())]}
+
+    monkeypatch.setattr(subscription_index, "evaluate", fake_evaluate)
+    coordinator = ScanCoordinator()
+    sent = []
+
+    async def notify(user_id, msg):
+        sent.append((user_id, msg))
+
+    async def scenario():
+        coordinator.register(1, {"period": 15, "threshold": 0.05}, ["binance", "bybit"], notify)
+        try:
+            await coordinator.scan_snapshot({"binance": [[{"timestamp": 1000}]], "bybit": [[{"timestamp": 1000}]]})
+        finally:
+            coordinator.unregister(1)
+
+    asyncio.run(scenario())
+
+    assert max(overlap) == 2
+    # One message with the signals of both exchanges, in snapshot order
+    assert len(sent) == 1
+    assert sent[0][1].index("BINANCEUSDT") < sent[0][1].index("BYBITUSDT")
+
+
+def test_streamed_batches_are_alerted_once_per_candle(monkeypatch):
+    evaluated = []
+
+    async def fake_evaluate(exchange_name, coins, listener, configs=None):
+        evaluated.append([coin[0]["symbol"] for coin in coins])
+        return {(15, 0.05): [make_signal(coin[0]["symbol"]) for coin in coins]}
+
+    monkeypatch.setattr(subscription_index, "evaluate", fake_evaluate)
+    coordinator = ScanCoordinator()
+    sent = []
+
+    async def notify(user_id, msg):
+        sent.append((user_id, msg))
+
+    coin_a = [{"symbol": "AUSDT", "timestamp": 1000}]
+    coin_b = [{"symbol": "BUSDT", "timestamp": 1000}]
+
+    async def scenario():
+        coordinator.register(1, {"period": 15, "threshold": 0.05}, ["binance"], notify)
+        try:
+            await coordinator.handle_events([StreamEvent("coins", "binance", [coin_a], 10.0)])
+            # Evaluated right away, sent at the end of the coalescing window or of the cycle
+            assert not sent
+            await coordinator.handle_events([
+                StreamEvent("coins", "binance", [coin_b], 10.0),
+                StreamEvent("done", "binance", None, 10.0),
+                StreamEvent("snapshot", None, {"binance": [coin_a, coin_b]}, None),
+            ])
+        finally:
+            coordinator.unregister(1)
+
+    asyncio.run(scenario())
+
+    # Each batch is evaluated as it arrives, the signals of the cycle are sent as one message
+    # once the exchange is finished and the complete snapshot is not evaluated again
+    assert evaluated == [["AUSDT"], ["BUSDT"]]
+    assert len(sent) == 1 and sent[0][1].index("AUSDT") < sent[0][1].index("BUSDT")
+    assert coordinator.alerted_cycle == 10.0 and coordinator.time_to_first_alert is not None
+    assert not coordinator.streams
+
+
+def test_slow_exchange_does_not_hold_back_streamed_alerts(monkeypatch):
+
+    async def fake_evaluate(exchange_name, coins, listener, configs=None):
+        return {(15, 0.05): [dict(make_signal(coin[0]["symbol"]), exchange=exchange_name.title()) for coin in coins]}
+
+    monkeypatch.setattr(subscription_index, "evaluate", fake_evaluate)
+    coordinator = ScanCoordinator()
+    coordinator.coalesce_seconds = 0.05
+    sent = []
+
+    async def notify(user_id, msg):
+        sent.append((user_id, msg))
+
+    coin_a = [{"symbol": "AUSDT", "timestamp": 1000}]
+    coin_b = [{"symbol": "BUSDT", "timestamp": 1000}]
+    coin_c = [{"symbol": "CUSDT", "timestamp": 1000}]
+
+    async def scenario():
+        coordinator.register(1, {"period": 15, "threshold": 0.05}, ["binance", "bybit"], notify)
+        try:
+            await coordinator.handle_events([
+                StreamEvent("coins", "binance", [coin_a], 10.0),
+                StreamEvent("done", "binance", None, 10.0),
+            ])
+            # Bybit has not finished the cycle yet: the signals wait for the end of the window
+            assert not sent
+            await coordinator.handle_events([StreamEvent("coins", "bybit", [coin_b], 10.0)])
+            assert not sent
+            await asyncio.sleep(0.1)
+            assert len(sent) == 1 and coordinator.alerted_cycle == 10.0
+            # The slow symbol is sent as soon as its exchange is finished
+            await coordinator.handle_events([
+                StreamEvent("coins", "bybit", [coin_c], 10.0),
+                StreamEvent("done", "bybit", None, 10.0),
+            ])
+        finally:
+            coordinator.unregister(1)
+
+    asyncio.run(scenario())
+
+    assert len(sent) == 2
+    assert "AUSDT" in sent[0][1] and "BUSDT" in sent[0][1] and "CUSDT" in sent[1][1]
+    assert coordinator.flush_task is None and not coordinator.outbox
+
+
+def test_pending_signal_count_is_rendered():
+    signal = make_signal("AUSDT")
+    signal["count_signal_24h"] = None
+
+    parts = asyncio.run(ScanCoordinator().render_signals(1, [signal]))
+
+    assert "Number of signals per day: pending" in parts[0]
@@ -0,0 +1,68 @@
+from app_logic.market_store import MarketStore
+from app_logic.signal_counter import SignalCounter
+from app_logic.signal_engine import count_history_signals
+
+STEP = 5 * 60 * 1000
+
+
+def test_counter_matches_full_rescan_and_updates_incrementally():
+    store = MarketStore()
+    counter = SignalCounter(store)
+    values = [100.0, 100.0, 110.0, 110.0, 100.0, 120.0, 90.0, 100.0]
+    for candle, value in enumerate(values[:5], start=1):
+        store.put("binance", "BTCUSDT", candle * STEP, value)
+
+    def rescan(before_date):
+        timestamps, open_interest = store.get_history("binance", "BTCUSDT", before_date)
+        return count_history_signals(timestamps, open_interest, 3, STEP, 0.05)
+
+    assert counter.count("binance", "BTCUSDT", 3, 0.05, 5 * STEP) == rescan(5 * STEP) == 2
+
+    for candle, value in enumerate(values[5:], start=6):
+        store.put("binance", "BTCUSDT", candle * STEP, value)
+    assert counter.count("binance", "BTCUSDT", 3, 0.05, 8 * STEP) == rescan(8 * STEP) == 4
+    assert counter.evaluated[("binance", "BTCUSDT", 3, 0.05)] == 8
+    # Reads with an older upper bound only see the triggers up to it
+    assert counter.count("binance", "BTCUSDT", 3, 0.05, 6 * STEP) == 3
+    assert counter.count("bybit", "BTCUSDT", 3, 0.05, 8 * STEP) is None
+
+
+def test_counter_expires_triggers_older_than_window():
+    store = MarketStore(slots=1000)
+    counter = SignalCounter(store, window_ms=10 * STEP)
+    store.put("binance", "ETHUSDT", 1 * STEP, 100.0)
+    store.put("binance", "ETHUSDT", 2 * STEP, 200.0)
+    assert counter.count("binance", "ETHUSDT", 2, 0.05, 2 * STEP) == 1
+
+    store.put("binance", "ETHUSDT", 30 * STEP, 200.0)
+    assert counter.count("binance", "ETHUSDT", 2, 0.05, 30 * STEP) == 0
+    assert counter.triggers[("binance", "ETHUSDT", 2, 0.05)] == []
+
+
+def test_delisted_symbols_are_evicted():
+    counter = SignalCounter(MarketStore())
+    for key in (("binance", "BTCUSDT", 3, 0.05), ("binance", "OLDUSDT", 3, 0.05), ("bybit", "OLDUSDT", 3, 0.05)):
+        counter.triggers[key] = [1]
+        counter.evaluated[key] = 1
+
+    counter.retain_symbols("Binance", ["btcusdt"])
+
+    assert set(counter.triggers) == set(counter.evaluated) == {
+        ("binance", "BTCUSDT", 3, 0.05), ("bybit", "OLDUSDT", 3, 0.05)}
+
+
+def test_points_written_below_the_evaluated_candle_are_reevaluated():
+    store = MarketStore()
+    counter = SignalCounter(store)
+    for candle, value in ((1, 100.0), (3, 100.0), (4, 100.0)):
+        store.put("binance", "BTCUSDT", candle * STEP, value)
+    assert counter.count("binance", "BTCUSDT", 3, 0.05, 4 * STEP) == 0
+
+    # Gap backfill of candle 2: candles 2-4 are evaluated again with the new lookback point
+    store.put("binance", "BTCUSDT", 2 * STEP, 90.0)
+    assert counter.count("binance", "BTCUSDT", 3, 0.05, 4 * STEP) == 2
+
+    # A revised value drops the triggers it no longer supports
+    store.put("binance", "BTCUSDT", 2 * STEP, 100.0)
+    assert counter.count("binance", "BTCUSDT", 3, 0.05, 4 * STEP) == 0
+    assert counter.evaluated[("binance", "BTCUSDT", 3, 0.05)] == 4
@@ -0,0 +1,80 @@
+import random
+from app_logic.condition_handler import ConditionHandler
+from app_logic.signal_engine import build_oi_matrix, find_triggers, count_history_signals
+
+
+def loop_triggers(coins: list[list[dict]], threshold: float) -> dict[int, int]:
+    handler = ConditionHandler()
+    triggers = {}
+    for row, coin in enumerate(coins):
+        for i in range(1, len(coin)):
+            delta_oi = handler.delta_calculate(coin[0]['open_interest'], coin[i]['open_interest'])
+            if delta_oi is None or delta_oi <= threshold:
+                continue
+            triggers[row] = i
+            break
+    return triggers
+
+
+def loop_history_count(timestamps: list[int], open_interest: list[float],
+                       limit: int, step: int, threshold: float) -> int:
+    """The nested loop previously used by `ConditionHandler.calculate_signal_from_history`."""
+    handler = ConditionHandler()
+    count = 0
+    for i in range(len(timestamps) - (limit - 1)):
+        for j in range(1, limit):
+            if timestamps[i] - timestamps[i + j] != j * step:
+                continue
+            delta_oi = handler.delta_calculate(open_interest[i], open_interest[i + j])
+            if delta_oi is None or delta_oi <= threshold:
+                continue
+            count += 1
+            break
+    return count
+
+
+def make_coin(values: list[float]) -> list[dict]:
+    return [{"open_interest": value} for value in values]
+
+
+def test_matches_python_loop_on_random_data():
+    random.seed(1)
+    coins = [
+        make_coin([random.uniform(50, 150) for _ in range(random.randint(1, 7))])
+        for _ in range(500)
+    ]
+    coins.append(make_coin([0.0, 10.0, 20.0]))
+
+    for threshold in (0.0, 0.05, 0.3):
+        rows, first = find_triggers(build_oi_matrix(coins, 7), threshold)
+        assert dict(zip(rows.tolist(), first.tolist())) == loop_triggers(coins, threshold)
+
+
+def test_first_trigger_index():
+    coins = [make_coin([110.0, 108.0, 100.0, 90.0]), make_coin([100.0, 100.0])]
+    rows, first = find_triggers(build_oi_matrix(coins, 4), 0.05)
+    assert rows.tolist() == [0]
+    assert first.tolist() == [2]
+
+
+def test_empty_input():
+    rows, first = find_triggers(build_oi_matrix([], 7), 0.05)
+    assert len(rows) == 0 and len(first) == 0
+
+
+def test_history_count_matches_nested_loop():
+    random.seed(2)
+    step = 5
+    for _ in range(300):
+        # Descending timestamps with gaps and duplicates (repeated DB rows)
+        timestamps, ts = [], 2000
+        for _ in range(random.randint(0, 60)):
+            timestamps.append(ts)
+            ts -= random.choice((0, step, step, step, 2 * step, 3 * step))
+        open_interest = [random.choice((0.0, -50.0, random.uniform(90, 110))) if random.random() < 0.05
+                         else random.uniform(90, 110) for _ in timestamps]
+
+        for limit in (2, 4, 7):
+            for threshold in (0.0, 0.03, 0.1):
+                expected = loop_history_count(timestamps, open_interest, limit, step, threshold)
+                assert count_history_signals(timestamps, open_interest, limit, step, threshold) == expected
@@ -0,0 +1,56 @@
+import random
+from app_logic.signal_engine import build_oi_matrix, find_triggers, max_delta_profile
+from app_logic import subscription_index as subscription_index_module
+from app_logic.market_store import MarketStore
+from app_logic.signal_counter import SignalCounter
+from app_logic.subscription_index import SubscriptionIndex
+
+
+def test_match_equals_per_threshold_evaluation():
+    random.seed(3)
+    coins = [[{"open_interest": random.uniform(80, 120)} for _ in range(random.randint(1, 4))]
+             for _ in range(300)]
+    coins.append([{"open_interest": 0.0}, {"open_interest": 10.0}])
+    oi = build_oi_matrix(coins, 4)
+    thresholds = [0.0, 0.02, 0.05, 0.1, 0.3]
+
+    starts = SubscriptionIndex.match(thresholds, max_delta_profile(oi))
+
+    for threshold in thresholds:
+        rows, first = find_triggers(oi, threshold)
+        assert starts.get(threshold, {}) == dict(zip(rows.tolist(), first.tolist()))
+
+
+def test_users_are_grouped_by_configuration():
+    index = SubscriptionIndex()
+    index.add(1, 15, 0.05)
+    index.add(2, 15, 0.05)
+    index.add(3, 15, 0.02)
+    index.add(4, 30, 0.05)
+    assert index.thresholds == {15: [0.02, 0.05], 30: [0.05]}
+
+    # Changing settings moves the user to another configuration
+    index.add(3, 30, 0.05)
+    index.remove(4)
+    index.remove(99)
+    assert index.thresholds == {15: [0.05], 30: [0.05]}
+    assert index.users == {(15, 0.05): {1, 2}, (30, 0.05): {3}}
+
+
+def test_signal_counts_of_an_abandoned_configuration_are_evicted(monkeypatch):
+    counter = SignalCounter(MarketStore())
+    monkeypatch.setattr(subscription_index_module, "signal_counter", counter)
+    index = SubscriptionIndex()
+    index.add(1, 15, 0.05)
+    index.add(2, 15, 0.05)
+    # 15 minutes of 5-minute candles: 4 points
+    for key in (("binance", "BTCUSDT", 4, 0.05), ("bybit", "ETHUSDT", 4, 0.05), ("binance", "BTCUSDT", 7, 0.05)):
+        counter.triggers[key] = [1]
+        counter.evaluated[key] = 1
+
+    index.add(1, 15, 0.05)
+    index.remove(1)
+    assert ("binance", "BTCUSDT", 4, 0.05) in counter.triggers
+
+    index.add(2, 30, 0.05)
+    assert set(counter.triggers) == set(counter.evaluated) == {("binance", "BTCUSDT", 7, 0.05)}
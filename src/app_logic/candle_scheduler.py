@@ -0,0 +1,112 @@
+"""
+candle_scheduler.py
+
+This module defines the CandleScheduler class, which runs periodic work aligned to candle closes.
+
+Unlike a fixed `asyncio.sleep()` after each cycle, the scheduler computes the next start time
+from the wall clock (candle close + settle delay), so cycles never drift. Every cycle gets a hard
+deadline: work still running when it expires is cancelled instead of overrunning into the next candle.
+The lateness of each cycle (actual start minus scheduled start) is logged and kept for monitoring.
+
+Classes:
+    CandleScheduler: Candle-close-aligned scheduler with a per-cycle deadline budget.
+"""
+
+import asyncio
+import time
+from typing import Awaitable
+from app_logic.default_settings import MIN_INTERVAL, CANDLE_SETTLE_SECOND, CYCLE_DEADLINE_SECOND
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class CandleScheduler:
+    """
+    Schedules cycles at candle close plus a settle delay and enforces a deadline per cycle.
+
+    Attributes:
+        step (int): Candle duration in seconds.
+        settle_delay (float): Delay after the candle close before the cycle starts, in seconds.
+        deadline (float): Time budget of a cycle counted from its scheduled start, in seconds.
+        last_lateness (float | None): Lateness of the most recent cycle, in seconds.
+        last_duration (float | None): Duration of the most recent cycle, in seconds.
+    """
+    def __init__(self,
+                 interval: str = MIN_INTERVAL,
+                 settle_delay: float = CANDLE_SETTLE_SECOND,
+                 deadline: float = CYCLE_DEADLINE_SECOND):
+        self.step = int(interval) * 60
+        self.settle_delay = settle_delay
+        self.deadline = min(deadline, self.step)
+        self.last_lateness: float | None = None
+        self.last_duration: float | None = None
+
+
+    def next_fire_time(self, now: float) -> float:
+        """
+        Returns the next start time (candle close + settle delay) strictly after `now`.
+
+        Args:
+            now (float): Current UNIX time in seconds.
+
+        Returns:
+            float: Scheduled start time as UNIX time in seconds.
+        """
+        candle_close = (now - self.settle_delay) // self.step * self.step + self.step
+        return candle_close + self.settle_delay
+
+
+    async def wait_next_cycle(self, wakeup: asyncio.Event = None) -> float:
+        """
+        Sleeps until the next scheduled start, or until `wakeup` is set.
+
+        Args:
+            wakeup (asyncio.Event, optional): Event that triggers an unscheduled cycle immediately.
+
+        Returns:
+            float: Scheduled start time of the cycle (the current time for an unscheduled cycle).
+        """
+        fire_time = self.next_fire_time(time.time())
+        delay = max(fire_time - time.time(), 0)
+
+        if wakeup is None:
+            await asyncio.sleep(delay)
+            return fire_time
+
+        try:
+            await asyncio.wait_for(wakeup.wait(), timeout=delay)
+            return time.time()
+        except asyncio.TimeoutError:
+            return fire_time
+
+
+    async def run_cycle(self, work: Awaitable, scheduled: float) -> bool:
+        """
+        Runs one cycle under the deadline and reports its lateness and duration.
+
+        Args:
+            work (Awaitable): Coroutine performing the cycle.
+            scheduled (float): Scheduled start time returned by `wait_next_cycle`.
+
+        Returns:
+            bool: True if the cycle finished in time, False if it was cancelled by the deadline.
+        """
+        started = time.time()
+        self.last_lateness = started - scheduled
+        remaining = scheduled + self.deadline - started
+        finished = True
+
+        try:
+            async with asyncio.timeout(max(remaining, 0)):
+                await work
+        except TimeoutError:
+            finished = False
+
+        self.last_duration = time.time() - started
+        if finished:
+            logger.info(f"Cycle done: lateness {self.last_lateness:.2f}s, duration {self.last_duration:.2f}s")
+        else:
+            logger.warning(f"Cycle cancelled by deadline ({self.deadline}s): "
+                           f"lateness {self.last_lateness:.2f}s, duration {self.last_duration:.2f}s")
+        return finished
@@ -6,8 +6,11 @@ based on open interest (OI), price, and volume changes across multiple crypto ex
 
 Core responsibilities:
 - Calculate deltas of OI, price, and volume over a defined period.
-- Fetch and analyze historical data to detect signal events.
-- Interact with the database to store signals and historical records.
+- Fetch and analyze historical data (in-memory market store or database) to detect signal events.
+- Confirm signals with price and volume deltas computed from the shared kline cache.
+
+The OI series are downloaded by the shared market poller and evaluated per (period, threshold)
+by `SubscriptionIndex.evaluate`, which configures a handler and calls `confirm_signals`.
 
 Classes:
     ConditionHandler: Main engine for detecting open interest–based signals.
@@ -17,15 +20,19 @@ Constants:
 
 Requires:
     - BaseExchangeListener: Abstract class to unify data fetching from exchanges.
-    - Database utilities (add_signal_in_db, etc.)
+    - signal_engine: Vectorized count of the signals in an OI history.
+    - kline_cache: Rolling OHLCV cache, prefetched for all candidates in one batch.
+    - signal_counter: Incrementally maintained 24h signal counts.
+    - Database utilities (get_historical_oi)
 """
 
-import asyncio
-import aiohttp
 from datetime import datetime
 from exchange_listeners.base_listener import BaseExchangeListener
-from app_logic.default_settings import DEFAULT_SETTINGS, MIN_INTERVAL
-from db.hist_signal_db import add_history_in_db, get_historical_oi
+from app_logic.history_backfill import history_backfill
+from app_logic.kline_cache import kline_cache
+from app_logic.signal_counter import signal_counter
+from app_logic.signal_engine import count_history_signals
+from db.hist_signal_db import get_historical_oi
 from logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -103,74 +110,84 @@ class ConditionHandler:
         return f"{value * 100:.2f}%"
 
 
-    async def is_signal(self,
-                        symbols: list,
-                        threshold_period: int = DEFAULT_SETTINGS["period"],
-                        interval: str = MIN_INTERVAL,
-                        threshold: float = DEFAULT_SETTINGS["threshold"]):
+    def configure(self, symbols: list, threshold_period: int, interval: str, threshold: float):
         """
-        Main entry point to evaluate signals across given symbols.
+        Sets the evaluation parameters and derives the number of data points per symbol.
 
         Args:
             symbols (list): List of trading symbols to evaluate.
             threshold_period (int): Time range in minutes to calculate deltas.
             interval (str): Timeframe for candles (e.g., "5").
             threshold (float): Required OI delta to trigger a signal.
-
-        Returns:
-            list[dict]: All symbols that triggered a signal.
         """
-
         self.symbols = symbols
         self.interval = interval
         self.threshold_period = threshold_period
         self.limit = int(self.threshold_period / AVAILABLE_INTERVAL[self.interval]) + 1
         self.threshold = threshold
 
-        signal_coins = []
 
-        # Download the OI data from exchange
-        coins = await self.fetch_oi_data()
+    def prepare_coins(self, coins: list, limit: int) -> list[list[dict]]:
+        """
+        Drops failed and empty series and keeps the latest `limit` points of the others.
+
+        Args:
+            coins (list): OI series per symbol (or exceptions of failed requests).
+            limit (int): Number of points to keep per symbol.
 
+        Returns:
+            list[list[dict]]: Series sorted by timestamp descending.
+        """
+        valid_coins = []
         for coin in coins:
             if isinstance(coin, Exception):
                 logger.warning(f"Error while receiving data: {coin}")
                 continue
-
-            result = await self.process_coin_data(coin)
-            if result:
-                signal_coins.append(result)
-
-        return signal_coins
+            if coin:
+                # The data may cover a longer period than needed (shared snapshot)
+                valid_coins.append(self.sort_by_timestamp_reverse(coin)[:limit])
+        return valid_coins
 
 
-    async def fetch_oi_data(self) -> list:
+    async def confirm_signals(self, coins: list[list[dict]], start_by_row: dict[int, int]) -> list[dict]:
         """
-        Downloads open interest (OI) data for all symbols concurrently.
+        Confirms the candidates found by the signal engine with price and volume data.
+
+        Args:
+            coins (list[list[dict]]): OI series per symbol, sorted by timestamp descending.
+            start_by_row (dict[int, int]): First triggering lookback index per candidate row.
 
         Returns:
-            list: List of OI time series data for each symbol.
+            list[dict]: All symbols that triggered a signal.
         """
-        _session = aiohttp.ClientSession()
-        try:
-            tasks = [
-                self.client.fetch_oi(symbol.upper(), self.interval, self.limit, _session)
-                for symbol in self.symbols
-            ]
-            coins = await asyncio.gather(*tasks, return_exceptions=True)
-            return [coin for coin in coins if not isinstance(coin, Exception)]
-        finally:
-            await _session.close()
+        signal_coins = []
+        if not start_by_row:
+            return signal_coins
 
+        # Load the klines of all candidates in one concurrent batch
+        await kline_cache.prefetch(self.client, coins[0][0]['exchange'], [
+            (coins[row][0]['symbol'], coins[row][-1]['timestamp'], coins[row][0]['timestamp'])
+            for row in start_by_row
+        ])
 
-    async def process_coin_data(self, coin: list[dict]) -> dict | None:
+        for row, start in sorted(start_by_row.items()):
+            result = await self.process_coin_data(coins[row], start)
+            if result:
+                signal_coins.append(result)
+
+        return signal_coins
+
+
+    async def process_coin_data(self, coin: list[dict], start: int = 1) -> dict | None:
         """
         Processes a single symbol's OI data and determines if a signal is present.
 
-        Saves history to DB, calculates delta, and evaluates signal condition.
+        Calculates delta and evaluates signal condition.
 
         Args:
-            coin (list[dict]): OI data for a specific symbol.
+            coin (list[dict]): OI data for a specific symbol, sorted by timestamp descending.
+            start (int, optional): First lookback index whose delta exceeds the threshold,
+                as found by the signal engine. None if the symbol did not trigger.
 
         Returns:
             dict | None: Signal info if condition met, otherwise None.
@@ -178,17 +195,14 @@ class ConditionHandler:
         if not coin:
             return None
 
-        coin = self.sort_by_timestamp_reverse(coin)
         signal = {}
         symbol = coin[0].get('symbol', 'unknown')
         exchange_name = coin[0].get('exchange', 'unknown')
 
-        try:
-            await add_history_in_db(symbol, exchange_name, coin[0]['timestamp'], coin[0]['open_interest'])
-        except Exception as e:
-            logger.error(f"Error saving history to database: {e}", exc_info=True)
+        if start is None:
+            return signal
 
-        for i in range(1, len(coin)):
+        for i in range(start, len(coin)):
             delta_oi = self.delta_calculate(coin[0]['open_interest'], coin[i]['open_interest'])
             if delta_oi is None or delta_oi <= self.threshold:
                 continue
@@ -218,20 +232,12 @@ class ConditionHandler:
         start_date = coin[i]['timestamp']
         end_date = coin[0]['timestamp']
 
-        _session = aiohttp.ClientSession()
-        try:
-            ohlcv = await self.client.fetch_ohlcv(symbol, start_date, end_date, str(self.interval), _session)
-        except Exception as e:
-            logger.error(f"Error while getting OHLCV: {e}", exc_info=True)
-            return None
-        finally:
-            await _session.close()
+        # Prefetched by confirm_signals, sorted by timestamp descending
+        ohlcv = kline_cache.get_ohlcv(exchange_name, symbol, start_date, end_date)
 
-        if not ohlcv or len(ohlcv) < 2:
+        if len(ohlcv) < 2 or len(ohlcv) <= i:
             return None
 
-        ohlcv = self.sort_by_timestamp_reverse(ohlcv)
-
         delta_price = self.delta_calculate(ohlcv[0]['close'], ohlcv[i]['close'])
         delta_volume = self.delta_calculate(ohlcv[0]['volume'], ohlcv[i]['volume'])
 
@@ -242,10 +248,11 @@ class ConditionHandler:
             logger.warning("Incorrect datetime format")
             return None
 
-        # Calculate the number of signals from history
+        # Calculate the number of signals from history (None while the history is being backfilled)
         count_signal = 1
         try:
-            count_signal += await self.calculate_signal_from_history(symbol, exchange_name, int(start_date))
+            history_count = await self.calculate_signal_from_history(symbol, exchange_name, int(start_date))
+            count_signal = None if history_count is None else count_signal + history_count
         except Exception as e:
             logger.error(f"Error calculate signal from history: {e}", exc_info=True)
 
@@ -272,34 +279,32 @@ class ConditionHandler:
         """
         Calculates how many signals would have triggered based on historical OI data.
 
+        The count is read from the incremental signal counter, which is updated from the in-memory
+        market store. The database history is scanned (in linear time, by
+        `signal_engine.count_history_signals`) only if the store has no data for the symbol yet.
+        While the startup history backfill is running, no count is computed from the incomplete day;
+        the signal is sent right away with its count reported as pending.
+
         Args:
             symbol (str): Trading symbol.
             exchange_name (str): Exchange name.
             before_date (int): Timestamp to fetch data before.
 
         Returns:
-            int: Count of matching historical signal events.
+            int | None: Count of matching historical signal events, or None while the history is backfilled.
         """
-        _count_signal = 0
-        _delta_oi = 0
+        if not history_backfill.ready.is_set():
+            return None
+
+        count = signal_counter.count(exchange_name, symbol, self.limit, self.threshold, before_date)
+        if count is not None:
+            return count
 
         history_io = await get_historical_oi(symbol, exchange_name, before_date)
-        if not history_io:
+        timestamps = [row['timestamp'] for row in history_io]
+        open_interest = [row['open_interest'] for row in history_io]
+        if not timestamps:
             return 0
 
-        for i in range(len(history_io) - (self.limit - 1)):
-            for j in range(1, self.limit):
-                # Check that the values in the time series are consistent
-                if history_io[i]['timestamp'] - history_io[i + j]['timestamp'] != j * AVAILABLE_INTERVAL[self.interval] * 60 * 1000:
-                    continue
-
-                _delta_oi = self.delta_calculate(history_io[i]['open_interest'], history_io[i + j]['open_interest'])
-                if _delta_oi is None or _delta_oi <= self.threshold:
-                    continue
-
-                _count_signal += 1
-                break
-
-        return _count_signal
-
-
+        step = AVAILABLE_INTERVAL[self.interval] * 60 * 1000
+        return count_history_signals(timestamps, open_interest, self.limit, step, self.threshold)
@@ -49,15 +49,85 @@ Used to throttle update frequency between checks.
 """
 
 
-SLEEP_TIMER_SECOND = 300
+CANDLE_SETTLE_SECOND = 10
 """
-int: Default interval (in seconds) between scanner cycles or background checks (e.g., 5 minutes).
+int: Delay (in seconds) after a candle close before a scan cycle starts.
+
+Gives the exchanges time to publish Open Interest data for the candle that has just closed.
+"""
+TICKER_SETTLE_WINDOW_SECOND = 30
+"""
+int: Time (in seconds) after a candle boundary during which the Open Interest of the Bybit tickers
+is taken as the value of the candle that opened at the boundary.
+
+Longer than CANDLE_SETTLE_SECOND, so scheduled cycles use the tickers. A later (unscheduled) poll
+would stamp a mid-candle value on the candle, so it takes the points from the history endpoint instead.
+"""
+CYCLE_DEADLINE_SECOND = 120
+"""
+int: Hard time budget (in seconds) of a scan cycle, counted from its scheduled start.
+
+Fetches still running when the budget is exhausted are cancelled, so a slow cycle never
+overruns into the next candle.
+"""
+ALERT_COALESCE_SECOND = 2
+"""
+int: Time (in seconds) the signals streamed during a scan cycle are collected after its first signal
+before they are sent, so each user gets one message with the signals of all exchanges that arrived
+meanwhile. Sent earlier when every exchange of the cycle is finished.
 """
 MIN_INTERVAL = "5"
 """
 str: Minimum timeframe (in minutes) used for Open Interest data requests to exchanges.
 Used as a default granularity for analysis.
 """
+MAX_PERIOD = 30
+"""
+int: Maximum period (in minutes) a user can select for measuring Open Interest change.
+
+The shared market poller fetches enough data points to cover this period,
+so that every scanner can evaluate its own period from the same snapshot.
+"""
+
+HISTORY_SLOTS = 288
+"""
+int: Number of 5-minute data points kept in memory per symbol (24 hours).
+
+Defines the size of each ring buffer in the in-memory market store.
+"""
+
+SNAPSHOT_INTERVAL_SECOND = 300
+"""
+int: Interval (in seconds) between two snapshots of the in-memory market data.
+
+On restart, the market data is restored from the latest snapshot and only the gap since then is fetched.
+"""
+BACKFILL_CONCURRENCY = 10
+"""
+int: Maximum number of symbols whose 24h OI history is downloaded at the same time during the startup backfill.
+
+Requests are additionally paced by the rate limiter of each exchange listener.
+"""
+BACKFILL_SYMBOLS_TIMEOUT_SECOND = 60
+"""
+int: How long (in seconds) the startup backfill waits for the symbol lists of all exchanges.
+"""
+
+TELEGRAM_GLOBAL_RATE = 30
+"""
+int: Maximum number of outgoing Telegram messages per second across all chats.
+"""
+TELEGRAM_CHAT_RATE = 1
+"""
+int: Maximum number of outgoing Telegram messages per second to a single chat.
+"""
+TELEGRAM_MESSAGE_LIMIT = 4096
+"""
+int: Maximum length of a Telegram message in characters.
+
+Signals of one cycle are combined into as few messages as this limit allows.
+"""
+
 
 POPULAR_TIMEZONES_BY_OFFSET = {
     -12: ["Etc/GMT+12"],
@@ -0,0 +1,238 @@
+"""
+history_backfill.py
+
+This module implements the warm-start backfill of the last 24 hours of open interest (OI) history.
+
+After a restart the in-memory market store is empty and the history database is stale, so the
+number of signals of the last 24 hours would be wrong for a whole day. On startup, the backfill
+downloads the full day of OI history of every symbol of every exchange in bulk: the exchanges are
+processed concurrently, the symbols of an exchange with a bounded number of concurrent requests
+(paced by the listener's rate limiter), using each exchange's largest history page
+(`BaseExchangeListener.fetch_oi_history`). The points are written into the market store and the
+history database, and the progress is logged per exchange. Symbols restored from a market
+snapshot (see market_snapshot.py) only download the candles missing since the snapshot, and gaps
+short enough to be closed by the next market poller cycle are not downloaded at all.
+
+Signals are not delayed by the backfill, but their 24h counts are reported as pending until it
+finishes (see `ConditionHandler.calculate_signal_from_history`), so no count is computed from an
+incomplete day.
+
+Classes:
+    HistoryBackfill: Loads the 24h OI history of all symbols on startup and gates signal counting.
+
+Globals:
+    history_backfill (HistoryBackfill): Singleton instance started by the application entry point.
+"""
+
+import asyncio
+import math
+import time
+from app_logic.default_settings import (DEFAULT_EXCHANGES, MIN_INTERVAL, MAX_PERIOD, HISTORY_SLOTS,
+                                        BACKFILL_CONCURRENCY, BACKFILL_SYMBOLS_TIMEOUT_SECOND)
+from app_logic.market_store import MarketStore, market_store, NO_DATA
+from app_logic.symbol_list_handler import symbol_list
+from db.hist_signal_db import add_history_batch
+from exchange_listeners.base_listener import BaseExchangeListener
+from exchange_listeners.listener_manager import ListenerManager
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class HistoryBackfill:
+    """
+    Downloads the 24h OI history of all symbols once on startup.
+
+    Attributes:
+        manager (ListenerManager): Provides listeners for all supported exchanges.
+        store (MarketStore): Store receiving the history.
+        interval (str): Timeframe of the OI data in minutes.
+        limit (int): Number of points downloaded per symbol without stored data (a full ring buffer).
+        poller_limit (int): Number of points the market poller fetches per symbol and cycle.
+            Shorter gaps are left to the poller.
+        concurrency (int): Maximum number of concurrent symbol downloads per exchange.
+        progress (dict[str, tuple[int, int]]): Processed and total number of symbols per exchange.
+        ready (asyncio.Event): Set when no backfill is running. Cleared by `start()` until the backfill finishes.
+    """
+    def __init__(self, store: MarketStore = market_store, interval: str = MIN_INTERVAL,
+                 limit: int = HISTORY_SLOTS, concurrency: int = BACKFILL_CONCURRENCY):
+        self.manager = ListenerManager(enabled_exchanges=DEFAULT_EXCHANGES)
+        self.store = store
+        self.interval = interval
+        self.limit = limit
+        self.poller_limit = int(MAX_PERIOD / int(MIN_INTERVAL)) + 1
+        self.concurrency = concurrency
+        self.progress: dict[str, tuple[int, int]] = {}
+        self.ready = asyncio.Event()
+        self.ready.set()
+
+
+    def start(self) -> asyncio.Task:
+        """
+        Closes the signal counting gate and starts the backfill as a background task.
+
+        Returns:
+            asyncio.Task: The task running the backfill.
+        """
+        self.ready.clear()
+        return asyncio.create_task(self.run())
+
+
+    async def wait_for_symbols(self, timeout: float = BACKFILL_SYMBOLS_TIMEOUT_SECOND) -> dict[str, list[str]]:
+        """
+        Waits until the symbol lists of all enabled exchanges are loaded.
+
+        Args:
+            timeout (float, optional): Maximum waiting time in seconds.
+
+        Returns:
+            dict[str, list[str]]: Symbols per exchange. Exchanges still without symbols at the timeout are left out.
+        """
+        names = [name for exchange in self.manager.get_all_active_listeners() for name in exchange]
+        deadline = time.monotonic() + timeout
+        while not all(symbol_list.symbols_by_exchange.get(name) for name in names):
+            if time.monotonic() >= deadline:
+                break
+            await asyncio.sleep(1)
+        return {name: list(symbol_list.symbols_by_exchange[name])
+                for name in names if symbol_list.symbols_by_exchange.get(name)}
+
+
+    def missing_points(self, name: str, symbol: str, now_ms: int) -> int:
+        """
+        Returns the number of most recent points of a symbol to download so that every candle of the
+        last `limit` candles is stored: the points from the oldest missing candle up to now.
+
+        The stored candles are checked one by one, so recent points written by the market poller
+        (e.g., on a subscription during the backfill) do not hide the missing older history.
+
+        Args:
+            name (str): Exchange name.
+            symbol (str): Trading symbol.
+            now_ms (int): Current time in milliseconds.
+        """
+        buffer = self.store.get_buffer(name, symbol)
+        if buffer is None or buffer.last_candle == NO_DATA:
+            return self.limit
+
+        now_candle = now_ms // buffer.step_ms
+        first = now_candle - self.limit + 1
+        stored = {candle for candle, open_interest in zip(buffer.candles, buffer.open_interest)
+                  if candle >= first and not math.isnan(open_interest)}
+        for candle in range(first, now_candle + 1):
+            if candle not in stored:
+                return now_candle - candle + 1
+        return 0
+
+
+    async def backfill_symbol(self, name: str, listener: BaseExchangeListener, symbol: str,
+                              semaphore: asyncio.Semaphore) -> list[tuple[str, str, int, float]]:
+        """
+        Downloads the missing history of one symbol and writes it into the market store.
+
+        Args:
+            name (str): Exchange name.
+            listener (BaseExchangeListener): Listener of the exchange.
+            symbol (str): Trading symbol.
+            semaphore (asyncio.Semaphore): Bounds the concurrent downloads of the exchange.
+
+        Returns:
+            list[tuple[str, str, int, float]]: History database rows of the points that were not stored yet
+                (points already written by the market poller are skipped).
+        """
+        async with semaphore:
+            limit = self.missing_points(name, symbol, int(time.time() * 1000))
+            if limit <= self.poller_limit and limit < self.limit:
+                return []
+            coin = await listener.fetch_oi_history(symbol, self.interval, limit, listener.session)
+
+        rows = []
+        for point in coin:
+            buffer = self.store.get_buffer(point["exchange"], point["symbol"])
+            is_new = buffer is None or buffer.get_oi(point["timestamp"]) is None
+            if self.store.put(point["exchange"], point["symbol"], point["timestamp"], point["open_interest"]) and is_new:
+                rows.append((point["symbol"], point["exchange"], point["timestamp"], point["open_interest"]))
+        return rows
+
+
+    async def save_rows(self, rows: list[tuple[str, str, int, float]]):
+        """
+        Writes backfilled points into the history database. Errors are logged, not raised.
+
+        Args:
+            rows (list[tuple[str, str, int, float]]): (symbol, exchange, timestamp, open_interest) of each point.
+        """
+        try:
+            await add_history_batch(rows)
+        except Exception as e:
+            logger.error(f"Error saving backfilled history to database: {e}", exc_info=True)
+
+
+    async def backfill_exchange(self, name: str, listener: BaseExchangeListener, symbols: list[str]):
+        """
+        Downloads the history of all symbols of one exchange, logging the progress in steps of 10%.
+
+        The database rows are written in one batch per progress step.
+
+        Args:
+            name (str): Exchange name.
+            listener (BaseExchangeListener): Listener of the exchange.
+            symbols (list[str]): Symbols of the exchange.
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+        tasks = [asyncio.create_task(self.backfill_symbol(name, listener, symbol, semaphore)) for symbol in symbols]
+        total = len(tasks)
+        done = 0
+        reported = 0
+        rows = []
+        self.progress[name] = (done, total)
+
+        try:
+            for task in asyncio.as_completed(tasks):
+                try:
+                    rows.extend(await task)
+                except Exception as e:
+                    logger.warning(f"[{name.upper()}] Error while backfilling history: {e}")
+                done += 1
+                self.progress[name] = (done, total)
+
+                if done * 10 // total > reported:
+                    reported = done * 10 // total
+                    await self.save_rows(rows)
+                    rows = []
+                    logger.info(f"[{name.upper()}] History backfill: {done}/{total} symbols")
+        finally:
+            for task in tasks:
+                task.cancel()
+
+
+    async def run(self):
+        """
+        Backfills the history of all exchanges concurrently and opens the signal counting gate.
+
+        The gate is opened even if the backfill fails, so signal counts are never pending forever.
+        """
+        started = time.monotonic()
+        try:
+            symbols_by_exchange = await self.wait_for_symbols()
+            listeners = {name: listener for exchange in self.manager.get_all_active_listeners()
+                         for name, listener in exchange.items() if name in symbols_by_exchange}
+
+            results = await asyncio.gather(
+                *(self.backfill_exchange(name, listener, symbols_by_exchange[name]) for name, listener in listeners.items()),
+                return_exceptions=True
+            )
+            for name, result in zip(listeners, results):
+                if isinstance(result, Exception):
+                    logger.error(f"[{name.upper()}] History backfill failed: {result}")
+
+            logger.info(f"History backfill finished in {time.monotonic() - started:.1f}s: {self.progress}")
+        finally:
+            self.ready.set()
+
+
+
+history_backfill = HistoryBackfill()
+"""
+Singleton instance of HistoryBackfill started by the application entry point.
+"""
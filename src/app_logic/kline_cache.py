@@ -0,0 +1,161 @@
+"""
+kline_cache.py
+
+This module defines the KlineCache class, a rolling per-(exchange, symbol) cache of OHLCV candles.
+
+Signal confirmation needs the close price and volume of the candles covering the OI window of
+a candidate. Instead of one HTTP request per candidate and per user, the klines are kept in the
+price/volume columns of the shared market store and fetched incrementally: only candles that are
+missing or were still forming at the last fetch are downloaded. All candidates of a cycle are
+prefetched in one concurrent batch, and concurrent requests for the same symbol (e.g. from several
+users' scanners) share a single in-flight fetch.
+
+Classes:
+    KlineCache: Incremental OHLCV cache backed by the market store.
+
+Globals:
+    kline_cache (KlineCache): Singleton instance shared by all condition handlers.
+"""
+
+import asyncio
+import time
+from exchange_listeners.base_listener import BaseExchangeListener
+from app_logic.default_settings import MIN_INTERVAL
+from app_logic.market_store import MarketStore, market_store
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class KlineCache:
+    """
+    Rolling OHLCV cache filled on demand from the exchange listeners.
+
+    Attributes:
+        store (MarketStore): Store holding the cached close prices and volumes.
+        interval (str): Kline interval in minutes.
+        step_ms (int): Kline duration in milliseconds.
+        final_until (dict[tuple[str, str], int]): Open time of the latest closed (final) kline
+            cached per (exchange, symbol).
+        fetched (dict[tuple[str, str], tuple[int, int]]): End of the range covered by the latest fetch
+            and the time of that fetch (ms) per (exchange, symbol).
+        in_flight (dict[tuple[str, str, int, int], asyncio.Task]): Running fetches keyed by
+            (exchange, symbol, start_date, end_date).
+    """
+    def __init__(self, store: MarketStore = market_store, interval: str = MIN_INTERVAL):
+        self.store = store
+        self.interval = interval
+        self.step_ms = int(interval) * 60 * 1000
+        self.final_until: dict[tuple[str, str], int] = {}
+        self.fetched: dict[tuple[str, str], tuple[int, int]] = {}
+        self.in_flight: dict[tuple[str, str, int, int], asyncio.Task] = {}
+
+
+    def missing_since(self, exchange: str, symbol: str, start_date: int) -> int:
+        """
+        Returns the open time of the first kline that has to be fetched to cover a range from `start_date`.
+
+        Args:
+            exchange (str): Exchange name.
+            symbol (str): Trading symbol.
+            start_date (int): Start of the requested range in milliseconds.
+        """
+        final = self.final_until.get((exchange.lower(), symbol.upper()))
+        start = -(-int(start_date) // self.step_ms) * self.step_ms
+        if final is None or final < start:
+            return start
+
+        # Every final kline must still be in the store (a gap means it was never delivered)
+        cached = self.store.get_klines(exchange, symbol, start, final)
+        if len(cached) < (final - start) // self.step_ms + 1:
+            return start
+        return final + self.step_ms
+
+
+    async def fetch(self, listener: BaseExchangeListener, exchange: str, symbol: str,
+                    start_date: int, end_date: int):
+        """
+        Downloads the missing klines of a range and stores them.
+
+        Args:
+            listener (BaseExchangeListener): Listener of the exchange.
+            exchange (str): Exchange name.
+            symbol (str): Trading symbol.
+            start_date (int): Start of the range in milliseconds.
+            end_date (int): End of the range in milliseconds.
+        """
+        key = (exchange.lower(), symbol.upper())
+        since = self.missing_since(exchange, symbol, start_date)
+        if since > end_date:
+            return
+
+        # The forming kline is refreshed once per candle, not for every caller
+        fetched_at = int(time.time() * 1000)
+        covered, last_fetch = self.fetched.get(key, (None, 0))
+        if (covered is not None and covered >= end_date and
+                last_fetch // self.step_ms == fetched_at // self.step_ms and
+                len(self.store.get_klines(exchange, symbol, since, end_date)) > (end_date - since) // self.step_ms):
+            return
+
+        ohlcv = await listener.fetch_ohlcv(symbol, since, end_date, self.interval, listener.session)
+        if not ohlcv:
+            return
+
+        self.store.put_klines(exchange, symbol, ohlcv)
+        self.fetched[key] = (int(end_date), fetched_at)
+
+        # A kline is final once its close time has passed at the moment of the fetch
+        closed = [candle["timestamp"] for candle in ohlcv if candle["timestamp"] + self.step_ms <= fetched_at]
+        if closed:
+            self.final_until[key] = max(max(closed), self.final_until.get(key, 0))
+
+
+    async def prefetch(self, listener: BaseExchangeListener, exchange: str,
+                       requests: list[tuple[str, int, int]]):
+        """
+        Makes sure the klines of all requested ranges are cached, fetching them concurrently.
+
+        Fetches of the same symbol and range that are already running are awaited instead of repeated.
+
+        Args:
+            listener (BaseExchangeListener): Listener of the exchange.
+            exchange (str): Exchange name.
+            requests (list[tuple[str, int, int]]): (symbol, start_date, end_date) of each range.
+        """
+        tasks = []
+        for symbol, start_date, end_date in requests:
+            key = (exchange.lower(), symbol.upper(), int(start_date), int(end_date))
+            task = self.in_flight.get(key)
+            if task is None:
+                task = asyncio.create_task(self.fetch(listener, exchange, symbol, start_date, end_date))
+                task.add_done_callback(lambda _, key=key: self.in_flight.pop(key, None))
+                self.in_flight[key] = task
+            tasks.append(task)
+
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                logger.warning(f"Error while prefetching {exchange} klines: {result}")
+
+
+    def get_ohlcv(self, exchange: str, symbol: str, start_date: int, end_date: int) -> list[dict]:
+        """
+        Returns the cached klines of a range, most recent first.
+
+        Args:
+            exchange (str): Exchange name.
+            symbol (str): Trading symbol.
+            start_date (int): Start of the range in milliseconds.
+            end_date (int): End of the range in milliseconds.
+
+        Returns:
+            list[dict]: Candles with 'timestamp', 'close' and 'volume' keys.
+        """
+        return self.store.get_klines(exchange, symbol, start_date, end_date)
+
+
+
+kline_cache = KlineCache()
+"""
+Singleton instance of KlineCache shared by all scanners.
+"""
@@ -0,0 +1,317 @@
+"""
+market_poller.py
+
+This module implements a shared market-data poller. Instead of every user scanner requesting
+open interest (OI) data on its own, the poller downloads the OI series of each symbol once per
+candle for every exchange and publishes the resulting snapshot to all subscribed scanners.
+
+Exchange request volume therefore depends only on the number of symbols, not on the number of users.
+Every fetched series is also written into the in-memory market store, and the points that were
+new to it (or changed a stored value) are saved to the history database in one batch per exchange.
+
+Streaming subscribers additionally receive the series of every symbol as soon as it arrives
+(before the snapshot of its exchange is complete), followed by an end marker per exchange.
+
+Classes:
+    StreamEvent: Event delivered to streaming subscribers.
+    MarketPoller: Fetches OI snapshots per exchange and fans them out to subscribers.
+
+Globals:
+    market_poller (MarketPoller): Singleton instance used by scanners and the application entry point.
+"""
+
+import asyncio
+import time
+from typing import NamedTuple
+from app_logic.default_settings import DEFAULT_EXCHANGES, MIN_INTERVAL, MAX_PERIOD
+from app_logic.candle_scheduler import CandleScheduler
+from app_logic.market_store import market_store
+from app_logic.symbol_list_handler import symbol_list
+from db.hist_signal_db import add_history_batch
+from exchange_listeners.base_listener import BaseExchangeListener
+from exchange_listeners.listener_manager import ListenerManager
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class StreamEvent(NamedTuple):
+    """
+    Event delivered to streaming subscribers, in this order within a poll cycle:
+    "coins" events while the series arrive, one "done" event per exchange, then the "snapshot" event.
+
+    Attributes:
+        kind (str): "coins", "done" or "snapshot".
+        exchange (str | None): Exchange name of "coins" and "done" events.
+        data: The arrived OI series (list[list[dict]]) of a "coins" event,
+            the snapshot {exchange_name: coins} of a "snapshot" event, None otherwise.
+        started (float | None): Start time (epoch seconds) of the poll cycle of "coins" and "done" events.
+    """
+    kind: str
+    exchange: str | None
+    data: object
+    started: float | None
+
+
+
+class MarketPoller:
+    """
+    Periodically fetches open interest data for all symbols of every exchange requested by
+    at least one subscriber and publishes the snapshot to each of them.
+
+    Attributes:
+        manager (ListenerManager): Provides listeners for all supported exchanges.
+        interval (str): Timeframe of the OI data in minutes (e.g., "5").
+        limit (int): Number of data points fetched per symbol, enough to cover MAX_PERIOD.
+        subscribers (dict): Maps subscriber IDs to their queue, the set of exchanges they follow
+            and whether they stream.
+        snapshots (dict[str, list[list[dict]]]): The latest OI snapshot per exchange.
+        wakeup (asyncio.Event): Set when a subscriber needs an exchange that has no snapshot yet.
+        scheduler (CandleScheduler): Aligns poll cycles to candle closes and enforces their deadline.
+        cycle_started (float | None): Start time (epoch seconds) of the current or last poll cycle.
+        saving (set[asyncio.Task]): History writes in progress, referenced until they finish.
+    """
+    def __init__(self):
+        self.manager = ListenerManager(enabled_exchanges=DEFAULT_EXCHANGES)
+        self.interval = MIN_INTERVAL
+        self.limit = int(MAX_PERIOD / int(MIN_INTERVAL)) + 1
+        self.subscribers: dict[int, dict] = {}
+        self.snapshots: dict[str, list[list[dict]]] = {}
+        self.wakeup = asyncio.Event()
+        self.scheduler = CandleScheduler(interval=self.interval)
+        self.cycle_started: float | None = None
+        self.saving: set[asyncio.Task] = set()
+
+
+    def subscribe(self, subscriber_id: int, exchanges: list[str], stream: bool = False) -> asyncio.Queue:
+        """
+        Registers a subscriber for snapshots of the given exchanges.
+
+        If the latest snapshot already covers all requested exchanges, it is delivered immediately.
+        Otherwise, the poller is woken up to fetch the missing exchanges without waiting for the next cycle.
+
+        Args:
+            subscriber_id (int): Unique subscriber ID (e.g., Telegram user ID).
+            exchanges (list[str]): Exchange names the subscriber is interested in.
+            stream (bool, optional): Also deliver the series of every symbol as soon as it arrives.
+
+        Returns:
+            asyncio.Queue: Queue that receives a dict {exchange_name: coins} once per candle,
+                or an unbounded queue of `StreamEvent` objects for a streaming subscriber.
+        """
+        queue = asyncio.Queue() if stream else asyncio.Queue(maxsize=1)
+        requested = {e.lower() for e in exchanges}
+        self.subscribers[subscriber_id] = sub = {
+            "queue": queue,
+            "exchanges": requested,
+            "stream": stream,
+        }
+
+        if requested.issubset(self.snapshots):
+            self.deliver(sub, self.snapshots)
+        else:
+            self.wakeup.set()
+
+        logger.debug(f"Subscriber {subscriber_id} added for {exchanges}")
+        return queue
+
+
+    def update_subscription(self, subscriber_id, exchanges: list[str]):
+        """
+        Changes the exchanges of an existing subscriber while keeping its queue.
+
+        The latest snapshot is delivered again if it covers all exchanges (replacing an unconsumed one),
+        otherwise the poller is woken up to fetch the missing exchanges.
+
+        Args:
+            subscriber_id: The subscriber ID passed to `subscribe`.
+            exchanges (list[str]): Exchange names the subscriber is interested in.
+        """
+        sub = self.subscribers[subscriber_id]
+        sub["exchanges"] = requested = {e.lower() for e in exchanges}
+
+        if requested.issubset(self.snapshots):
+            self.deliver(sub, self.snapshots)
+        else:
+            self.wakeup.set()
+
+
+    def unsubscribe(self, subscriber_id: int):
+        """
+        Removes a subscriber. Unknown IDs are ignored.
+
+        Args:
+            subscriber_id (int): The subscriber ID passed to `subscribe`.
+        """
+        self.subscribers.pop(subscriber_id, None)
+
+
+    def get_requested_exchanges(self) -> set[str]:
+        """Returns the union of exchanges requested by all current subscribers."""
+        requested = set()
+        for sub in self.subscribers.values():
+            requested |= sub["exchanges"]
+        return requested
+
+
+    def deliver(self, sub: dict, snapshot: dict[str, list[list[dict]]]) -> bool:
+        """
+        Puts the exchanges of a snapshot followed by a subscriber into its queue.
+
+        A subscriber that has not consumed the previous snapshot yet gets it replaced by the new one.
+        Streaming subscribers get every snapshot, after the stream events of its cycle.
+
+        Args:
+            sub (dict): The subscriber entry.
+            snapshot (dict[str, list[list[dict]]]): OI series per exchange.
+
+        Returns:
+            bool: True if an unconsumed snapshot was replaced.
+        """
+        data = {name: coins for name, coins in snapshot.items() if name in sub["exchanges"]}
+        queue: asyncio.Queue = sub["queue"]
+        if sub["stream"]:
+            queue.put_nowait(StreamEvent("snapshot", None, data, None))
+            return False
+
+        replaced = queue.full()
+        if replaced:
+            queue.get_nowait()
+        queue.put_nowait(data)
+        return replaced
+
+
+    def stream(self, event: StreamEvent):
+        """
+        Delivers a stream event to every streaming subscriber following its exchange.
+
+        Args:
+            event (StreamEvent): A "coins" or "done" event.
+        """
+        for sub in self.subscribers.values():
+            if sub["stream"] and event.exchange in sub["exchanges"]:
+                sub["queue"].put_nowait(event)
+
+
+    async def poll_exchange(self, name: str, listener: BaseExchangeListener, symbols: list[str]) -> list[list[dict]]:
+        """
+        Downloads OI data for all symbols of one exchange using the listener's bulk method.
+
+        Every series is streamed to the streaming subscribers as soon as it arrives and stored in the
+        market store. A "done" event is streamed when the exchange is finished (or cancelled).
+
+        Args:
+            name (str): Exchange name.
+            listener (BaseExchangeListener): Exchange listener used to fetch the data.
+            symbols (list[str]): Symbols to fetch.
+
+        Returns:
+            list[list[dict]]: Non-empty OI series per symbol. Failed requests are skipped.
+                The series are also stored in the market store, and their points new to it in the history
+                database (also those received before a cancellation).
+        """
+        coins = []
+        rows = []
+        try:
+            async for coin in listener.iter_oi_bulk(symbols, self.interval, self.limit, listener.session):
+                rows.extend((point['symbol'], point['exchange'], point['timestamp'], point['open_interest'])
+                            for point in market_store.put_series(coin))
+                coins.append(coin)
+                self.stream(StreamEvent("coins", name, [coin], self.cycle_started))
+        finally:
+            self.stream(StreamEvent("done", name, None, self.cycle_started))
+            # Runs as a task, so the rows of a cycle cancelled at its deadline are still saved
+            saving = asyncio.create_task(self.save_history(rows))
+            self.saving.add(saving)
+            saving.add_done_callback(self.saving.discard)
+
+        await saving
+        return coins
+
+
+    async def save_history(self, rows: list[tuple[str, str, int, float]]):
+        """
+        Saves the new OI points of the fetched symbols to the history database in one batch.
+        Errors are logged, not raised.
+
+        Args:
+            rows (list[tuple[str, str, int, float]]): (symbol, exchange, timestamp, open_interest) of each point.
+        """
+        try:
+            await add_history_batch(rows)
+        except Exception as e:
+            logger.error(f"Error saving history to database: {e}", exc_info=True)
+
+
+    def publish(self, snapshot: dict[str, list[list[dict]]]):
+        """
+        Delivers the snapshot to every subscriber, filtered by the exchanges it follows.
+
+        A subscriber that has not consumed the previous snapshot yet gets it replaced
+        by the new one, so slow consumers never block the poller.
+
+        Args:
+            snapshot (dict[str, list[list[dict]]]): OI series per exchange.
+        """
+        for subscriber_id, sub in list(self.subscribers.items()):
+            if self.deliver(sub, snapshot):
+                logger.warning(f"Subscriber {subscriber_id} skipped a snapshot")
+
+
+    async def poll_cycle(self, requested: set[str], snapshot: dict[str, list[list[dict]]]):
+        """
+        Fetches OI data for the requested exchanges concurrently, filling `snapshot` as each exchange completes.
+
+        The cycle therefore takes as long as the slowest exchange instead of the sum of all exchanges.
+
+        Args:
+            requested (set[str]): Exchange names to poll.
+            snapshot (dict[str, list[list[dict]]]): Receives the OI series per exchange.
+                Exchanges finished before a deadline cancellation are kept.
+        """
+        self.cycle_started = time.time()
+
+        async def poll(name: str, listener: BaseExchangeListener):
+            symbols = symbol_list.symbols_by_exchange.get(name, [])
+            try:
+                snapshot[name] = await self.poll_exchange(name, listener, symbols)
+                logger.debug(f"{name.upper()} OI snapshot: {len(snapshot[name])} symbols")
+            except Exception as e:
+                logger.error(f"Error polling exchange {name}: {e}", exc_info=True)
+
+        await asyncio.gather(*(poll(name, listener)
+                               for exchange in self.manager.get_all_active_listeners()
+                               for name, listener in exchange.items() if name in requested))
+
+
+    async def run_poller(self):
+        """
+        Main loop of the poller. At every candle close (plus a settle delay) fetches OI data for
+        every exchange that has at least one subscriber and publishes the snapshot.
+        Idle when nobody is subscribed.
+
+        Each cycle runs under the scheduler's deadline; exchanges that did not finish in time
+        are left out of the published snapshot.
+
+        This coroutine is intended to run as a background task.
+        """
+        while True:
+            scheduled = await self.scheduler.wait_next_cycle(self.wakeup)
+            self.wakeup.clear()
+
+            requested = self.get_requested_exchanges()
+            if not requested:
+                continue
+
+            snapshot = {}
+            await self.scheduler.run_cycle(self.poll_cycle(requested, snapshot), scheduled)
+
+            self.snapshots.update(snapshot)
+            self.publish(snapshot)
+
+
+
+market_poller = MarketPoller()
+"""
+Singleton instance of MarketPoller shared by all scanners.
+"""
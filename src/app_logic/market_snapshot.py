@@ -0,0 +1,107 @@
+"""
+market_snapshot.py
+
+Persists the in-memory market store across restarts.
+
+The OI, price and volume series of all symbols are periodically written to a compact binary
+`.npz` file (uncompressed numpy arrays, about 20 bytes per candle and symbol). On startup the
+store is restored from this file, so only the candles missing since the snapshot have to be
+fetched (see history_backfill.py) instead of the full 24 hours of every symbol.
+
+Files are written to a temporary path and renamed, so a crash during a write never leaves
+a truncated snapshot behind.
+
+Functions:
+    write_snapshot(arrays, path): Writes exported arrays to a snapshot file.
+    save_snapshot(store, path): Snapshots the market store without blocking the event loop.
+    load_snapshot(store, path): Restores the market store from a snapshot file.
+    run_snapshots(store, path, interval): Periodically snapshots the market store.
+"""
+
+import asyncio
+import os
+from pathlib import Path
+import numpy as np
+from config import config
+from app_logic.default_settings import SNAPSHOT_INTERVAL_SECOND
+from app_logic.market_store import MarketStore, market_store
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+def write_snapshot(arrays: dict[str, np.ndarray], path: Path):
+    """
+    Writes arrays exported by `MarketStore.export_arrays` to a snapshot file atomically.
+
+    Args:
+        arrays (dict[str, np.ndarray]): Exported market store.
+        path (Path): Snapshot file path.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as file:
+        np.savez(file, **arrays)
+    os.replace(tmp_path, path)
+
+
+async def save_snapshot(store: MarketStore = market_store, path: Path = None):
+    """
+    Snapshots the market store. The arrays are copied on the event loop and written in a thread.
+
+    Args:
+        store (MarketStore, optional): Store to snapshot. Defaults to the shared market store.
+        path (Path, optional): Snapshot file path. Defaults to `config.SNAPSHOT_PATH`.
+    """
+    path = path or config.SNAPSHOT_PATH
+    arrays = store.export_arrays()
+    await asyncio.to_thread(write_snapshot, arrays, path)
+    logger.debug(f"Market snapshot saved: {len(arrays['symbols'])} symbols")
+
+
+def load_snapshot(store: MarketStore = market_store, path: Path = None) -> int:
+    """
+    Restores the market store from a snapshot file.
+
+    A missing, unreadable or incompatible snapshot is ignored (logged), the store is then filled from scratch.
+
+    Args:
+        store (MarketStore, optional): Store to restore. Defaults to the shared market store.
+        path (Path, optional): Snapshot file path. Defaults to `config.SNAPSHOT_PATH`.
+
+    Returns:
+        int: Number of restored symbols.
+    """
+    path = path or config.SNAPSHOT_PATH
+    if not path.exists():
+        return 0
+
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            restored = store.import_arrays({name: data[name] for name in data.files})
+    except Exception as e:
+        logger.error(f"Error loading market snapshot {path}: {e}")
+        return 0
+
+    logger.info(f"Market snapshot restored: {restored} symbols")
+    return restored
+
+
+async def run_snapshots(store: MarketStore = market_store, path: Path = None,
+                        interval: float = SNAPSHOT_INTERVAL_SECOND):
+    """
+    Snapshots the market store every `interval` seconds.
+
+    This coroutine is intended to run as a background task.
+
+    Args:
+        store (MarketStore, optional): Store to snapshot. Defaults to the shared market store.
+        path (Path, optional): Snapshot file path. Defaults to `config.SNAPSHOT_PATH`.
+        interval (float, optional): Seconds between two snapshots.
+    """
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await save_snapshot(store, path)
+        except Exception as e:
+            logger.error(f"Error saving market snapshot: {e}", exc_info=True)
@@ -0,0 +1,369 @@
+"""
+market_store.py
+
+This module implements a compact in-memory time-series store for the last 24 hours of
+open interest (OI), price and volume data of every symbol.
+
+Each (exchange, symbol) pair owns a fixed-size ring buffer backed by typed arrays.
+The slot of a data point is derived from its candle number, so writing and reading a point
+by timestamp is O(1) and does not allocate. Missing candles are detected by comparing
+the candle number stored in the slot.
+
+Memory footprint: 20 bytes per slot, i.e. about 5.6 KB per symbol or ~6 MB for 1,100 symbols.
+The whole store can be exported to and restored from numpy arrays (see market_snapshot.py).
+
+Classes:
+    SeriesBuffer: Ring buffer with the 24h series of a single symbol.
+    MarketStore: Collection of ring buffers keyed by (exchange, symbol).
+
+Globals:
+    market_store (MarketStore): Singleton instance shared by the poller and condition handlers.
+"""
+
+import math
+from array import array
+import numpy as np
+from app_logic.default_settings import HISTORY_SLOTS, MIN_INTERVAL
+
+NO_DATA = -1
+"""
+int: Candle number marking an empty slot.
+"""
+
+
+class SeriesBuffer:
+    """
+    Fixed-size ring buffer holding OI, price and volume for one symbol.
+
+    Attributes:
+        slots (int): Number of candles kept in the buffer.
+        step_ms (int): Candle duration in milliseconds.
+        last_candle (int): Number of the most recent candle written, or NO_DATA.
+        rewritten (int): Lowest candle up to `last_candle` whose OI was written or changed after
+            a newer candle had been stored (late, backfilled or revised points), or NO_DATA.
+            Consumed by `SignalCounter` to re-evaluate the affected candles.
+        candles (array): Candle number (timestamp // step_ms) stored in each slot.
+        open_interest (array): OI value per slot (float64).
+        price (array): Close price of the kline opened at the slot's candle (float32, NaN if unknown).
+        volume (array): Volume of the kline opened at the slot's candle (float32, NaN if unknown).
+    """
+    __slots__ = ("slots", "step_ms", "last_candle", "rewritten", "candles", "open_interest", "price", "volume")
+
+    def __init__(self, slots: int = HISTORY_SLOTS, step_ms: int = int(MIN_INTERVAL) * 60 * 1000):
+        self.slots = slots
+        self.step_ms = step_ms
+        self.last_candle = NO_DATA
+        self.rewritten = NO_DATA
+        self.candles = array("i", [NO_DATA]) * slots
+        self.open_interest = array("d", [math.nan]) * slots
+        self.price = array("f", [math.nan]) * slots
+        self.volume = array("f", [math.nan]) * slots
+
+
+    def put(self, timestamp: int, open_interest: float, price: float = math.nan, volume: float = math.nan) -> bool:
+        """
+        Writes a data point into the slot of its candle.
+
+        Points older than the data already stored in the slot are ignored.
+        Rewriting the same candle keeps the known values that are not given (NaN),
+        so OI and kline data of a candle can be written independently.
+
+        Args:
+            timestamp (int): Candle timestamp in milliseconds.
+            open_interest (float): Open interest value (NaN if unknown).
+            price (float, optional): Close price of the candle.
+            volume (float, optional): Volume of the candle.
+
+        Returns:
+            bool: True if the point was written.
+        """
+        candle = int(timestamp) // self.step_ms
+        slot = candle % self.slots
+        if self.candles[slot] > candle:
+            return False
+
+        if candle <= self.last_candle and not math.isnan(open_interest) and (
+                self.candles[slot] != candle or open_interest != self.open_interest[slot]):
+            if self.rewritten == NO_DATA or candle < self.rewritten:
+                self.rewritten = candle
+
+        if self.candles[slot] == candle:
+            if math.isnan(open_interest):
+                open_interest = self.open_interest[slot]
+            if math.isnan(price):
+                price = self.price[slot]
+            if math.isnan(volume):
+                volume = self.volume[slot]
+
+        self.candles[slot] = candle
+        self.open_interest[slot] = open_interest
+        self.price[slot] = price
+        self.volume[slot] = volume
+        if candle > self.last_candle:
+            self.last_candle = candle
+        return True
+
+
+    def take_rewritten(self) -> int:
+        """
+        Returns the lowest rewritten candle (see `rewritten`) and clears the mark.
+
+        Returns:
+            int: Candle number, or NO_DATA if no older candle was written since the last call.
+        """
+        candle = self.rewritten
+        self.rewritten = NO_DATA
+        return candle
+
+
+    def slot_of(self, timestamp: int) -> int:
+        """
+        Returns the slot holding the candle of the given timestamp, or -1 if it is not stored.
+
+        Args:
+            timestamp (int): Candle timestamp in milliseconds.
+        """
+        candle = int(timestamp) // self.step_ms
+        slot = candle % self.slots
+        return slot if self.candles[slot] == candle else -1
+
+
+    def get_oi(self, timestamp: int) -> float | None:
+        """
+        Returns the OI value of the candle with the given timestamp.
+
+        Args:
+            timestamp (int): Candle timestamp in milliseconds.
+
+        Returns:
+            float | None: OI value, or None if the candle is not stored.
+        """
+        slot = self.slot_of(timestamp)
+        if slot < 0 or math.isnan(self.open_interest[slot]):
+            return None
+        return self.open_interest[slot]
+
+
+    def history(self, before_date: int, since_date: int) -> tuple[list[int], list[float]]:
+        """
+        Collects the stored OI points within [since_date, before_date], most recent first.
+
+        Args:
+            before_date (int): Upper bound timestamp in milliseconds.
+            since_date (int): Lower bound timestamp in milliseconds.
+
+        Returns:
+            tuple[list[int], list[float]]: Timestamps and OI values ordered by timestamp descending.
+        """
+        timestamps = []
+        open_interest = []
+        last = min(int(before_date) // self.step_ms, self.last_candle)
+        first = max(-(-int(since_date) // self.step_ms), last - self.slots + 1, 0)
+
+        for candle in range(last, first - 1, -1):
+            slot = candle % self.slots
+            if self.candles[slot] == candle and not math.isnan(self.open_interest[slot]):
+                timestamps.append(candle * self.step_ms)
+                open_interest.append(self.open_interest[slot])
+
+        return timestamps, open_interest
+
+
+
+class MarketStore:
+    """
+    In-memory store of 24h market series for all symbols of all exchanges.
+
+    Attributes:
+        slots (int): Number of candles kept per symbol.
+        step_ms (int): Candle duration in milliseconds.
+        buffers (dict[tuple[str, str], SeriesBuffer]): Ring buffers keyed by (exchange, symbol).
+    """
+    def __init__(self, slots: int = HISTORY_SLOTS, interval: str = MIN_INTERVAL):
+        self.slots = slots
+        self.step_ms = int(interval) * 60 * 1000
+        self.buffers: dict[tuple[str, str], SeriesBuffer] = {}
+
+
+    def get_buffer(self, exchange: str, symbol: str) -> SeriesBuffer | None:
+        """
+        Returns the ring buffer of a symbol, or None if nothing was stored for it yet.
+
+        Args:
+            exchange (str): Exchange name (case-insensitive).
+            symbol (str): Trading symbol (e.g., "BTCUSDT").
+        """
+        return self.buffers.get((exchange.lower(), symbol.upper()))
+
+
+    def put(self, exchange: str, symbol: str, timestamp: int, open_interest: float,
+            price: float = math.nan, volume: float = math.nan) -> bool:
+        """
+        Stores a single data point, creating the symbol's ring buffer on first use.
+
+        Args:
+            exchange (str): Exchange name (case-insensitive).
+            symbol (str): Trading symbol.
+            timestamp (int): Candle timestamp in milliseconds.
+            open_interest (float): Open interest value.
+            price (float, optional): Close price of the candle.
+            volume (float, optional): Volume of the candle.
+
+        Returns:
+            bool: True if the point was written.
+        """
+        key = (exchange.lower(), symbol.upper())
+        buffer = self.buffers.get(key)
+        if buffer is None:
+            buffer = self.buffers[key] = SeriesBuffer(self.slots, self.step_ms)
+        return buffer.put(timestamp, open_interest, price, volume)
+
+
+    def put_series(self, coin: list[dict]) -> list[dict]:
+        """
+        Stores an OI series as returned by `BaseExchangeListener.fetch_oi`.
+
+        Args:
+            coin (list[dict]): OI records with 'exchange', 'symbol', 'timestamp' and 'open_interest' keys.
+
+        Returns:
+            list[dict]: The records that were new to the store or changed a stored OI value.
+        """
+        changed = []
+        for point in coin:
+            buffer = self.get_buffer(point["exchange"], point["symbol"])
+            previous = None if buffer is None else buffer.get_oi(point["timestamp"])
+            if (self.put(point["exchange"], point["symbol"], point["timestamp"], point["open_interest"])
+                    and previous != point["open_interest"]):
+                changed.append(point)
+        return changed
+
+
+    def put_klines(self, exchange: str, symbol: str, ohlcv: list[dict]):
+        """
+        Stores klines as returned by `BaseExchangeListener.fetch_ohlcv` without touching OI values.
+
+        Args:
+            exchange (str): Exchange name (case-insensitive).
+            symbol (str): Trading symbol.
+            ohlcv (list[dict]): Candles with 'timestamp' (open time), 'close' and 'volume' keys.
+        """
+        for candle in ohlcv:
+            self.put(exchange, symbol, candle["timestamp"], math.nan, candle["close"], candle["volume"])
+
+
+    def get_klines(self, exchange: str, symbol: str, start_date: int, end_date: int) -> list[dict]:
+        """
+        Returns the stored klines opened within [start_date, end_date], most recent first.
+
+        Args:
+            exchange (str): Exchange name (case-insensitive).
+            symbol (str): Trading symbol.
+            start_date (int): Start of the range in milliseconds.
+            end_date (int): End of the range in milliseconds.
+
+        Returns:
+            list[dict]: Candles in the `fetch_ohlcv` format. Candles without kline data are skipped.
+        """
+        buffer = self.get_buffer(exchange, symbol)
+        if buffer is None:
+            return []
+
+        result = []
+        for candle in range(int(end_date) // self.step_ms, -(-int(start_date) // self.step_ms) - 1, -1):
+            slot = buffer.slot_of(candle * self.step_ms)
+            if slot >= 0 and not math.isnan(buffer.price[slot]):
+                result.append({
+                    "timestamp": candle * self.step_ms,
+                    "close": buffer.price[slot],
+                    "volume": buffer.volume[slot],
+                })
+        return result
+
+
+    def get_history(self, exchange: str, symbol: str, before_date: int,
+                    period_ms: int = 24 * 60 * 60 * 1000) -> tuple[list[int], list[float]]:
+        """
+        Returns the stored OI history of a symbol within `period_ms` before the given timestamp.
+
+        Args:
+            exchange (str): Exchange name (case-insensitive).
+            symbol (str): Trading symbol.
+            before_date (int): Upper bound timestamp in milliseconds.
+            period_ms (int, optional): Length of the window in milliseconds. Defaults to 24 hours.
+
+        Returns:
+            tuple[list[int], list[float]]: Timestamps and OI values ordered by timestamp descending.
+                Both lists are empty if the symbol is unknown.
+        """
+        buffer = self.get_buffer(exchange, symbol)
+        if buffer is None:
+            return [], []
+        return buffer.history(before_date, before_date - period_ms)
+
+
+
+    def export_arrays(self) -> dict[str, np.ndarray]:
+        """
+        Copies the content of all ring buffers into numpy arrays, one row per symbol.
+
+        Returns:
+            dict[str, np.ndarray]: 'slots' and 'step_ms' (scalars), 'exchanges' and 'symbols' (keys),
+                'last_candle' and the 2-D 'candles', 'open_interest', 'price' and 'volume' arrays.
+        """
+        keys = list(self.buffers)
+        buffers = [self.buffers[key] for key in keys]
+
+        def stack(column: str, dtype) -> np.ndarray:
+            rows = [np.frombuffer(getattr(buffer, column), dtype=dtype) for buffer in buffers]
+            return np.stack(rows) if rows else np.empty((0, self.slots), dtype=dtype)
+
+        return {
+            "slots": np.array(self.slots),
+            "step_ms": np.array(self.step_ms),
+            "exchanges": np.array([exchange for exchange, _ in keys], dtype=str),
+            "symbols": np.array([symbol for _, symbol in keys], dtype=str),
+            "last_candle": np.array([buffer.last_candle for buffer in buffers], dtype=np.int64),
+            "candles": stack("candles", np.int32),
+            "open_interest": stack("open_interest", np.float64),
+            "price": stack("price", np.float32),
+            "volume": stack("volume", np.float32),
+        }
+
+
+    def import_arrays(self, arrays: dict[str, np.ndarray]) -> int:
+        """
+        Restores ring buffers from arrays built by `export_arrays`.
+
+        Symbols that already have a buffer are left untouched. Nothing is restored if the arrays
+        were exported with a different number of slots or candle duration.
+
+        Args:
+            arrays (dict[str, np.ndarray]): Arrays as returned by `export_arrays`.
+
+        Returns:
+            int: Number of restored symbols.
+        """
+        if int(arrays["slots"]) != self.slots or int(arrays["step_ms"]) != self.step_ms:
+            return 0
+
+        restored = 0
+        for row, key in enumerate(zip(arrays["exchanges"].tolist(), arrays["symbols"].tolist())):
+            if key in self.buffers:
+                continue
+            buffer = SeriesBuffer(self.slots, self.step_ms)
+            buffer.last_candle = int(arrays["last_candle"][row])
+            buffer.candles = array("i", arrays["candles"][row].astype(np.int32).tobytes())
+            buffer.open_interest = array("d", arrays["open_interest"][row].astype(np.float64).tobytes())
+            buffer.price = array("f", arrays["price"][row].astype(np.float32).tobytes())
+            buffer.volume = array("f", arrays["volume"][row].astype(np.float32).tobytes())
+            self.buffers[key] = buffer
+            restored += 1
+        return restored
+
+
+
+market_store = MarketStore()
+"""
+Singleton instance of MarketStore holding the latest 24h of market data.
+"""
@@ -1,154 +1,598 @@
 """
 scanner.py
 
-Module that defines the Scanner class, which periodically fetches market data from different
-exchanges via listeners, checks for trading signals using given conditions, and triggers
-notifications when such signals occur.
+Module that defines the ScanCoordinator class, a single task that scans the market for the
+signals of all users.
 
-The scanner:
-- Initializes database and trims outdated data.
-- Fetches up-to-date USDT trading pairs for each exchange.
-- Periodically checks conditions using a condition handler.
-- Sends notifications through a callback when signals are found.
+Instead of one task (with its own listeners, condition handler and wake-ups) per user,
+the coordinator keeps a registry of user subscriptions and evaluates all of them in one pass
+per candle:
+- Receives the OI series from the shared market poller as they arrive and evaluates them in
+  batches right away, so one slow symbol does not delay the alerts of all others. The signals of
+  a cycle are collected per user for a short window after its first signal (or until every exchange
+  is finished) and then sent together; the time from the start of a poll cycle to its first alert
+  is logged. The complete snapshot that follows is only evaluated for users that were not part of
+  the stream (e.g., who subscribed meanwhile).
+- Trims outdated history once a day.
+- Gets the signals of every (period, threshold) configuration from the subscription index,
+  which evaluates each snapshot once per distinct configuration. The exchanges of a snapshot
+  are evaluated concurrently and their results are merged at the end of the cycle.
+- Collects the signals of all exchanges per user and sends them through the user's callback
+  as one message (split only when Telegram's message length limit is reached).
 
 Classes:
-    Scanner: Manages periodic market scanning and signal detection per user.
+    ScanCoordinator: Registry of user subscriptions and the scan loop serving all of them.
 
-Requires:
-    - Initialized `ListenerManager` and `ConditionHandler` instances.
-    - Asynchronous environment for continuous execution.
+Functions:
+    split_part: Splits an oversized message part on line boundaries.
+    chunk_messages: Joins message parts into messages within Telegram's length limit.
+
+Globals:
+    scan_coordinator (ScanCoordinator): Singleton instance started by the application entry point.
 """
 
 import asyncio
+import time
 from datetime import datetime
 from typing import Callable
 from zoneinfo import ZoneInfo
 
-from app_logic.condition_handler import ConditionHandler
-from exchange_listeners.listener_manager import ListenerManager
-from db.hist_signal_db import init_db, trim_old_records
-from app_logic.default_settings import DEFAULT_SETTINGS, MIN_INTERVAL, SLEEP_TIMER_SECOND
+from db.hist_signal_db import trim_old_records
+from app_logic.default_settings import TELEGRAM_MESSAGE_LIMIT, DEFAULT_TIME_ZONE, ALERT_COALESCE_SECOND
 from exchange_listeners.exchange_urls import create_link
-from app_logic.symbol_list_handler import symbol_list
+from exchange_listeners.listener_manager import LISTENERS
+from app_logic.market_poller import market_poller, StreamEvent
+from app_logic.subscription_index import subscription_index
 from logging_config import get_logger
 
 logger = get_logger(__name__)
 
+COORDINATOR_ID = "scan_coordinator"
+"""
+str: Subscriber ID of the coordinator in the market poller.
+"""
+
+
+def split_part(part: str, limit: int = TELEGRAM_MESSAGE_LIMIT) -> list[str]:
+    """
+    Splits a message part that is longer than the limit on line boundaries.
+
+    HTML tags never span lines in the rendered signals, so every piece stays valid HTML.
+    A line longer than the limit is cut at the limit only if it contains no markup;
+    a longer line with markup is kept whole, since cutting it could split a tag.
+
+    Args:
+        part (str): Message part (HTML).
+        limit (int, optional): Maximum message length. Defaults to Telegram's limit.
+
+    Returns:
+        list[str]: Pieces of the part in order.
+    """
+    pieces = []
+    current = None
+    for line in part.split("\n"):
+        if len(line) > limit and "<" not in line:
+            lines = [line[i:i + limit] for i in range(0, len(line), limit)]
+        else:
+            lines = [line]
+
+        for line in lines:
+            if current is None:
+                current = line
+            elif len(current) + 1 + len(line) <= limit:
+                current += "\n" + line
+            else:
+                pieces.append(current)
+                current = line
+
+    pieces.append(current)
+    return pieces
 
-class Scanner:
+
+def chunk_messages(parts: list[str], limit: int = TELEGRAM_MESSAGE_LIMIT, separator: str = "\n\n") -> list[str]:
     """
-    Class responsible for periodically scanning multiple exchanges for trading signals.
+    Joins message parts into as few messages as possible without exceeding the length limit.
+
+    Parts are never split unless a single part is longer than the limit (see `split_part`).
+
+    Args:
+        parts (list[str]): Message parts in sending order.
+        limit (int, optional): Maximum message length. Defaults to Telegram's limit.
+        separator (str, optional): Text inserted between parts of one message.
+
+    Returns:
+        list[str]: Messages to send.
+    """
+    messages = []
+    current = ""
+    for part in parts:
+        if len(part) > limit:
+            if current:
+                messages.append(current)
+                current = ""
+            *pieces, part = split_part(part, limit)
+            messages.extend(pieces)
+
+        if not current:
+            current = part
+        elif len(current) + len(separator) + len(part) <= limit:
+            current += separator + part
+        else:
+            messages.append(current)
+            current = part
+
+    if current:
+        messages.append(current)
+    return messages
+
+
+
+class ScanCoordinator:
+    """
+    Scans every exchange snapshot for the signals of all subscribed users.
 
     Attributes:
-        manager (ListenerManager): Manages access to exchange listeners.
-        handler (ConditionHandler): Applies signal-checking logic to exchange data.
+        subscriptions (dict): Maps user IDs to their subscription:
+            - "settings" (dict): The settings the scanner was started with.
+            - "exchanges" (set[str]): Exchanges the user follows.
+            - "notify" (Callable): Async function sending a message to the user.
+            - "seen" (dict[str, int]): Latest snapshot timestamp already evaluated per exchange.
         last_day (date): The last date the daily operations were performed.
-        symbols_by_exchange (dict[str, list[str]]): Maps exchange names to their trading symbols.
+        snapshots (asyncio.Queue | None): Streaming subscription queue of the market poller.
+        streams (dict[str, dict]): Stream in progress per exchange: "started" (start time of the poll cycle),
+            "time" (latest candle timestamp received) and "users" (users evaluated on the stream).
+        outbox (dict[int, list[str]]): Streamed message parts per user waiting to be sent.
+        outbox_started (float | None): Start time of the poll cycle of the oldest waiting parts.
+        finished (dict[str, float]): Start time of the last poll cycle finished per exchange.
+        flush_task (asyncio.Task | None): Timer sending the outbox at the end of the coalescing window.
+        coalesce_seconds (float): Length of the coalescing window.
+        alerted_cycle (float | None): Start time of the last poll cycle that produced an alert.
+        time_to_first_alert (float | None): Seconds from the start of that poll cycle to its first alert.
     """
-    def __init__(self, manager: ListenerManager, handler: ConditionHandler):
+    def __init__(self):
+        self.subscriptions: dict[int, dict] = {}
+        self.last_day = None
+        self.snapshots: asyncio.Queue | None = None
+        self.streams: dict[str, dict] = {}
+        self.outbox: dict[int, list[str]] = {}
+        self.outbox_started: float | None = None
+        self.finished: dict[str, float] = {}
+        self.flush_task: asyncio.Task | None = None
+        self.coalesce_seconds: float = ALERT_COALESCE_SECOND
+        self.alerted_cycle: float | None = None
+        self.time_to_first_alert: float | None = None
+
+
+    def register(self, user_id: int, settings: dict, exchanges: list[str], notify_callback: Callable):
         """
-        Initializes the Scanner with exchange manager and signal handler.
+        Adds the subscription of a user, or updates it in place if the user is already subscribed.
+
+        A new user is evaluated on the latest snapshot right away (if the poller has one)
+        and then once per candle together with all other users.
 
         Args:
-            manager (ListenerManager): Instance managing exchange listeners.
-            handler (ConditionHandler): Logic handler to check if signal conditions are met.
+            user_id (int): Telegram user ID.
+            settings (dict): User settings with at least "period" and "threshold".
+            exchanges (list[str]): Exchanges to scan for the user.
+            notify_callback (Callable): Async function used to send signal messages to the user.
         """
-        self.manager = manager
-        self.handler = handler
-        self.last_day = None
-        self.symbols_by_exchange: dict[str, list[str]] = {}
+        sub = self.subscriptions.get(user_id)
+        if sub is not None:
+            sub["notify"] = notify_callback
+            self.update_settings(user_id, settings, exchanges)
+            return
 
+        self.subscriptions[user_id] = {
+            "settings": settings,
+            "exchanges": {e.lower() for e in exchanges},
+            "notify": notify_callback,
+            "seen": {},
+        }
+        subscription_index.add(user_id, settings["period"], settings["threshold"])
+        self.update_poller_subscription()
 
-    async def run_scanner(self,
-                          user_id,
-                          notify_callback: Callable,
-                          threshold_period: int = DEFAULT_SETTINGS["period"],
-                          threshold: float = DEFAULT_SETTINGS["threshold"]):
+
+    def update_settings(self, user_id: int, settings: dict, exchanges: list[str]) -> bool:
         """
-        Runs the scanner loop to detect signals and notify the user if any are found.
+        Hot-swaps the settings of a running subscription.
 
-        This method:
-            - Initializes the database on the first run.
-            - Cleans up old signal data once per day.
-            - Refreshes the list of symbols for each active exchange daily.
-            - Every fixed interval (e.g., 5 minutes), checks for signals.
-            - If signals are found, sends them via the notify_callback function.
+        Nothing is torn down: the new period, threshold and exchanges take effect on the next evaluation.
+        Candles the user has already been evaluated on are not evaluated again.
 
         Args:
-            user_id (int): Telegram user ID to whom the alerts will be sent.
-            notify_callback (Callable): Async function used to send signal messages to the user.
-            threshold_period (int, optional): Time period to measure open interest change. Defaults to config value.
-            threshold (float, optional): Minimum open interest change (in percent) to trigger a signal. Defaults to config value.
+            user_id (int): Telegram user ID.
+            settings (dict): New user settings with at least "period" and "threshold".
+            exchanges (list[str]): Exchanges to scan for the user.
 
-        Raises:
-            Exception: Logs errors if fetching data, cleaning DB, or processing conditions fails.
+        Returns:
+            bool: True if the user was subscribed and the settings were applied.
         """
-        # to avoid circular import
-        from db.bot_users import get_user_settings
+        sub = self.subscriptions.get(user_id)
+        if sub is None:
+            return False
 
-        await init_db()
-        while True:
+        old_exchanges = sub["exchanges"]
+        sub["settings"] = settings
+        sub["exchanges"] = {e.lower() for e in exchanges}
+        if subscription_index.settings.get(user_id) != (settings["period"], settings["threshold"]):
+            subscription_index.add(user_id, settings["period"], settings["threshold"])
+        if sub["exchanges"] != old_exchanges:
+            self.update_poller_subscription()
+        return True
 
-            now = datetime.now().date()
 
-            # Executed once a day:
-            if now != self.last_day:
-                self.symbols_by_exchange.clear()
+    def unregister(self, user_id: int) -> bool:
+        """
+        Removes the subscription of a user.
 
-                # Removing history older than a day
-                now_timestamp = int(datetime.now().timestamp())
+        Args:
+            user_id (int): Telegram user ID.
+
+        Returns:
+            bool: True if the user was subscribed.
+        """
+        if self.subscriptions.pop(user_id, None) is None:
+            return False
+        subscription_index.remove(user_id)
+        self.update_poller_subscription()
+        return True
+
+
+    def update_poller_subscription(self):
+        """
+        Requests snapshots of the union of all users' exchanges from the market poller.
+        """
+        if self.snapshots is None:
+            return
+        exchanges = set()
+        for sub in self.subscriptions.values():
+            exchanges |= sub["exchanges"]
+        market_poller.update_subscription(COORDINATOR_ID, list(exchanges))
+
+
+    async def run_coordinator(self):
+        """
+        Main loop: subscribes to the market poller as a streaming subscriber and scans the OI series
+        for all users as they arrive.
+
+        Events that arrived while the previous ones were being scanned are handled together,
+        so a slow scan evaluates larger batches instead of falling behind.
+
+        This coroutine is intended to run as a single background task, started after
+        the history database has been initialized.
+        """
+        self.snapshots = market_poller.subscribe(COORDINATOR_ID, [], stream=True)
+        self.update_poller_subscription()
+        try:
+            while True:
+                events = [await self.snapshots.get()]
+                while not self.snapshots.empty():
+                    events.append(self.snapshots.get_nowait())
+                await self.daily_maintenance()
                 try:
-                    await trim_old_records("history_temp", now_timestamp)
+                    await self.handle_events(events)
                 except Exception as e:
-                    logger.error(f"Database cleanup error: {e}", exc_info=True)
+                    logger.error(f"Error while scanning snapshot: {e}", exc_info=True)
+                finally:
+                    for _ in events:
+                        self.snapshots.task_done()
+        finally:
+            if self.flush_task is not None:
+                self.flush_task.cancel()
+                self.flush_task = None
+            market_poller.unsubscribe(COORDINATOR_ID)
+            self.snapshots = None
 
-                self.last_day = now
 
+    async def daily_maintenance(self):
+        """
+        Drops the history partitions older than a day, once per day.
+        """
+        now = datetime.now().date()
+        if now == self.last_day:
+            return
 
-            # Retrieve the list of symbols from the user's active exchanges
-            for exchange in self.manager.get_all_active_listeners():
-                for exchange_name in exchange.keys():
-                    self.symbols_by_exchange[exchange_name] = symbol_list.symbols_by_exchange[exchange_name]
-                    logger.debug(f'symbol_list in scanner = {self.symbols_by_exchange}')
+        now_timestamp = int(datetime.now().timestamp())
+        try:
+            await trim_old_records(now_timestamp)
+        except Exception as e:
+            logger.error(f"Database cleanup error: {e}", exc_info=True)
+        self.last_day = now
 
-            # Executed every 5 minutes. Can be changed in SLEEP_TIMER_SECOND
-            for exchange_name, symbols in self.symbols_by_exchange.items():
-                listener = self.manager.get_listener(exchange_name)
-                self.handler.set_client(listener)
 
-                signal_coins = []
-                time_zone: str = "UTC"
+    async def handle_events(self, events: list[StreamEvent]):
+        """
+        Scans a batch of market poller events in their order.
 
-                # Getting a list of cryptocurrencies for which a condition is met on a specific exchange
-                try:
-                    signal_coins = await self.handler.is_signal(symbols, threshold_period, MIN_INTERVAL, threshold)
+        The series of consecutive "coins" events are evaluated together, all exchanges concurrently.
 
-                    user_settings = await get_user_settings(user_id)
-                    time_zone = user_settings.get("time_zone", "UTC")
-                except AttributeError as e:
-                    logger.error(f"Error AttributeError: {e}", exc_info=True)
-                except Exception as e:
-                    logger.error(f"Error: {e}", exc_info=True)
+        Args:
+            events (list[StreamEvent]): Events taken from the subscription queue.
+        """
+        pending: dict[str, list[list[dict]]] = {}
+        started: dict[str, float] = {}
+        for event in events:
+            if event.kind == "coins":
+                pending.setdefault(event.exchange, []).extend(event.data)
+                started[event.exchange] = event.started
+                continue
+
+            if pending:
+                await self.scan_stream(pending, started)
+                pending, started = {}, {}
+            if event.kind == "done":
+                await self.finish_stream(event.exchange, event.started)
+            else:
+                await self.scan_snapshot(event.data)
+
+        if pending:
+            await self.scan_stream(pending, started)
+
+
+    def pending_users(self, exchange_name: str, snapshot_time: int) -> list[int]:
+        """
+        Returns the users following an exchange that have not been evaluated on a candle yet.
+
+        Args:
+            exchange_name (str): Exchange name.
+            snapshot_time (int): Timestamp of the candle.
+        """
+        return [user_id for user_id, sub in self.subscriptions.items()
+                if exchange_name in sub["exchanges"] and sub["seen"].get(exchange_name, -1) < snapshot_time]
+
+
+    async def scan_stream(self, pending: dict[str, list[list[dict]]], started: dict[str, float]):
+        """
+        Evaluates the series that arrived since the last batch and queues the signals in the outbox.
+
+        The first signals start the coalescing window (see `flush_outbox`). The users of a stream are fixed
+        by its first batch; they are marked as evaluated on the candle when the stream ends (see `finish_stream`),
+        so the snapshot that follows is not evaluated for them again.
+
+        Args:
+            pending (dict[str, list[list[dict]]]): Arrived OI series per exchange.
+            started (dict[str, float]): Start time of the poll cycle per exchange.
+        """
+        jobs = {}
+        for exchange_name, coins in pending.items():
+            snapshot_time = max(point['timestamp'] for coin in coins for point in coin)
+            stream = self.streams.get(exchange_name)
+            if stream is None or stream["started"] != started[exchange_name]:
+                # The end of a cancelled cycle may never have been delivered
+                await self.finish_stream(exchange_name)
+                stream = self.streams[exchange_name] = {
+                    "started": started[exchange_name],
+                    "time": snapshot_time,
+                    "users": self.pending_users(exchange_name, snapshot_time),
+                }
+            stream["time"] = max(stream["time"], snapshot_time)
+            if stream["users"]:
+                jobs[exchange_name] = (coins, stream["users"])
 
+        evaluated = await self.evaluate(jobs)
+        for parts_by_user in evaluated.values():
+            for user_id, parts in parts_by_user.items():
+                self.outbox.setdefault(user_id, []).extend(parts)
+
+        if self.outbox:
+            if self.outbox_started is None:
+                self.outbox_started = min(started.values())
+            if self.flush_task is None:
+                self.flush_task = asyncio.create_task(self.flush_outbox(self.coalesce_seconds))
+
+
+    async def flush_outbox(self, delay: float = 0):
+        """
+        Sends the streamed signals waiting in the outbox, one message per user.
+
+        Args:
+            delay (float, optional): Seconds to wait first; the parts queued meanwhile are sent too.
+        """
+        if delay:
+            await asyncio.sleep(delay)
+        if self.flush_task is not None and self.flush_task is not asyncio.current_task():
+            self.flush_task.cancel()
+        self.flush_task = None
+
+        messages, started = self.outbox, self.outbox_started
+        self.outbox, self.outbox_started = {}, None
+        await self.send(messages, started)
+
+
+    async def finish_stream(self, exchange_name: str, started: float = None):
+        """
+        Ends the stream of an exchange and marks its users as evaluated on the streamed candle.
+
+        When every exchange followed by the users with waiting signals has finished the cycle,
+        the outbox is sent without waiting for the end of the coalescing window.
+
+        Args:
+            exchange_name (str): Exchange name.
+            started (float, optional): Start time of the finished poll cycle; None if the end was not delivered.
+        """
+        if started is not None:
+            self.finished[exchange_name] = started
+        stream = self.streams.pop(exchange_name, None)
+        if stream is not None:
+            for user_id in stream["users"]:
+                sub = self.subscriptions.get(user_id)
+                if sub is not None:
+                    sub["seen"][exchange_name] = max(sub["seen"].get(exchange_name, -1), stream["time"])
+        if self.outbox and self.outbox_complete():
+            await self.flush_outbox()
+
+
+    def outbox_complete(self) -> bool:
+        """
+        Checks whether no more signals of the outbox's cycle can arrive for the users waiting in it.
+        """
+        if self.streams:
+            return False
+        exchanges = set()
+        for user_id in self.outbox:
+            sub = self.subscriptions.get(user_id)
+            if sub is not None:
+                exchanges |= sub["exchanges"]
+        return all(self.finished.get(name, -1) >= self.outbox_started for name in exchanges)
+
+
+    async def evaluate_exchange(self, exchange_name: str, coins: list[list[dict]], users: list[int]) -> dict:
+        """
+        Evaluates OI series of one exchange for the configurations of the given users.
+
+        The evaluation keeps no state between exchanges, so several exchanges can be evaluated concurrently.
+
+        Args:
+            exchange_name (str): Exchange name.
+            coins (list[list[dict]]): OI series per symbol of the exchange.
+            users (list[int]): Users to evaluate the series for.
+
+        Returns:
+            dict[tuple[int, float], list[dict]]: Signals per (period, threshold).
+        """
+        configs = {subscription_index.settings[user_id] for user_id in users if user_id in subscription_index.settings}
+        if not configs:
+            return {}
+        return await subscription_index.evaluate(exchange_name, coins, LISTENERS[exchange_name], configs)
+
+
+    async def evaluate(self, jobs: dict[str, tuple[list[list[dict]], list[int]]]) -> dict[str, dict[int, list[str]]]:
+        """
+        Evaluates the series of several exchanges concurrently and renders the signals per user.
+
+        Args:
+            jobs (dict[str, tuple[list[list[dict]], list[int]]]): OI series and users per exchange.
+
+        Returns:
+            dict[str, dict[int, list[str]]]: Message parts per user of each exchange that was evaluated
+                without errors, in the order of `jobs`.
+        """
+        names = list(jobs)
+        results = await asyncio.gather(*(self.evaluate_exchange(name, *jobs[name]) for name in names),
+                                       return_exceptions=True)
+
+        evaluated: dict[str, dict[int, list[str]]] = {}
+        for exchange_name, signals in zip(names, results):
+            if isinstance(signals, Exception):
+                logger.error(f"[{exchange_name.upper()}] Error while evaluating snapshot: {signals}", exc_info=signals)
+                continue
+            messages = evaluated[exchange_name] = {}
+
+            for user_id in jobs[exchange_name][1]:
+                sub = self.subscriptions.get(user_id)
+                if sub is None:
+                    # Unsubscribed while the series were being evaluated
+                    continue
+                signal_coins = signals.get((sub["settings"]["period"], sub["settings"]["threshold"]))
                 if signal_coins:
-                    for coin in signal_coins:
-                        # Set local time
-                        dt = coin['datetime']
-                        user_local_time = dt.astimezone(ZoneInfo(time_zone)).strftime('%H:%M:%S')
-
-                        # Collecting a link to 'symbol'
-                        exchange_url = create_link(coin['exchange'], coin['symbol'])
-
-                        # Sending a signal message
-                        msg = (
-                            f"🚨 <code>{coin['symbol']}</code>" 
-                            f"\n<a href=\"{exchange_url}\">[{coin['exchange']}]</a>  {user_local_time} in {coin['delta_time_minutes']} min:"
-                            f"\nOI {coin['delta_oi_%']},  price {coin['delta_price_%']},  volume {coin['delta_volume_%']}"
-                            f"\nNumber of signals per day: {coin['count_signal_24h']}"
-                        )
-                        logger.debug(f"{msg}")
-                        await notify_callback(user_id, msg)
+                    messages.setdefault(user_id, []).extend(await self.render_signals(user_id, signal_coins))
                 else:
-                    logger.debug(f"[{exchange_name.upper()}] No signal.")
+                    logger.debug(f"[{exchange_name.upper()}] No signal for user {user_id}.")
+        return evaluated
+
+
+    async def send(self, messages: dict[int, list[str]], cycle_started: float = None):
+        """
+        Sends the message parts of each user, combined into as few messages as possible.
+
+        The first message of a poll cycle that is handed to a user's callback records the time to first alert.
+
+        Args:
+            messages (dict[int, list[str]]): Message parts per user.
+            cycle_started (float, optional): Start time of the poll cycle the signals come from.
+        """
+        for user_id, parts in messages.items():
+            sub = self.subscriptions.get(user_id)
+            if sub is None:
+                continue
+            for msg in chunk_messages(parts):
+                await sub["notify"](user_id, msg)
+                if cycle_started is not None and cycle_started != self.alerted_cycle:
+                    self.alerted_cycle = cycle_started
+                    self.time_to_first_alert = time.time() - cycle_started
+                    logger.info(f"Time to first alert: {self.time_to_first_alert:.2f}s")
+
+
+    async def scan_snapshot(self, snapshot: dict[str, list[list[dict]]]):
+        """
+        Evaluates one snapshot for every user that has not seen it yet and notifies them.
+
+        The exchanges are evaluated concurrently, so the scan takes as long as the slowest exchange.
+        Each user gets one message with the signals of all exchanges.
+
+        Args:
+            snapshot (dict[str, list[list[dict]]]): OI series per exchange from the market poller.
+        """
+        jobs = {}
+        times = {}
+        for exchange_name, coins in snapshot.items():
+            if not coins:
+                continue
+            times[exchange_name] = max(point['timestamp'] for coin in coins for point in coin)
+            users = self.pending_users(exchange_name, times[exchange_name])
+            if users:
+                jobs[exchange_name] = (coins, users)
+
+        evaluated = await self.evaluate(jobs)
+        messages: dict[int, list[str]] = {}
+        for exchange_name, parts_by_user in evaluated.items():
+            for user_id in jobs[exchange_name][1]:
+                sub = self.subscriptions.get(user_id)
+                if sub is not None:
+                    sub["seen"][exchange_name] = times[exchange_name]
+            for user_id, parts in parts_by_user.items():
+                messages.setdefault(user_id, []).extend(parts)
+
+        await self.send(messages)
 
-            await asyncio.sleep(SLEEP_TIMER_SECOND)
+
+    async def render_signals(self, user_id: int, signal_coins: list[dict]) -> list[str]:
+        """
+        Formats signals as message parts in the user's time zone.
+
+        Args:
+            user_id (int): Telegram user ID.
+            signal_coins (list[dict]): Signals found by the condition handler.
+
+        Returns:
+            list[str]: One message part per signal.
+        """
+        # to avoid circular import
+        from db.bot_users import get_user_settings
+
+        time_zone = DEFAULT_TIME_ZONE
+        try:
+            user_settings = await get_user_settings(user_id)
+            if user_settings is not None:
+                time_zone = user_settings.get("time_zone", DEFAULT_TIME_ZONE)
+        except Exception as e:
+            logger.error(f"Error: {e}", exc_info=True)
+
+        parts = []
+        for coin in signal_coins:
+            # Set local time
+            dt = coin['datetime']
+            user_local_time = dt.astimezone(ZoneInfo(time_zone)).strftime('%H:%M:%S')
+
+            # Collecting a link to 'symbol'
+            exchange_url = create_link(coin['exchange'], coin['symbol'])
+            count = coin['count_signal_24h']
+            if count is None:
+                count = "pending (loading the 24h history)"
+
+            msg = (
+                f"🚨 <code>{coin['symbol']}</code>" 
+                f"\n<a href=\"{exchange_url}\">[{coin['exchange']}]</a>  {user_local_time} in {coin['delta_time_minutes']} min:"
+                f"\nOI {coin['delta_oi_%']},  price {coin['delta_price_%']},  volume {coin['delta_volume_%']}"
+                f"\nNumber of signals per day: {count}"
+            )
+            logger.debug(f"{msg}")
+            parts.append(msg)
+        return parts
+
+
+
+scan_coordinator = ScanCoordinator()
+"""
+Singleton instance of ScanCoordinator serving all users.
+"""
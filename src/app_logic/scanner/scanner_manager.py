@@ -4,35 +4,33 @@ scanner_manager.py
 Manages the lifecycle of signal scanners per Telegram user.
 
 This module:
-- Stores currently running scanner tasks per user.
-- Starts a new scanner or restarts it with updated settings.
+- Registers users in the single scan coordinator that serves all of them.
+- Starts a new scanner or applies updated settings to a running one in place.
 - Ensures that only one scanner per user is active at any time.
 
 Functions:
     start_or_restart_scanner: Starts or restarts a scanner for a specific user.
+    update_scanner_settings: Hot-swaps the stored settings into a user's running scanner.
     stop_scanner: Stops a scanner for a specific user.
 
 Globals:
-    running_scanners (dict): Tracks active scanners per user.
-        - "task" (asyncio.Task): The currently running scanning coroutine.
+    running_scanners (dict): Tracks active scanners per user (the coordinator's subscription registry).
         - "settings" (dict): The settings used for this scanner instance.
+        - "exchanges" (set[str]): The exchanges scanned for the user.
+        - "notify" (Callable): The function sending the user's signal messages.
 
 Requires:
-    - ListenerManager: to create exchange listeners per run.
-    - ConditionHandler: to evaluate open interest and volume change logic.
-    - Scanner: the scanning engine which detects signals and sends notifications.
+    - ScanCoordinator: the scanning engine which detects signals and sends notifications for all users.
 """
 
-import asyncio
 from typing import Callable
-from exchange_listeners.listener_manager import ListenerManager
-from app_logic.condition_handler import ConditionHandler
-from .scanner import Scanner
+from db.bot_users import get_user_settings
+from .scanner import scan_coordinator
 from logging_config import get_logger
 
 logger = get_logger(__name__)
 
-running_scanners = {}  # user_id: {"task": task, "settings": {...}}
+running_scanners = scan_coordinator.subscriptions  # user_id: {"settings": {...}, "exchanges": {...}, ...}
 
 
 async def start_or_restart_scanner(user_id: int, settings: dict, exchanges: list, notify_func: Callable):
@@ -40,7 +38,7 @@ async def start_or_restart_scanner(user_id: int, settings: dict, exchanges: list
     Starts a new scanner or restarts it with updated settings for the given user.
 
     If a scanner with the same settings is already running, no action is taken.
-    If settings differ, the previous scanner is gracefully cancelled and a new one is started.
+    If settings differ, they are applied to the running subscription in place.
 
     Args:
         user_id (int): The Telegram user ID requesting the scan.
@@ -56,38 +54,44 @@ async def start_or_restart_scanner(user_id: int, settings: dict, exchanges: list
 
     current = running_scanners.get(user_id)
 
-    if current:
-        if current["settings"] == settings:
-            # The scanner is already running with the same settings.
-            return "already_running"
-        else:
-            # Stop the previous one
-            current["task"].cancel()
-            try:
-                await current["task"]
-            except asyncio.CancelledError:
-                pass
-
-    try:
-        manager = ListenerManager(enabled_exchanges=exchanges)
-        cond = ConditionHandler()
-        scanner_ = Scanner(manager=manager, handler=cond)
-    except Exception as e:
-        logger.critical(f"Error initializing fundamental clients: {e}", exc_info=True)
-
-    # Launching a new
-    task = asyncio.create_task(scanner_.run_scanner(user_id, notify_func, settings["period"], settings["threshold"]))
+    if current and current["settings"] == settings:
+        # The scanner is already running with the same settings.
+        return "already_running"
+
+    scan_coordinator.register(user_id, settings, exchanges, notify_func)
     logger.info(f"User {user_id} started screener successfully. Settings: {settings}")
-    running_scanners[user_id] = {"task": task, "settings": settings}
     return "started"
 
 
+async def update_scanner_settings(user_id: int) -> bool:
+    """
+    Applies the user's stored settings to the running scanner without restarting it.
+
+    Called after the user changes a setting; the change takes effect on the next evaluation.
+
+    Args:
+        user_id (int): The Telegram user ID whose settings changed.
+
+    Returns:
+        bool: True if a scanner was running and got the new settings, False otherwise.
+    """
+    if user_id not in running_scanners:
+        return False
+
+    settings = await get_user_settings(user_id)
+    if settings is None:
+        return False
+
+    scan_coordinator.update_settings(user_id, settings, settings["active_exchanges"])
+    logger.info(f"User {user_id} updated running screener settings: {settings}")
+    return True
+
+
 async def stop_scanner(user_id: int):
     """
-    Gracefully stops the running scanner for the given user, if it exists.
+    Stops the running scanner for the given user, if it exists.
 
-    Cancels the asyncio task associated with the user and removes the scanner
-    from the active registry. Logs the action.
+    Removes the user from the scan coordinator. Logs the action.
 
     Args:
         user_id (int): The Telegram user ID whose scanner should be stopped.
@@ -97,15 +101,7 @@ async def stop_scanner(user_id: int):
             - "stopped": Scanner was found and successfully stopped.
             - "not_running": No active scanner was found for the user.
     """
-    current = running_scanners.get(user_id)
-
-    if current:
-        current["task"].cancel()
-        try:
-            await current["task"]
-        except asyncio.CancelledError:
-            pass
-        del running_scanners[user_id]
+    if scan_coordinator.unregister(user_id):
         logger.info(f"User {user_id} stopped screener successfully.")
         return "stopped"
 
@@ -0,0 +1,195 @@
+"""
+signal_counter.py
+
+This module defines the SignalCounter class, which keeps the number of signals of the last 24 hours
+per (exchange, symbol, period, threshold) up to date incrementally.
+
+Instead of rescanning a day of OI history on every signal, each configuration remembers the
+timestamps of its triggering points and the last candle it has evaluated. When a count is read,
+only the candles written to the market store since then are evaluated (every point once per
+configuration), and triggers that left the 24h window are dropped. Points written later below
+that mark (gap backfill, warm-start backfill, revised values) rewind all configurations of the
+symbol to the rewritten candle, so the candles whose lookback changed are evaluated again. Reading a count costs a binary
+search over at most one day of triggers and needs no database round-trip.
+
+The state of a configuration is evicted when its last user goes away (see `SubscriptionIndex`),
+and the state of a symbol when it leaves the symbol list of its exchange (see `SymbolListHandler`).
+
+Classes:
+    SignalCounter: Incremental 24h signal counter backed by the market store.
+
+Globals:
+    signal_counter (SignalCounter): Singleton instance shared by all condition handlers.
+"""
+
+from bisect import bisect_left, bisect_right
+from app_logic.market_store import MarketStore, SeriesBuffer, market_store, NO_DATA
+
+DAY_MS = 24 * 60 * 60 * 1000
+
+
+class SignalCounter:
+    """
+    Counts the OI signals of the last 24 hours per configuration.
+
+    A point triggers if, for some lookback j in [1, limit - 1], the point j candles earlier is stored
+    and (oi_point - oi_earlier) / oi_point > threshold, the same rule as in `ConditionHandler`.
+
+    Attributes:
+        store (MarketStore): Store with the OI series.
+        window_ms (int): Length of the counting window in milliseconds.
+        triggers (dict[tuple[str, str, int, float], list[int]]): Ascending timestamps of the triggering
+            points per (exchange, symbol, limit, threshold).
+        evaluated (dict[tuple[str, str, int, float], int]): Last candle number evaluated per configuration.
+        configs (dict[tuple[str, str], set[tuple[int, float]]]): Configurations with state per (exchange, symbol).
+    """
+    def __init__(self, store: MarketStore = market_store, window_ms: int = DAY_MS):
+        self.store = store
+        self.window_ms = window_ms
+        self.triggers: dict[tuple[str, str, int, float], list[int]] = {}
+        self.evaluated: dict[tuple[str, str, int, float], int] = {}
+        self.configs: dict[tuple[str, str], set[tuple[int, float]]] = {}
+
+
+    @staticmethod
+    def is_trigger(buffer: SeriesBuffer, candle: int, limit: int, threshold: float) -> bool:
+        """
+        Checks whether the point of a candle triggers a signal.
+
+        Args:
+            buffer (SeriesBuffer): Ring buffer of the symbol.
+            candle (int): Candle number of the point.
+            limit (int): Number of points of the signal window.
+            threshold (float): Required OI delta.
+        """
+        latest = buffer.get_oi(candle * buffer.step_ms)
+        if not latest:
+            return False
+
+        for j in range(1, limit):
+            earlier = buffer.get_oi((candle - j) * buffer.step_ms)
+            if earlier is not None and (latest - earlier) / latest > threshold:
+                return True
+        return False
+
+
+    def update(self, exchange: str, symbol: str, limit: int, threshold: float) -> list[int] | None:
+        """
+        Evaluates the candles stored since the last update of a configuration and expires old triggers.
+
+        Args:
+            exchange (str): Exchange name.
+            symbol (str): Trading symbol.
+            limit (int): Number of points of the signal window.
+            threshold (float): Required OI delta.
+
+        Returns:
+            list[int] | None: Ascending trigger timestamps, or None if the store has no data for the symbol.
+        """
+        buffer = self.store.get_buffer(exchange, symbol)
+        if buffer is None or buffer.last_candle == NO_DATA:
+            return None
+
+        key = (exchange.lower(), symbol.upper(), limit, threshold)
+        self.configs.setdefault(key[:2], set()).add((limit, threshold))
+        rewritten = buffer.take_rewritten()
+        if rewritten != NO_DATA:
+            self.rewind(key[:2], rewritten * buffer.step_ms, buffer.step_ms)
+
+        triggers = self.triggers.setdefault(key, [])
+        first = max(self.evaluated.get(key, NO_DATA) + 1, buffer.last_candle - buffer.slots + 1, 0)
+
+        for candle in range(first, buffer.last_candle + 1):
+            if self.is_trigger(buffer, candle, limit, threshold):
+                triggers.append(candle * buffer.step_ms)
+        self.evaluated[key] = max(self.evaluated.get(key, NO_DATA), buffer.last_candle)
+
+        # Keep a margin of one signal window for reads with a slightly older upper bound
+        cutoff = buffer.last_candle * buffer.step_ms - self.window_ms - limit * buffer.step_ms
+        expired = bisect_left(triggers, cutoff)
+        if expired:
+            del triggers[:expired]
+        return triggers
+
+
+    def rewind(self, symbol_key: tuple[str, str], timestamp: int, step_ms: int):
+        """
+        Makes all configurations of a symbol evaluate again from a rewritten candle.
+
+        A point affects the triggers of its own candle and of the `limit - 1` candles after it,
+        so the triggers from the rewritten candle on are dropped and those candles are evaluated again.
+
+        Args:
+            symbol_key (tuple[str, str]): (exchange, symbol) in normalized case.
+            timestamp (int): Timestamp of the rewritten candle in milliseconds.
+            step_ms (int): Candle duration in milliseconds.
+        """
+        candle = timestamp // step_ms
+        for limit, threshold in self.configs.get(symbol_key, ()):
+            key = (*symbol_key, limit, threshold)
+            if self.evaluated.get(key, NO_DATA) < candle:
+                continue
+            self.evaluated[key] = candle - 1
+            triggers = self.triggers.get(key)
+            if triggers:
+                del triggers[bisect_left(triggers, timestamp):]
+
+
+    def evict_config(self, limit: int, threshold: float):
+        """
+        Forgets the triggers of a configuration on all symbols.
+
+        Args:
+            limit (int): Number of points of the signal window.
+            threshold (float): Required OI delta.
+        """
+        for key in [key for key in self.triggers if key[2:] == (limit, threshold)]:
+            del self.triggers[key]
+        for key in [key for key in self.evaluated if key[2:] == (limit, threshold)]:
+            del self.evaluated[key]
+        for configs in self.configs.values():
+            configs.discard((limit, threshold))
+
+
+    def retain_symbols(self, exchange: str, symbols: list[str]):
+        """
+        Forgets the triggers of the symbols of an exchange that are no longer listed.
+
+        Args:
+            exchange (str): Exchange name.
+            symbols (list[str]): Currently listed symbols of the exchange.
+        """
+        exchange = exchange.lower()
+        listed = {symbol.upper() for symbol in symbols}
+        for state in (self.triggers, self.evaluated):
+            for key in [key for key in state if key[0] == exchange and key[1] not in listed]:
+                del state[key]
+        for key in [key for key in self.configs if key[0] == exchange and key[1] not in listed]:
+            del self.configs[key]
+
+
+    def count(self, exchange: str, symbol: str, limit: int, threshold: float, before_date: int) -> int | None:
+        """
+        Returns the number of triggering points within [before_date - 24h, before_date].
+
+        Args:
+            exchange (str): Exchange name.
+            symbol (str): Trading symbol.
+            limit (int): Number of points of the signal window.
+            threshold (float): Required OI delta.
+            before_date (int): Upper bound timestamp in milliseconds.
+
+        Returns:
+            int | None: Signal count, or None if the store has no data for the symbol.
+        """
+        triggers = self.update(exchange, symbol, limit, threshold)
+        if triggers is None:
+            return None
+        return bisect_right(triggers, before_date) - bisect_left(triggers, before_date - self.window_ms)
+
+
+
+signal_counter = SignalCounter()
+"""
+Singleton instance of SignalCounter shared by all scanners.
+"""
@@ -0,0 +1,167 @@
+"""
+signal_engine.py
+
+Vectorized open interest (OI) signal detection with NumPy.
+
+Instead of walking the OI series of every symbol in Python, the latest N points of all symbols
+of an exchange are put into one 2-D matrix (one row per symbol, column 0 = latest point,
+column k = k points back). All lookback deltas are then compared with the threshold in a single pass.
+
+The delta definition is the same as in `ConditionHandler.delta_calculate`:
+    delta = (oi_latest - oi_k) / oi_latest
+
+The 24h signal count of a symbol is computed in linear time by `count_history_signals`.
+
+Functions:
+    build_oi_matrix: Converts OI series (most recent first) into a NaN-padded matrix.
+    find_triggers: Returns the triggering rows and their first trigger index.
+    max_delta_profile: Returns the running maximum of the OI deltas over the lookbacks.
+    count_history_signals: Counts the history points that would have triggered a signal.
+"""
+
+from collections import deque
+import numpy as np
+
+
+def build_oi_matrix(coins: list[list[dict]], depth: int) -> np.ndarray:
+    """
+    Builds a matrix with the latest `depth` OI values of each series.
+
+    Args:
+        coins (list[list[dict]]): OI series per symbol, each sorted by timestamp descending.
+        depth (int): Number of points per row. Shorter series are padded with NaN.
+
+    Returns:
+        np.ndarray: Float64 matrix of shape (len(coins), depth).
+    """
+    values = [point['open_interest'] for coin in coins for point in coin[:depth]]
+    if len(values) == len(coins) * depth:
+        # Fast path: every series is complete
+        return np.array(values, dtype=np.float64).reshape(len(coins), depth)
+
+    matrix = np.full((len(coins), depth), np.nan)
+    for row, coin in enumerate(coins):
+        values = [point['open_interest'] for point in coin[:depth]]
+        matrix[row, :len(values)] = values
+    return matrix
+
+
+def find_triggers(oi: np.ndarray, threshold: float) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Evaluates every lookback delta of every row against the threshold.
+
+    A row triggers if any delta is strictly greater than the threshold. Rows whose latest value
+    is zero or missing never trigger (the delta is undefined).
+
+    Args:
+        oi (np.ndarray): Matrix built by `build_oi_matrix`.
+        threshold (float): Required OI delta to trigger a signal.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Indices of triggering rows and, for each of them,
+            the smallest lookback index (column) at which the delta exceeds the threshold.
+    """
+    if oi.shape[0] == 0 or oi.shape[1] < 2:
+        empty = np.empty(0, dtype=np.intp)
+        return empty, empty
+
+    latest = oi[:, :1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        deltas = (latest - oi[:, 1:]) / latest
+    deltas[(latest == 0).ravel()] = np.nan
+
+    # NaN compares as False, so missing points never trigger
+    mask = deltas > threshold
+    rows = np.flatnonzero(mask.any(axis=1))
+    first = mask[rows].argmax(axis=1) + 1
+    return rows, first
+
+
+def max_delta_profile(oi: np.ndarray) -> np.ndarray:
+    """
+    Computes, for every row, the running maximum of the OI deltas over the lookbacks.
+
+    Column k - 1 holds the largest delta among lookbacks 1..k. The profile is non-decreasing,
+    so for any threshold the first triggering lookback is `bisect_right(profile, threshold) + 1`,
+    and the row triggers iff its last column is greater than the threshold. One profile answers
+    every threshold of the same period.
+
+    Args:
+        oi (np.ndarray): Matrix built by `build_oi_matrix`.
+
+    Returns:
+        np.ndarray: Float64 matrix of shape (rows, depth - 1). Missing deltas are -inf.
+    """
+    if oi.shape[1] < 2:
+        return np.empty((oi.shape[0], 0))
+
+    latest = oi[:, :1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        deltas = (latest - oi[:, 1:]) / latest
+    deltas[(latest == 0).ravel()] = np.nan
+    deltas[np.isnan(deltas)] = -np.inf
+    return np.maximum.accumulate(deltas, axis=1)
+
+
+def count_history_signals(timestamps: list[int], open_interest: list[float],
+                          limit: int, step: int, threshold: float) -> int:
+    """
+    Counts the points of an OI history that would have triggered a signal.
+
+    Point i triggers if, for some lookback j in [1, limit - 1], the point i + j lies exactly
+    j candles earlier and (oi[i] - oi[i + j]) / oi[i] > threshold. Only points with a full window
+    (i < len - (limit - 1)) are evaluated.
+
+    Points i and k = i + j are consistent iff ts[k] + k * step == ts[i] + i * step, so the series
+    is split into groups by that key. Within a group, the delta decreases with oi[k] for oi[i] > 0
+    (and increases for oi[i] < 0), so only the minimum (maximum) of the window matters.
+    Both are kept with monotonic deques, which gives O(n) time instead of O(n * limit).
+
+    Args:
+        timestamps (list[int]): Timestamps in milliseconds, sorted descending.
+        open_interest (list[float]): OI values matching `timestamps`.
+        limit (int): Number of points of the signal window (lookbacks 1 .. limit - 1).
+        step (int): Candle duration in milliseconds.
+        threshold (float): Required OI delta to trigger a signal.
+
+    Returns:
+        int: Number of triggering points.
+    """
+    n = len(timestamps)
+    last_start = n - (limit - 1)
+    windows: dict[int, tuple[deque, deque]] = {}
+    count = 0
+
+    # Walk from the oldest point, so the window of point i (indices i+1 .. i+limit-1) is already pushed
+    for i in range(n - 1, -1, -1):
+        value = float(open_interest[i])
+        if value != value:
+            # NaN never triggers and is never a valid reference point
+            continue
+
+        key = timestamps[i] + i * step
+        window = windows.get(key)
+        if window is None:
+            window = windows[key] = (deque(), deque())
+        window_min, window_max = window
+
+        if i < last_start and value != 0:
+            expired = i + limit - 1
+            while window_min and window_min[0][0] > expired:
+                window_min.popleft()
+            while window_max and window_max[0][0] > expired:
+                window_max.popleft()
+
+            if window_min:
+                other = window_min[0][1] if value > 0 else window_max[0][1]
+                if (value - other) / value > threshold:
+                    count += 1
+
+        while window_min and window_min[-1][1] >= value:
+            window_min.pop()
+        window_min.append((i, value))
+        while window_max and window_max[-1][1] <= value:
+            window_max.pop()
+        window_max.append((i, value))
+
+    return count
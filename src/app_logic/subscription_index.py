@@ -0,0 +1,182 @@
+"""
+subscription_index.py
+
+This module defines the SubscriptionIndex class, which evaluates signals once per distinct
+(period, threshold) configuration instead of once per user.
+
+Users are indexed by period; within a period, the distinct thresholds are kept sorted.
+For every snapshot of an exchange, the OI delta profile (running maximum of the deltas over
+the lookbacks) of all symbols is computed once per period. A symbol matches every threshold
+below its largest delta, found with a binary search, and the first triggering lookback of each
+matched threshold is another binary search in the profile. The candidates of each configuration
+are confirmed once and the signals are shared by all users of that configuration, so the cost
+scales with the number of distinct configurations, not with the number of users.
+
+Classes:
+    SubscriptionIndex: Users grouped by (period, threshold) with shared signal evaluation.
+
+Globals:
+    subscription_index (SubscriptionIndex): Singleton instance used by the scan coordinator.
+"""
+
+from bisect import bisect_left, bisect_right, insort
+import numpy as np
+from exchange_listeners.base_listener import BaseExchangeListener
+from app_logic.condition_handler import ConditionHandler, AVAILABLE_INTERVAL
+from app_logic.default_settings import MIN_INTERVAL
+from app_logic.signal_counter import signal_counter
+from app_logic.signal_engine import build_oi_matrix, max_delta_profile
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class SubscriptionIndex:
+    """
+    Index of users by period and threshold with per-snapshot shared evaluation.
+
+    Attributes:
+        interval (str): Timeframe of the OI data in minutes.
+        thresholds (dict[int, list[float]]): Sorted distinct thresholds per period.
+        users (dict[tuple[int, float], set]): User IDs per (period, threshold).
+        settings (dict): Maps a user ID to its (period, threshold).
+    """
+    def __init__(self, interval: str = MIN_INTERVAL):
+        self.interval = interval
+        self.thresholds: dict[int, list[float]] = {}
+        self.users: dict[tuple[int, float], set] = {}
+        self.settings: dict = {}
+
+
+    def add(self, user_id, period: int, threshold: float):
+        """
+        Adds a user to the index, replacing its previous configuration.
+
+        Args:
+            user_id: Subscriber ID (Telegram user ID).
+            period (int): Period in minutes over which the OI change is measured.
+            threshold (float): Required OI delta.
+        """
+        config = (period, threshold)
+        if self.settings.get(user_id) == config:
+            return
+        self.remove(user_id)
+        self.settings[user_id] = config
+
+        users = self.users.get(config)
+        if users is None:
+            users = self.users[config] = set()
+            insort(self.thresholds.setdefault(period, []), threshold)
+        users.add(user_id)
+
+
+    def remove(self, user_id):
+        """
+        Removes a user from the index. Unknown IDs are ignored.
+
+        When the last user of a configuration goes away, its 24h signal counts are evicted.
+
+        Args:
+            user_id: Subscriber ID.
+        """
+        config = self.settings.pop(user_id, None)
+        if config is None:
+            return
+
+        users = self.users[config]
+        users.discard(user_id)
+        if not users:
+            del self.users[config]
+            period, threshold = config
+            thresholds = self.thresholds[period]
+            thresholds.pop(bisect_left(thresholds, threshold))
+            if not thresholds:
+                del self.thresholds[period]
+            signal_counter.evict_config(self.limit(period), threshold)
+
+
+    def limit(self, period: int) -> int:
+        """
+        Returns the number of data points covering a period (as in `ConditionHandler.configure`).
+
+        Args:
+            period (int): Period in minutes.
+        """
+        return int(period / AVAILABLE_INTERVAL[self.interval]) + 1
+
+
+    @staticmethod
+    def match(thresholds: list[float], profile: np.ndarray) -> dict[float, dict[int, int]]:
+        """
+        Finds the first triggering lookback of every symbol for every threshold of a period.
+
+        Args:
+            thresholds (list[float]): Sorted distinct thresholds of the period.
+            profile (np.ndarray): Delta profile of all symbols built by `max_delta_profile`.
+
+        Returns:
+            dict[float, dict[int, int]]: Maps each matched threshold to {row: first triggering index}.
+        """
+        starts: dict[float, dict[int, int]] = {}
+        if not thresholds or profile.shape[1] == 0:
+            return starts
+
+        # Only symbols exceeding the lowest threshold can match anything
+        for row in np.flatnonzero(profile[:, -1] > thresholds[0]).tolist():
+            deltas = profile[row].tolist()
+            # Thresholds strictly below the largest delta are exceeded by some lookback
+            for threshold in thresholds[:bisect_left(thresholds, deltas[-1])]:
+                starts.setdefault(threshold, {})[row] = bisect_right(deltas, threshold) + 1
+        return starts
+
+
+    async def evaluate(self, exchange_name: str, coins: list, listener: BaseExchangeListener,
+                       configs: set[tuple[int, float]] = None) -> dict:
+        """
+        Computes the signals of the indexed configurations for one exchange snapshot.
+
+        Args:
+            exchange_name (str): Exchange name.
+            coins (list): OI series per symbol from the market poller.
+            listener (BaseExchangeListener): Listener of the exchange (used to load klines).
+            configs (set[tuple[int, float]], optional): Only evaluate these (period, threshold)
+                configurations. Defaults to all indexed configurations.
+
+        Returns:
+            dict[tuple[int, float], list[dict]]: Signals per (period, threshold).
+        """
+        # Users may subscribe or leave while the candidates are being confirmed
+        thresholds_by_period = {}
+        for period, thresholds in self.thresholds.items():
+            selected = [t for t in thresholds if configs is None or (period, t) in configs]
+            if selected:
+                thresholds_by_period[period] = selected
+        if not thresholds_by_period:
+            return {}
+
+        limits = {period: self.limit(period) for period in thresholds_by_period}
+        valid_coins = ConditionHandler().prepare_coins(coins, max(limits.values()))
+        signals = {}
+
+        for period, thresholds in thresholds_by_period.items():
+            limit = limits[period]
+            period_coins = [coin[:limit] for coin in valid_coins]
+            profile = max_delta_profile(build_oi_matrix(period_coins, limit))
+
+            for threshold in thresholds:
+                signals[(period, threshold)] = []
+            for threshold, start_by_row in self.match(thresholds, profile).items():
+                handler = ConditionHandler()
+                handler.set_client(listener)
+                handler.configure([], period, self.interval, threshold)
+                signals[(period, threshold)] = await handler.confirm_signals(period_coins, start_by_row)
+
+        logger.debug(f"[{exchange_name.upper()}] Evaluated {len(signals)} configurations")
+        return signals
+
+
+
+subscription_index = SubscriptionIndex()
+"""
+Singleton instance of SubscriptionIndex used by the scan coordinator.
+"""
@@ -6,11 +6,13 @@ from all active exchanges using their respective listeners.
 
 It initializes a manager for exchange listeners, retrieves updated symbol lists
 at a defined time every minute, and stores them in memory for access by other components.
+The 24h signal counts of delisted symbols are dropped on every update.
 """
 
 import asyncio
 from datetime import datetime
 from app_logic.default_settings import DEFAULT_EXCHANGES, START_FETCH_SYMBOLS_SECOND, SLEEP_FETCH_SYMBOLS_SECOND
+from app_logic.signal_counter import signal_counter
 from exchange_listeners.listener_manager import ListenerManager
 from logging_config import get_logger
 
@@ -64,6 +66,8 @@ class SymbolListHandler:
                             if name != None and listener != None:
                                 symbols = await listener.fetch_usdt_symbols()
                                 self.symbols_by_exchange[name] = symbols
+                                if symbols:
+                                    signal_counter.retain_symbols(name, symbols)
                                 logger.debug(f"{name.upper()} symbols: {len(symbols)}")
                         except Exception as e:
                             logger.error(f"Error receiving exchange {name}: {e}", exc_info=True)
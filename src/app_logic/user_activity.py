@@ -11,7 +11,7 @@ Main responsibilities:
 
 Requires:
     - notify() to send messages via Telegram
-    - running_scanners: currently active scanner tasks
+    - running_scanners / stop_scanner: currently active scanners and their shutdown
     - aiogram router for callback handling
 """
 
@@ -22,7 +22,7 @@ from aiogram import Router, F
 from aiogram.types import CallbackQuery
 from bot.msg_sender import notify
 from app_logic.default_settings import INACTIVITY_DAYS, WAITING_DAYS
-from app_logic.scanner.scanner_manager import running_scanners
+from app_logic.scanner.scanner_manager import running_scanners, stop_scanner
 from logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -92,16 +92,7 @@ async def monitor_user_activity():
                 # Already waiting for confirmation
                 if (now - pending_confirmation[user_id]).days >= WAITING_DAYS:
                     # No response - turn off the scanner
-                    running = running_scanners.get(user_id)
-
-                    if running:
-                        running["task"].cancel()
-                        try:
-                            await running["task"]
-                        except asyncio.CancelledError:
-                            pass
-
-                        running_scanners.pop(user_id, None)
+                    if await stop_scanner(user_id) == "stopped":
                         await notify(user_id, "❌ Scanner stopped.")
                         logger.info(f"Scanner stopped for inactive user {user_id}.")
 
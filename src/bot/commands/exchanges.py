@@ -5,13 +5,14 @@ Handlers and UI logic for managing user-selected exchanges in the Telegram bot.
 
 Includes:
 - `/exchanges` command to open the exchange selection menu.
-- Callback handlers for enabling/disabling specific exchanges.
+- Callback handlers for enabling/disabling specific exchanges (applied to a running scanner in place).
 - Dynamic inline keyboard generation reflecting current user preferences.
 """
 
 from aiogram import F, Router
 from aiogram.types import Message, CallbackQuery, InlineKeyboardMarkup, InlineKeyboardButton
 from app_logic.user_activity import mark_user_active
+from app_logic.scanner.scanner_manager import update_scanner_settings
 from db.bot_users import get_user_settings, update_user_settings
 from bot.msg_sender import notify
 
@@ -84,6 +85,7 @@ async def toggle_exchange(callback: CallbackQuery):
         status = f"✅ Exchange {exchange.capitalize()} activated"
 
     await update_user_settings(user_id, active_exchanges=list(active))
+    await update_scanner_settings(user_id)
     await callback.answer(status, show_alert=True)
     await callback.message.edit_reply_markup(reply_markup=generate_exchange_keyboard(active))
 
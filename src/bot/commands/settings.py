@@ -10,6 +10,7 @@ Includes:
 - Command /settings to show the configuration menu.
 - FSM-based input handlers to set period and threshold values.
 - Database updates via get_user_settings and update_user_settings.
+- Applying changed settings to a running scanner in place.
 - User activity tracking.
 """
 
@@ -24,6 +25,7 @@ from bot.states import ScreenerSettings
 from db.bot_users import get_user_settings, update_user_settings
 from app_logic.default_settings import DEFAULT_SETTINGS, POPULAR_TIMEZONES_BY_OFFSET
 from app_logic.user_activity import mark_user_active
+from app_logic.scanner.scanner_manager import update_scanner_settings
 from logging_config import get_logger
 from bot.msg_sender import notify
 
@@ -51,6 +53,18 @@ async def show_settings_menu(target):
     mark_user_active(user_id)
 
 
+def next_step_hint(running: bool) -> str:
+    """
+    Returns the hint shown after a setting was changed.
+
+    Args:
+        running (bool): Whether the new settings were applied to a running scanner.
+    """
+    if running:
+        return "The running scanner uses it from the next candle"
+    return "Press /run to start"
+
+
 @router.message(F.text == "/settings")
 async def cmd_settings(message: Message):
     """
@@ -133,9 +147,10 @@ async def  process_time_zone(callback: CallbackQuery, state: FSMContext):
     dt = datetime.now(ZoneInfo(time_zone))
 
     await update_user_settings(user_id, time_zone=time_zone)
+    running = await update_scanner_settings(user_id)
     await state.clear()
     await callback.message.answer(
-        f"You chose: \"{time_zone}\"\nYour current time - {dt.strftime('%H:%M:%S')}\nPress /run to start")
+        f"You chose: \"{time_zone}\"\nYour current time - {dt.strftime('%H:%M:%S')}\n{next_step_hint(running)}")
     await callback.answer()
 
 
@@ -184,8 +199,9 @@ async def process_period(message: Message, state: FSMContext):
         threshold = existing["threshold"] if existing else DEFAULT_SETTINGS["threshold"]
 
         await update_user_settings(user_id, period=period, threshold=threshold)
+        running = await update_scanner_settings(user_id)
 
-        await message.answer(f"✅ The period is set: {period} minutes.\nPress /run to start")
+        await message.answer(f"✅ The period is set: {period} minutes.\n{next_step_hint(running)}")
         await state.clear()
 
     except ValueError as e:
@@ -240,8 +256,9 @@ async def process_threshold(message: Message, state: FSMContext):
         period = existing["period"] if existing else DEFAULT_SETTINGS["period"]
 
         await update_user_settings(user_id, period=period, threshold=threshold)
+        running = await update_scanner_settings(user_id)
 
-        await message.answer(f"✅ Growth threshold set: {threshold * 100:.2f}%\nPress /run to start")
+        await message.answer(f"✅ Growth threshold set: {threshold * 100:.2f}%\n{next_step_hint(running)}")
         await state.clear()
 
     except ValueError as e:
@@ -0,0 +1,151 @@
+"""
+dispatch_queue.py
+
+Central outbound queue for Telegram messages.
+
+Callers enqueue a message and return immediately; sending happens in background worker tasks,
+one per chat with pending messages, so messages to one chat keep their order and a busy chat
+never delays the others. Telegram limits are enforced with token buckets: a global bucket
+(TELEGRAM_GLOBAL_RATE messages per second) shared by all workers and one bucket per chat
+(TELEGRAM_CHAT_RATE messages per second), kept only while the chat is active. A `TelegramRetryAfter`
+error pauses all sending for the requested time, after which the message is retried.
+
+Classes:
+    DispatchQueue: Rate-limited outbound message queue.
+
+Globals:
+    dispatch_queue (DispatchQueue): Singleton instance used by `msg_sender.notify`.
+"""
+
+import asyncio
+from aiogram import Bot
+from aiogram.exceptions import TelegramRetryAfter, TelegramAPIError
+from aiogram.types import InlineKeyboardMarkup
+from bot.bot_init import bot_
+from app_logic.default_settings import TELEGRAM_GLOBAL_RATE, TELEGRAM_CHAT_RATE
+from exchange_listeners.rate_limiter import RateLimiter, TokenBucket
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class DispatchQueue:
+    """
+    Outbound Telegram message queue drained by per-chat worker tasks.
+
+    Attributes:
+        bot (Bot): Bot used to send the messages.
+        limiter (RateLimiter): Global rate limiter, also paused on `TelegramRetryAfter`.
+        chat_rate (float): Messages per second allowed to a single chat.
+        queues (dict[int, asyncio.Queue]): Pending messages per chat.
+        buckets (dict[int, TokenBucket]): Token bucket per chat, dropped when the chat is idle and its bucket full.
+        workers (dict[int, asyncio.Task]): Running worker task per chat with pending messages.
+    """
+    MAX_RETRIES = 3
+
+    def __init__(self, bot: Bot = bot_,
+                 global_rate: float = TELEGRAM_GLOBAL_RATE,
+                 chat_rate: float = TELEGRAM_CHAT_RATE):
+        self.bot = bot
+        self.limiter = RateLimiter("Telegram", rate=global_rate, capacity=global_rate)
+        self.chat_rate = chat_rate
+        self.queues: dict[int, asyncio.Queue] = {}
+        self.buckets: dict[int, TokenBucket] = {}
+        self.workers: dict[int, asyncio.Task] = {}
+
+
+    def enqueue(self, chat_id: int, text: str, reply_markup: InlineKeyboardMarkup = None):
+        """
+        Adds a message to the queue of its chat and starts the chat's worker if needed.
+
+        Args:
+            chat_id (int): Telegram chat (user) ID.
+            text (str): Message text (HTML).
+            reply_markup (InlineKeyboardMarkup, optional): Inline keyboard attached to the message.
+        """
+        queue = self.queues.get(chat_id)
+        if queue is None:
+            queue = self.queues[chat_id] = asyncio.Queue()
+        queue.put_nowait((text, reply_markup))
+
+        if chat_id not in self.workers:
+            self.workers[chat_id] = asyncio.create_task(self._drain(chat_id, queue))
+
+
+    async def _drain(self, chat_id: int, queue: asyncio.Queue):
+        """
+        Sends the pending messages of a chat in order and exits when the queue is empty.
+
+        Before exiting, the worker waits until the chat's bucket is full again and then drops it,
+        so idle chats keep no state and a new bucket never lets a chat exceed its rate.
+
+        Args:
+            chat_id (int): Telegram chat ID.
+            queue (asyncio.Queue): Pending messages of the chat.
+        """
+        bucket = self.buckets.get(chat_id)
+        if bucket is None:
+            bucket = self.buckets[chat_id] = TokenBucket(self.chat_rate, 1)
+
+        try:
+            while True:
+                while not queue.empty():
+                    text, reply_markup = queue.get_nowait()
+                    await bucket.acquire()
+                    await self._send(chat_id, text, reply_markup)
+                # Messages enqueued meanwhile go to this queue and are sent by this worker
+                await bucket.wait_full()
+                if queue.empty():
+                    break
+        finally:
+            # No await between the empty check and this point, so no message can be left behind
+            del self.workers[chat_id]
+            if queue.empty():
+                self.queues.pop(chat_id, None)
+                self.buckets.pop(chat_id, None)
+
+
+    async def _send(self, chat_id: int, text: str, reply_markup: InlineKeyboardMarkup = None):
+        """
+        Sends one message under the global limit, retrying after `TelegramRetryAfter`.
+
+        Args:
+            chat_id (int): Telegram chat ID.
+            text (str): Message text.
+            reply_markup (InlineKeyboardMarkup, optional): Inline keyboard.
+        """
+        for attempt in range(self.MAX_RETRIES + 1):
+            await self.limiter.acquire()
+            try:
+                await self.bot.send_message(chat_id=chat_id, text=text, reply_markup=reply_markup,
+                                            disable_web_page_preview=True)
+                return
+            except TelegramRetryAfter as e:
+                self.limiter.block(e.retry_after)
+                logger.warning(f"Telegram flood control: pausing {e.retry_after}s "
+                               f"(attempt {attempt + 1}, chat {chat_id})")
+            except TelegramAPIError as e:
+                logger.error(f"Failed to send message to {chat_id}: {e}")
+                return
+            except Exception as e:
+                logger.error(f"Unexpected error while sending message to {chat_id}: {e}", exc_info=True)
+                return
+        logger.error(f"Message to {chat_id} dropped after {self.MAX_RETRIES} retries")
+
+
+    async def stop(self):
+        """
+        Cancels all worker tasks. Pending messages are discarded.
+        """
+        workers = list(self.workers.values())
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        self.queues.clear()
+
+
+
+dispatch_queue = DispatchQueue()
+"""
+Singleton instance of DispatchQueue used for all outgoing messages.
+"""
@@ -1,5 +1,4 @@
-import asyncio
-from bot.bot_init import bot_
+from bot.dispatch_queue import dispatch_queue
 from aiogram.types import InlineKeyboardMarkup
 
 
@@ -13,10 +12,7 @@ async def notify(user_id: int, msg: str, reply_markup: InlineKeyboardMarkup = No
         reply_markup (InlineKeyboardMarkup, optional): Optional inline keyboard to include with the message.
 
     Notes:
-        A small delay (0.2 seconds) is added before sending the message
-        to prevent hitting rate limits when sending many messages in sequence.
+        The message is put into the central dispatch queue and sent in the background
+        within Telegram's global and per-chat rate limits, so the call returns immediately.
     """
-    await asyncio.sleep(0.2)
-    await bot_.send_message(chat_id=user_id, text=msg, reply_markup=reply_markup, disable_web_page_preview=True)
-
-
+    dispatch_queue.enqueue(user_id, msg, reply_markup)
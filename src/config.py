@@ -31,6 +31,7 @@ class AppConfig(BaseSettings):
         TG_BOT_API_KEY (str): Telegram bot API key, loaded from the environment.
         DB_PATH (Path): Path to the SQLite database file used for storing user settings and signal history.
         LOG_PATH (Path): Path to the application log file.
+        SNAPSHOT_PATH (Path): Path to the snapshot of the in-memory market data, restored on startup.
 
     Configuration is automatically loaded from a `.env` file if present.
     """
@@ -40,6 +41,8 @@ class AppConfig(BaseSettings):
 
     LOG_PATH: Path = BASE_DIR / "logs" / "app.log"
 
+    SNAPSHOT_PATH: Path = BASE_DIR / "storage" / "market_snapshot.npz"
+
     model_config = SettingsConfigDict(
         env_file=str(BASE_DIR / ".env"),
         env_file_encoding="utf-8"
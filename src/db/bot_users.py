@@ -4,8 +4,12 @@ bot_users.py
 Handles interaction with the SQLite database to store and retrieve user-specific screener settings.
 This includes user preferences such as scan period, threshold percentage, and selected exchanges.
 
+Settings are served from a process-wide in-memory cache that is loaded at startup and updated
+on every write, so reads never touch the database.
+
 Functions:
-    init_db(): Initializes the database and creates the 'user_settings' table if it doesn't exist.
+    init_db(): Initializes the database, creates the 'user_settings' table if it doesn't exist and loads the cache.
+    load_settings_cache(): Loads the settings of all users into the cache.
     get_user_settings(user_id): Retrieves the screener settings for a given user.
     update_user_settings(user_id, period, threshold, active_exchanges): Inserts or updates screener settings for a user.
 """
@@ -17,11 +21,21 @@ from app_logic.default_settings import DEFAULT_SETTINGS, DEFAULT_EXCHANGES, DEFA
 
 config.DB_PATH.parent.mkdir(parents=True, exist_ok=True)
 
+_settings_cache: dict[int, dict] = {}
+"""
+dict[int, dict]: Write-through cache of all users' settings, keyed by user ID.
+"""
+_cache_loaded = False
+"""
+bool: Whether the cache has been loaded from the database.
+"""
+
 
 async def init_db():
     """
     Initializes the SQLite database by creating the 'user_settings' table if it doesn't exist.
     Sets default values for active exchanges using the DEFAULT_EXCHANGES list.
+    Loads the settings of all users into the in-memory cache.
     """
     async with aiosqlite.connect(config.DB_PATH) as db:
         default_exchanges_str = json.dumps(DEFAULT_EXCHANGES)
@@ -36,36 +50,70 @@ async def init_db():
         ''')
         await db.commit()
 
+    await load_settings_cache()
+
+
+def _row_to_settings(row) -> dict:
+    """
+    Converts a 'user_settings' row (period, threshold, active_exchanges, time_zone) into a settings dict,
+    filling empty columns with the defaults.
+    """
+    return {
+        "period": row[0] if row[0] else DEFAULT_SETTINGS["period"],
+        "threshold": row[1] if row[1] else DEFAULT_SETTINGS["threshold"],
+        "active_exchanges": json.loads(row[2]) if row[2] else DEFAULT_EXCHANGES,
+        "time_zone": row[3] if row[3] else DEFAULT_TIME_ZONE
+    }
+
+
+def _copy_settings(settings: dict) -> dict:
+    """Returns a copy of cached settings that callers may modify freely."""
+    return {**settings, "active_exchanges": list(settings["active_exchanges"])}
+
+
+async def load_settings_cache():
+    """
+    Loads the settings of all users into the in-memory cache.
+    """
+    async with aiosqlite.connect(config.DB_PATH) as db:
+        cursor = await db.execute("SELECT user_id, period, threshold, active_exchanges, time_zone FROM user_settings")
+        rows = await cursor.fetchall()
+
+    _settings_cache.clear()
+    for row in rows:
+        _settings_cache[row[0]] = _row_to_settings(row[1:])
+    global _cache_loaded
+    _cache_loaded = True
+
 
 async def get_user_settings(user_id: int):
     """
-    Retrieves the user's screener settings from the database.
+    Retrieves the user's screener settings from the in-memory cache.
+
+    The cache holds every user once loaded at startup (it is loaded on first use otherwise),
+    so reads never touch the database.
 
     Args:
         user_id (int): Telegram user ID.
 
     Returns:
-        dict or None: A dictionary with keys 'period', 'threshold', and 'active_exchanges'.
+        dict or None: A dictionary with keys 'period', 'threshold', 'active_exchanges' and 'time_zone'.
                       Returns None if the user is not found in the database.
     """
-    async with aiosqlite.connect(config.DB_PATH) as db:
-        cursor = await db.execute("SELECT period, threshold, active_exchanges, time_zone FROM user_settings WHERE user_id = ?", (user_id,))
-        row = await cursor.fetchone()
-        if row:
-            return {
-                "period": row[0] if row[0] else DEFAULT_SETTINGS["period"],
-                "threshold": row[1] if row[1] else DEFAULT_SETTINGS["threshold"],
-                "active_exchanges": json.loads(row[2]) if row[2] else DEFAULT_EXCHANGES,
-                "time_zone": row[3] if row[3] else DEFAULT_TIME_ZONE
-            }
-        else:
-            return None
+    if not _cache_loaded:
+        await load_settings_cache()
+
+    settings = _settings_cache.get(user_id)
+    return _copy_settings(settings) if settings is not None else None
 
 
 async def update_user_settings(user_id: int, period=None, threshold=None, active_exchanges=None, time_zone=None):
     """
     Inserts new or updates existing screener settings for a given user.
 
+    Missing values are taken from the current settings (or the defaults for a new user).
+    The row is written with a single UPSERT and the cache is updated afterwards (write-through).
+
     Args:
         user_id (int): Telegram user ID.
         period (int, optional): Time period in minutes to check for growth.
@@ -73,26 +121,33 @@ async def update_user_settings(user_id: int, period=None, threshold=None, active
         active_exchanges (list[str], optional): List of exchange names to monitor.
         time_zone (str, optional): IANA time zone ("Europe/Kiev", "America/New_York", "UTC").
     """
+    existing = await get_user_settings(user_id)
+    if existing is None:
+        settings = {
+            "period": period or DEFAULT_SETTINGS["period"],
+            "threshold": threshold or DEFAULT_SETTINGS["threshold"],
+            "active_exchanges": list(active_exchanges or DEFAULT_EXCHANGES),
+            "time_zone": time_zone or DEFAULT_TIME_ZONE
+        }
+    else:
+        settings = {
+            "period": period if period is not None else existing["period"],
+            "threshold": threshold if threshold is not None else existing["threshold"],
+            "active_exchanges": list(active_exchanges if active_exchanges is not None else existing["active_exchanges"]),
+            "time_zone": time_zone if time_zone is not None else existing["time_zone"]
+        }
+
     async with aiosqlite.connect(config.DB_PATH) as db:
-        existing = await get_user_settings(user_id)
-        if existing is None:
-            await db.execute(
-                "INSERT INTO user_settings (user_id, period, threshold, active_exchanges, time_zone) VALUES (?, ?, ?, ?, ?)",
-                (
-                    user_id,
-                    period or DEFAULT_SETTINGS["period"],
-                    threshold or DEFAULT_SETTINGS["threshold"],
-                    json.dumps(active_exchanges or DEFAULT_EXCHANGES),
-                    time_zone or DEFAULT_TIME_ZONE
-                )
-            )
-        else:
-            new_period = period if period is not None else existing["period"]
-            new_threshold = threshold if threshold is not None else existing["threshold"]
-            new_exchanges = json.dumps(active_exchanges if active_exchanges is not None else existing["active_exchanges"])
-            new_time_zone = time_zone if time_zone is not None else existing["time_zone"]
-            await db.execute(
-                "UPDATE user_settings SET period = ?, threshold = ?, active_exchanges = ?, time_zone = ? WHERE user_id = ?",
-                (new_period, new_threshold, new_exchanges, new_time_zone, user_id)
-            )
+        await db.execute("""
+            INSERT INTO user_settings (user_id, period, threshold, active_exchanges, time_zone)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(user_id) DO UPDATE SET
+                period = excluded.period,
+                threshold = excluded.threshold,
+                active_exchanges = excluded.active_exchanges,
+                time_zone = excluded.time_zone
+        """, (user_id, settings["period"], settings["threshold"], json.dumps(settings["active_exchanges"]),
+              settings["time_zone"]))
         await db.commit()
+
+    _settings_cache[user_id] = settings
@@ -4,63 +4,264 @@ hist_signal_db.py
 Provides functionality to manage historical open interest data in a temporary SQLite database.
 Includes operations for initialization, insertion, cleanup, and retrieval of historical data.
 
+All operations share one long-lived connection in WAL mode with `synchronous=NORMAL`:
+a cycle's history rows are written with a single `executemany` in one transaction
+instead of opening a connection and committing (fsync) once per row.
+
+Symbols and exchanges are dictionary-encoded: their names are stored once in the
+'symbols' and 'exchanges' lookup tables, and the history holds their integer ids in
+`WITHOUT ROWID` tables clustered on (exchange_id, symbol_id, timestamp). Every insert updates
+a single B-tree, and the rows of a symbol are read as one contiguous range of it. The clustered
+key is the natural key of a record, so writing the same point again never adds a duplicate row.
+
+The history is partitioned by UTC day: the rows of day N (timestamp // PARTITION_MS) are stored
+in the table 'history_temp_N', created by the first insert into that day. Queries span the
+partitions of their time range transparently, and retention drops whole partitions instead of
+deleting rows, which takes constant time and leaves no fragmented pages behind.
+A database with a single 'history_temp' table (either the dictionary-encoded one or the original
+layout with TEXT columns, rowid and two secondary indexes) is migrated by `init_db()`.
+
 Functions:
-    init_db(): Initializes the database and creates the 'history_temp' table with appropriate indexes.
-    trim_old_records(table_name, current_timestamp, days): Deletes outdated records older than a specified number of days.
+    get_connection(): Returns the shared connection, opening it on first use.
+    close_db(): Closes the shared connection.
+    init_db(): Initializes the database, creating the lookup tables and migrating an unpartitioned history.
+    trim_old_records(current_timestamp, days): Drops the history partitions older than a specified number of days.
     add_history_in_db(symbol, exchange, timestamp, open_interest): Inserts a new open interest record into the database.
+    add_history_batch(rows): Inserts many open interest records in one transaction.
     get_historical_oi(symbol, exchange, before_date): Retrieves open interest records for the past 24 hours for a given symbol and exchange.
 """
 
+import asyncio
 import aiosqlite
 from config import config
 
 config.DB_PATH.parent.mkdir(parents=True, exist_ok=True)
 
+_connection: aiosqlite.Connection | None = None
+"""
+aiosqlite.Connection | None: Shared connection, opened by `get_connection()`.
+"""
+_lock = asyncio.Lock()
+"""
+asyncio.Lock: Serializes opening the connection, write transactions on it and reads across partitions.
+"""
+PARTITION_MS = 24 * 60 * 60 * 1000
+"""
+int: Time span of one history partition in milliseconds (one UTC day).
+"""
+_ids: dict[str, dict[str, int]] = {"symbols": {}, "exchanges": {}}
+"""
+dict[str, dict[str, int]]: Cached ids of the names of each lookup table ("symbols", "exchanges").
+"""
+_partitions: set[int] = set()
+"""
+set[int]: Days (timestamp // PARTITION_MS) that have a history partition, loaded by `init_db()`.
+"""
+
+
+async def get_connection() -> aiosqlite.Connection:
+    """
+    Returns the shared database connection, opening it on first use.
+
+    The connection uses WAL journaling with `synchronous=NORMAL`, so commits do not wait
+    for an fsync and readers are not blocked by writers. Rows are returned as `aiosqlite.Row`.
+
+    Returns:
+        aiosqlite.Connection: The open connection.
+    """
+    global _connection
+    if _connection is None:
+        async with _lock:
+            if _connection is None:
+                db = await aiosqlite.connect(config.DB_PATH)
+                await db.execute("PRAGMA journal_mode=WAL")
+                await db.execute("PRAGMA synchronous=NORMAL")
+                db.row_factory = aiosqlite.Row
+                _connection = db
+    return _connection
+
+
+async def close_db():
+    """
+    Closes the shared database connection if it is open and forgets the cached lookup ids and partitions.
+    """
+    global _connection
+    if _connection is not None:
+        db, _connection = _connection, None
+        await db.close()
+    for ids in _ids.values():
+        ids.clear()
+    _partitions.clear()
+
+
+def partition_name(day: int) -> str:
+    """
+    Returns the name of the history partition of a day.
+
+    Args:
+        day (int): Day number (timestamp // PARTITION_MS).
+    """
+    return f"history_temp_{day}"
+
+
+async def _create_partition(db: aiosqlite.Connection, day: int):
+    """
+    Creates the history partition of a day if it doesn't exist. Must be called with `_lock` held.
+
+    Args:
+        db (aiosqlite.Connection): The shared connection.
+        day (int): Day number (timestamp // PARTITION_MS).
+    """
+    if day in _partitions:
+        return
+    await db.execute(f"""
+        CREATE TABLE IF NOT EXISTS {partition_name(day)} (
+            exchange_id INTEGER NOT NULL,
+            symbol_id INTEGER NOT NULL,
+            timestamp INTEGER NOT NULL,
+            open_interest REAL,
+            PRIMARY KEY (exchange_id, symbol_id, timestamp)
+        ) WITHOUT ROWID
+    """)
+    _partitions.add(day)
+
 
 async def init_db():
     """
-    Initializes the SQLite database and creates the 'history_temp' table if it doesn't exist.
-    Also creates necessary indexes for performance optimization.
-    """
-    async with aiosqlite.connect(config.DB_PATH) as db:
-        await db.execute("""
-            CREATE TABLE IF NOT EXISTS history_temp (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                symbol TEXT,
-                exchange TEXT,
-                timestamp INTEGER,
-                open_interest REAL
-            )
-        """)
-        await db.execute("""
-            CREATE INDEX IF NOT EXISTS idx_timestamp
-            ON history_temp (timestamp)
-        """)
-        await db.execute("""
-            CREATE INDEX IF NOT EXISTS idx_symbol_exchange_time
-            ON history_temp(symbol, exchange, timestamp)
-        """)
+    Initializes the SQLite database: creates the 'symbols' and 'exchanges' lookup tables if they don't exist,
+    loads the list of history partitions and migrates an unpartitioned 'history_temp' table.
+    """
+    db = await get_connection()
+    async with _lock:
+        for table in ("symbols", "exchanges"):
+            await db.execute(f"""
+                CREATE TABLE IF NOT EXISTS {table} (
+                    id INTEGER PRIMARY KEY,
+                    name TEXT NOT NULL UNIQUE
+                )
+            """)
+
+        async with db.execute("SELECT name FROM sqlite_master WHERE type = 'table'") as cursor:
+            tables = {row["name"] for row in await cursor.fetchall()}
+        prefix = partition_name(0)[:-1]
+        _partitions.update(int(name[len(prefix):]) for name in tables
+                           if name.startswith(prefix) and name[len(prefix):].isdigit())
+
+        migrate = "history_temp" in tables
+        if migrate:
+            await _migrate_history(db)
         await db.commit()
 
+        if migrate:
+            # Give the space of the old table and its indexes back to the file system
+            await db.execute("VACUUM")
 
-async def trim_old_records(table_name: str, current_timestamp: int, days: int = 1):
+
+async def _migrate_history(db: aiosqlite.Connection):
+    """
+    Moves the rows of an unpartitioned 'history_temp' table into the day partitions and drops it with its indexes.
+
+    The original layout (TEXT symbol and exchange columns) is dictionary-encoded on the way, and its
+    duplicate (exchange, symbol, timestamp) rows are collapsed to the most recently inserted one.
+
+    Args:
+        db (aiosqlite.Connection): The shared connection, within an open transaction.
+    """
+    async with db.execute("PRAGMA table_info(history_temp)") as cursor:
+        encoded = "symbol_id" in {row["name"] for row in await cursor.fetchall()}
+
+    if encoded:
+        source = "SELECT exchange_id, symbol_id, timestamp, open_interest FROM history_temp WHERE {where}"
+    else:
+        await db.execute("INSERT OR IGNORE INTO symbols (name) SELECT DISTINCT symbol FROM history_temp")
+        await db.execute("INSERT OR IGNORE INTO exchanges (name) SELECT DISTINCT exchange FROM history_temp")
+        source = """
+            SELECT e.id, s.id, h.timestamp, h.open_interest
+            FROM history_temp h
+            JOIN exchanges e ON e.name = h.exchange
+            JOIN symbols s ON s.name = h.symbol
+            WHERE {where}
+            ORDER BY h.id
+        """
+
+    async with db.execute(f"SELECT DISTINCT timestamp / {PARTITION_MS} AS day FROM history_temp "
+                          f"WHERE timestamp IS NOT NULL") as cursor:
+        days = [row["day"] for row in await cursor.fetchall()]
+    for day in days:
+        await _create_partition(db, day)
+        await db.execute(f"""
+            INSERT OR REPLACE INTO {partition_name(day)} (exchange_id, symbol_id, timestamp, open_interest)
+            {source.format(where="timestamp >= ? AND timestamp < ?")}
+        """, (day * PARTITION_MS, (day + 1) * PARTITION_MS))
+    await db.execute("DROP TABLE history_temp")
+
+
+async def _get_ids(db: aiosqlite.Connection, table: str, names: set[str]) -> dict[str, int]:
+    """
+    Returns the ids of the names of a lookup table, adding missing names. Must be called with `_lock` held.
+
+    Args:
+        db (aiosqlite.Connection): The shared connection.
+        table (str): Lookup table ("symbols" or "exchanges").
+        names (set[str]): Names to resolve.
+
+    Returns:
+        dict[str, int]: Id per name (the whole cache of the table).
+    """
+    ids = _ids[table]
+    missing = [(name,) for name in names if name not in ids]
+    if missing:
+        await db.executemany(f"INSERT OR IGNORE INTO {table} (name) VALUES (?)", missing)
+        async with db.execute(f"SELECT id, name FROM {table}") as cursor:
+            ids.update({row["name"]: row["id"] for row in await cursor.fetchall()})
+    return ids
+
+
+async def _find_id(db: aiosqlite.Connection, table: str, name: str) -> int | None:
+    """
+    Returns the id of a name of a lookup table without adding it.
+
+    Args:
+        db (aiosqlite.Connection): The shared connection.
+        table (str): Lookup table ("symbols" or "exchanges").
+        name (str): Name to resolve.
+
+    Returns:
+        int | None: The id, or None if the name is not stored.
+    """
+    ids = _ids[table]
+    if name not in ids:
+        async with db.execute(f"SELECT id FROM {table} WHERE name = ?", (name,)) as cursor:
+            row = await cursor.fetchone()
+        if row is None:
+            return None
+        ids[name] = row["id"]
+    return ids[name]
+
+
+async def trim_old_records(current_timestamp: int, days: int = 1):
     """
-    Deletes records older than the specified number of days from the given table.
+    Drops the history partitions whose records are all older than the specified number of days.
+    Records of the partially outdated partition are kept until that partition is dropped.
 
     Args:
-        table_name (str): Name of the table to clean up.
-        current_timestamp (int): Current timestamp in milliseconds.
+        current_timestamp (int): Current timestamp in seconds.
         days (int, optional): Number of days to retain. Defaults to 1.
     """
     threshold_timestamp = (current_timestamp - days * 24 * 60 * 60) * 1000
-    async with aiosqlite.connect(config.DB_PATH) as db:
-        await db.execute(f"DELETE FROM {table_name} WHERE  timestamp < ?", (threshold_timestamp,))
+    db = await get_connection()
+    async with _lock:
+        for day in sorted(_partitions):
+            if (day + 1) * PARTITION_MS > threshold_timestamp:
+                break
+            await db.execute(f"DROP TABLE IF EXISTS {partition_name(day)}")
+            _partitions.discard(day)
         await db.commit()
 
 
 async def add_history_in_db(symbol: str, exchange: str, timestamp: int, open_interest: float):
     """
-    Inserts a new record of open interest data into the 'history_temp' table.
+    Inserts a new record of open interest data into the history partition of its day.
 
     Args:
         symbol (str): Trading symbol (e.g. BTCUSDT).
@@ -68,11 +269,41 @@ async def add_history_in_db(symbol: str, exchange: str, timestamp: int, open_int
         timestamp (int): Timestamp in milliseconds.
         open_interest (float): Value of open interest.
     """
-    async with aiosqlite.connect(config.DB_PATH) as db:
-        await db.execute("""
-            INSERT INTO  history_temp (symbol, exchange, timestamp, open_interest)
-            VALUES (?, ?, ?, ?)
-        """, (symbol, exchange, timestamp, open_interest))
+    await add_history_batch([(symbol, exchange, timestamp, open_interest)])
+
+
+async def add_history_batch(rows: list[tuple[str, str, int, float]]):
+    """
+    Inserts many open interest records into the partitions of their days in one transaction.
+
+    (exchange, symbol, timestamp) is the natural key of a record: a record that is already stored
+    (e.g., written by both the market poller and the history backfill) is updated to the new value,
+    and left untouched if the value is unchanged, so writing the same data twice never adds a row.
+
+    Args:
+        rows (list[tuple[str, str, int, float]]): (symbol, exchange, timestamp, open_interest) of each record.
+    """
+    if not rows:
+        return
+
+    db = await get_connection()
+    async with _lock:
+        symbol_ids = await _get_ids(db, "symbols", {row[0] for row in rows})
+        exchange_ids = await _get_ids(db, "exchanges", {row[1] for row in rows})
+
+        by_day: dict[int, list[tuple[int, int, int, float]]] = {}
+        for symbol, exchange, timestamp, open_interest in rows:
+            by_day.setdefault(timestamp // PARTITION_MS, []).append(
+                (exchange_ids[exchange], symbol_ids[symbol], timestamp, open_interest))
+
+        for day, day_rows in by_day.items():
+            await _create_partition(db, day)
+            await db.executemany(f"""
+                INSERT INTO {partition_name(day)} (exchange_id, symbol_id, timestamp, open_interest)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT (exchange_id, symbol_id, timestamp) DO UPDATE SET open_interest = excluded.open_interest
+                WHERE open_interest IS NOT excluded.open_interest
+            """, day_rows)
         await db.commit()
 
 
@@ -80,22 +311,35 @@ async def get_historical_oi(symbol: str, exchange: str, before_date: int) -> lis
     """
     Retrieves open interest history for a specific symbol and exchange within 24 hours before the given timestamp.
 
+    The rows are read from all partitions overlapping the time range. The partitions are listed and
+    queried under the lock, so `trim_old_records` cannot drop one of them in between.
+
     Args:
         symbol (str): Trading symbol.
         exchange (str): Exchange name.
         before_date (int): Upper bound timestamp in milliseconds.
 
     Returns:
-        list[dict]: List of historical open interest records as dictionaries, ordered by timestamp descending.
+        list[dict]: List of historical open interest records as dictionaries
+            (symbol, exchange, timestamp, open_interest), ordered by timestamp descending.
     """
     since_date = before_date - 24 * 60 * 60 *1000
-    async with aiosqlite.connect(config.DB_PATH) as db:
-        db.row_factory = aiosqlite.Row  # strings will be returned as dictionaries
-        async with db.execute("""
-            SELECT * FROM history_temp
-            WHERE symbol = ? AND exchange = ? AND timestamp <= ? AND timestamp >= ?
-            ORDER BY timestamp DESC
-        """, (symbol, exchange, before_date, since_date)) as cursor:
-            rows = await cursor.fetchall()
-            return [dict(row) for row in rows]
+    db = await get_connection()
+    exchange_id = await _find_id(db, "exchanges", exchange)
+    symbol_id = await _find_id(db, "symbols", symbol)
+    if exchange_id is None or symbol_id is None:
+        return []
 
+    async with _lock:
+        days = [day for day in range(since_date // PARTITION_MS, before_date // PARTITION_MS + 1) if day in _partitions]
+        if not days:
+            return []
+
+        query = " UNION ALL ".join(f"""
+            SELECT timestamp, open_interest FROM {partition_name(day)}
+            WHERE exchange_id = ? AND symbol_id = ? AND timestamp <= ? AND timestamp >= ?
+        """ for day in days)
+        async with db.execute(query + " ORDER BY timestamp DESC",
+                              (exchange_id, symbol_id, before_date, since_date) * len(days)) as cursor:
+            rows = await cursor.fetchall()
+    return [{"symbol": symbol, "exchange": exchange, **dict(row)} for row in rows]
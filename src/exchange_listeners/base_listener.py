@@ -4,10 +4,20 @@ base_listener.py
 Defines an abstract base class for exchange listeners used to fetch trading data such as symbols,
 open interest (OI), and OHLCV (Open/High/Low/Close/Volume) data. Concrete implementations
 should be created for each specific exchange (e.g., Binance, Bybit) by subclassing this interface.
+
+Each listener owns a long-lived aiohttp session with a tuned connector (keep-alive, connection limit,
+DNS cache), so requests on hot paths reuse already established TCP/TLS connections.
+Requests are paced by the listener's rate limiter (see rate_limiter.py).
 """
 
 from abc import ABC, abstractmethod
+import asyncio
+from typing import AsyncIterator
 import aiohttp
+from exchange_listeners.rate_limiter import RateLimiter
+from logging_config import get_logger
+
+logger = get_logger(__name__)
 
 class BaseExchangeListener(ABC):
     """
@@ -15,7 +25,87 @@ class BaseExchangeListener(ABC):
 
     Defines the required interface for fetching USDT trading pairs, open interest, and OHLCV data.
     Subclasses must implement all abstract methods using the exchange's API.
+
+    The pooled session is created on `start()` (or lazily on first use) and closed on `close()`.
+
+    Attributes:
+        rate_limiter (RateLimiter): Paces requests and backs off on rate limit responses.
+        OI_HISTORY_PAGE_LIMIT (int): Maximum number of OI points returned by one history request.
     """
+    CONNECTION_LIMIT = 100
+    DNS_CACHE_TTL_SECOND = 300
+    KEEPALIVE_TIMEOUT_SECOND = 60
+    MAX_RETRIES = 3
+    OI_HISTORY_PAGE_LIMIT = 500
+
+    def __init__(self, rate_limiter: RateLimiter):
+        self._session: aiohttp.ClientSession | None = None
+        self.rate_limiter = rate_limiter
+
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """
+        The listener's pooled HTTP session. Created on first access within a running event loop.
+        """
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.CONNECTION_LIMIT,
+                ttl_dns_cache=self.DNS_CACHE_TTL_SECOND,
+                keepalive_timeout=self.KEEPALIVE_TIMEOUT_SECOND
+            )
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+
+
+    async def start(self):
+        """Creates the pooled HTTP session."""
+        _ = self.session
+
+
+    async def close(self):
+        """Closes the pooled HTTP session and all its connections."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+
+    async def request_json(self, url: str, params: dict = None, weight: float = 1,
+                           session: aiohttp.ClientSession = None, endpoint: str = None) -> tuple[int, object]:
+        """
+        Sends a GET request paced by the rate limiter.
+
+        Rate limit responses are retried after the limiter's backoff, up to MAX_RETRIES times.
+
+        Args:
+            url (str): Request URL.
+            params (dict, optional): Query parameters.
+            weight (float, optional): Request weight as defined by the exchange. Defaults to 1.
+            session (aiohttp.ClientSession, optional): Defaults to the listener's pooled session.
+            endpoint (str, optional): Endpoint with a request limit of its own (see `RateLimiter.endpoint_buckets`).
+
+        Returns:
+            tuple[int, object]: HTTP status and the decoded JSON body (the response text if the status is not 200).
+
+        Raises:
+            aiohttp.ClientError, asyncio.TimeoutError: On network errors.
+        """
+        session = session or self.session
+
+        for attempt in range(self.MAX_RETRIES + 1):
+            await self.rate_limiter.acquire(weight, endpoint)
+            async with session.get(url, params=params, timeout=10) as resp:
+                payload = await resp.json() if resp.status == 200 else await resp.text()
+
+                if self.rate_limiter.is_rate_limited(resp.status, payload):
+                    self.rate_limiter.on_rate_limited(resp.headers)
+                    if attempt < self.MAX_RETRIES:
+                        continue
+                else:
+                    self.rate_limiter.on_success(resp.headers)
+
+                return resp.status, payload
+
 
     @abstractmethod
     async def fetch_usdt_symbols(self) -> list[str]:
@@ -44,6 +134,76 @@ class BaseExchangeListener(ABC):
         """
         pass
 
+    async def iter_oi_bulk(self, symbols: list[str], interval: str, limit: int,
+                           session: aiohttp.ClientSession = None) -> AsyncIterator[list[dict]]:
+        """
+        Fetches open interest data for many symbols, yielding each series as soon as it arrives,
+        so a slow symbol does not hold back the others.
+
+        The default implementation sends one `fetch_oi` request per symbol concurrently.
+        Exchanges with a bulk endpoint can override it to reduce the number of requests.
+
+        Args:
+            symbols (list[str]): Trading symbols (e.g., ["BTCUSDT", "ETHUSDT"]).
+            interval (str): Timeframe for the data (e.g., "5").
+            limit (int): Number of data points to retrieve per symbol.
+            session (aiohttp.ClientSession, optional): Defaults to the listener's pooled session.
+
+        Yields:
+            list[dict]: Non-empty open interest series of one symbol, in the `fetch_oi` format.
+        """
+        tasks = [asyncio.create_task(self.fetch_oi(symbol.upper(), interval, limit, session)) for symbol in symbols]
+        try:
+            for task in asyncio.as_completed(tasks):
+                try:
+                    coin = await task
+                except Exception as e:
+                    logger.warning(f"Error while receiving data: {e}")
+                    continue
+                if coin:
+                    yield coin
+        finally:
+            for task in tasks:
+                task.cancel()
+
+
+    async def fetch_oi_bulk(self, symbols: list[str], interval: str, limit: int,
+                            session: aiohttp.ClientSession = None) -> list[list[dict]]:
+        """
+        Fetches open interest data for many symbols at once (all series of `iter_oi_bulk`).
+
+        Args:
+            symbols (list[str]): Trading symbols (e.g., ["BTCUSDT", "ETHUSDT"]).
+            interval (str): Timeframe for the data (e.g., "5").
+            limit (int): Number of data points to retrieve per symbol.
+            session (aiohttp.ClientSession, optional): Defaults to the listener's pooled session.
+
+        Returns:
+            list[list[dict]]: Non-empty open interest series per symbol, in order of arrival.
+        """
+        return [coin async for coin in self.iter_oi_bulk(symbols, interval, limit, session)]
+
+
+    async def fetch_oi_history(self, symbol: str, interval: str, limit: int,
+                               session: aiohttp.ClientSession = None) -> list[dict]:
+        """
+        Fetches up to `limit` most recent open interest records of a symbol (e.g., a full day on startup).
+
+        The default implementation sends a single `fetch_oi` request, capped at OI_HISTORY_PAGE_LIMIT points.
+        Exchanges with smaller pages override it to follow their pagination.
+
+        Args:
+            symbol (str): Trading symbol (e.g., "BTCUSDT").
+            interval (str): Timeframe for the data (e.g., "5").
+            limit (int): Number of data points to retrieve.
+            session (aiohttp.ClientSession, optional): Defaults to the listener's pooled session.
+
+        Returns:
+            list[dict]: Open interest records in the `fetch_oi` format.
+        """
+        return await self.fetch_oi(symbol, interval, min(limit, self.OI_HISTORY_PAGE_LIMIT), session)
+
+
     @abstractmethod
     async def fetch_ohlcv(self, symbol: str, start_date: int, end_date: int, interval: str, session: aiohttp.ClientSession) -> list[dict]:
         """
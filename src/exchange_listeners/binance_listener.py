@@ -15,6 +15,7 @@ import aiohttp
 import asyncio
 from datetime import datetime
 from exchange_listeners.base_listener import BaseExchangeListener
+from exchange_listeners.rate_limiter import BinanceRateLimiter
 from app_logic.default_settings import MIN_INTERVAL
 from logging_config import get_logger
 
@@ -26,6 +27,12 @@ class BinanceListener(BaseExchangeListener):
     Exchange listener for Binance Futures that implements methods to retrieve market data.
     """
     BASE_URL = "https://fapi.binance.com"
+    KLINES_MAX_LIMIT = 1500  # /fapi/v1/klines
+    KLINES_WEIGHTS = ((100, 1), (500, 2), (1001, 5))  # (limit below, weight), 10 above
+    OI_HISTORY_PAGE_LIMIT = 500  # /futures/data/openInterestHist
+
+    def __init__(self):
+        super().__init__(rate_limiter=BinanceRateLimiter())
 
 
     async def fetch_usdt_symbols(self) -> list[str]:
@@ -39,17 +46,14 @@ class BinanceListener(BaseExchangeListener):
         symbols = []
 
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, timeout=10) as resp:
-                    if resp.status != 200:
-                        text = await resp.text()
-                        logger.warning(f"Failed to fetch symbols: {resp.status}, {text}")
-                        return []
-
-                    data = await resp.json()
-                    for s in data.get("symbols", []):
-                        if s.get("contractType") == "PERPETUAL" and s.get("quoteAsset") == "USDT":
-                            symbols.append(s["symbol"].upper())
+            status, data = await self.request_json(url)
+            if status != 200:
+                logger.warning(f"Failed to fetch symbols: {status}, {data}")
+                return []
+
+            for s in data.get("symbols", []):
+                if s.get("contractType") == "PERPETUAL" and s.get("quoteAsset") == "USDT":
+                    symbols.append(s["symbol"].upper())
 
         except (aiohttp.ClientError, asyncio.TimeoutError) as e:
             logger.error(f"Network error fetching USDT symbols: {e}")
@@ -68,12 +72,12 @@ class BinanceListener(BaseExchangeListener):
             symbol (str): Trading pair symbol (e.g., "BTCUSDT").
             interval (str): Time interval in minutes (e.g., "15").
             limit (int): Number of historical points to retrieve.
-            session (aiohttp.ClientSession, optional): Reusable HTTP session. Created if not provided.
+            session (aiohttp.ClientSession, optional): Defaults to the listener's pooled session.
 
         Returns:
             list[dict]: A list of open interest records with timestamps and values.
         """
-        url = f"{self.BASE_URL}/futures/data/openInterestHist"
+        url = f"{self.BASE_URL}{BinanceRateLimiter.OI_HISTORY_ENDPOINT}"
         symbol = symbol.upper()
         result = []
         params = {
@@ -81,50 +85,55 @@ class BinanceListener(BaseExchangeListener):
             "period": f"{interval}m",
             "limit": limit
         }
-        close_session = False
-
-        if session is None:
-            session = aiohttp.ClientSession()
-            close_session = True
+        session = session or self.session
 
         try:
-            async with session.get(url, params=params, timeout=10) as resp:
-                if resp.status != 200:
-                    text = await resp.text()
-                    logger.warning(f"OI request failed for {symbol}: {resp.status}, {text}")
-                    return []
-
-                data = await resp.json()
-
-                if not isinstance(data, list):
-                    logger.warning(f"OI data not list for {symbol}: {data}")
-                    return []
-
-                for entry in data:
-                    oi = entry.get("sumOpenInterest")
-                    timestamp = entry.get("timestamp")
-                    if oi is None or timestamp is None:
-                        continue
-                    dt = datetime.fromtimestamp(timestamp / 1000)
-                    result.append({
-                        "exchange": "Binance",
-                        "symbol": symbol,
-                        "datetime": dt,
-                        "timestamp": timestamp,
-                        "open_interest": float(oi),
-                    })
+            status, data = await self.request_json(url, params, session=session,
+                                                   endpoint=BinanceRateLimiter.OI_HISTORY_ENDPOINT)
+            if status != 200:
+                logger.warning(f"OI request failed for {symbol}: {status}, {data}")
+                return []
+
+            if not isinstance(data, list):
+                logger.warning(f"OI data not list for {symbol}: {data}")
+                return []
+
+            for entry in data:
+                oi = entry.get("sumOpenInterest")
+                timestamp = entry.get("timestamp")
+                if oi is None or timestamp is None:
+                    continue
+                dt = datetime.fromtimestamp(timestamp / 1000)
+                result.append({
+                    "exchange": "Binance",
+                    "symbol": symbol,
+                    "datetime": dt,
+                    "timestamp": timestamp,
+                    "open_interest": float(oi),
+                })
 
         except (aiohttp.ClientError, asyncio.TimeoutError) as e:
             logger.error(f"Network error fetching OI for {symbol}: {e}")
         except Exception as e:
             logger.error(f"Unexpected error fetching OI for {symbol}: {e}")
-        finally:
-            if close_session:
-                await session.close()
 
         return result
 
 
+    @classmethod
+    def klines_weight(cls, limit: int) -> int:
+        """
+        Returns the request weight Binance charges for /fapi/v1/klines with the given limit.
+
+        Args:
+            limit (int): Number of candles requested.
+        """
+        for below, weight in cls.KLINES_WEIGHTS:
+            if limit < below:
+                return weight
+        return 10
+
+
     async def fetch_ohlcv(self, symbol: str, start_date: int, end_date: int,
                           interval: str = MIN_INTERVAL,
                           session: aiohttp.ClientSession = None) -> list[dict]:
@@ -136,7 +145,7 @@ class BinanceListener(BaseExchangeListener):
             start_date (int): Start time in milliseconds since epoch.
             end_date (int): End time in milliseconds since epoch.
             interval (str): Time interval in minutes (e.g., "15").
-            session (aiohttp.ClientSession, optional): Reusable HTTP session. Created if not provided.
+            session (aiohttp.ClientSession, optional): Defaults to the listener's pooled session.
 
         Returns:
             list[dict]: A list of candle records with timestamp, close price, and volume.
@@ -144,45 +153,40 @@ class BinanceListener(BaseExchangeListener):
         url = f"{self.BASE_URL}/fapi/v1/klines"
         symbol = symbol.upper()
         result = []
+        # Request only the candles of the range, so the weight matches what Binance charges
+        limit = (int(end_date) - int(start_date)) // (int(interval) * 60 * 1000) + 1
+        limit = min(max(limit, 1), self.KLINES_MAX_LIMIT)
         params = {
             "symbol": symbol,
             "interval": f"{interval}m",
             "startTime": int(start_date),
-            "endTime": int(end_date)
+            "endTime": int(end_date),
+            "limit": limit,
         }
-        close_session = False
-
-        if session is None:
-            session = aiohttp.ClientSession()
-            close_session = True
+        session = session or self.session
 
         try:
-            async with session.get(url, params=params, timeout=10) as resp:
-                if resp.status != 200:
-                    text = await resp.text()
-                    logger.warning(f"OHLCV request failed for {symbol}: {resp.status}, {text}")
-                    return []
-
-                data = await resp.json()
-                if not isinstance(data, list):
-                    logger.warning(f"OHLCV data not list for {symbol}: {data}")
-                    return []
-
-                for candle in data:
-                    if len(candle) < 6:
-                        continue
-                    result.append({
-                        "timestamp": candle[0],
-                        "close": float(candle[4]),
-                        "volume": float(candle[5]),
-                    })
+            status, data = await self.request_json(url, params, weight=self.klines_weight(limit), session=session)
+            if status != 200:
+                logger.warning(f"OHLCV request failed for {symbol}: {status}, {data}")
+                return []
+
+            if not isinstance(data, list):
+                logger.warning(f"OHLCV data not list for {symbol}: {data}")
+                return []
+
+            for candle in data:
+                if len(candle) < 6:
+                    continue
+                result.append({
+                    "timestamp": candle[0],
+                    "close": float(candle[4]),
+                    "volume": float(candle[5]),
+                })
 
         except (aiohttp.ClientError, asyncio.TimeoutError) as e:
             logger.error(f"Network error fetching OHLCV for {symbol}: {e}")
         except Exception as e:
             logger.error(f"Unexpected error fetching OHLCV for {symbol}: {e}")
-        finally:
-            if close_session:
-                await session.close()
 
         return result
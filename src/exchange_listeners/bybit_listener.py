@@ -6,6 +6,7 @@ Provides an implementation of the BaseExchangeListener interface for Bybit Futur
 This module enables asynchronous retrieval of:
 - USDT-margined perpetual futures symbols
 - Historical Open Interest (OI) data
+- Bulk OI snapshots of all symbols from the tickers endpoint
 - Historical OHLCV (candlestick) data
 
 The class interacts with the official Bybit REST API and includes error logging.
@@ -13,9 +14,12 @@ The class interacts with the official Bybit REST API and includes error logging.
 
 import aiohttp
 import asyncio
+import time
 from datetime import datetime
+from typing import AsyncIterator
 from exchange_listeners.base_listener import BaseExchangeListener
-from app_logic.default_settings import MIN_INTERVAL
+from exchange_listeners.rate_limiter import BybitRateLimiter
+from app_logic.default_settings import MIN_INTERVAL, TICKER_SETTLE_WINDOW_SECOND
 from logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -24,8 +28,28 @@ logger = get_logger(__name__)
 class BybitListener(BaseExchangeListener):
     """
     Exchange listener for Bybit Futures that implements methods to fetch market data.
+
+    In bulk mode, OI series are built from one `/v5/market/tickers` snapshot per candle
+    instead of one `/v5/market/open-interest` request per symbol. Per-symbol requests are
+    only used to backfill symbols whose series has gaps (e.g., right after startup).
+
+    Attributes:
+        bulk_oi (bool): Whether `iter_oi_bulk` (and `fetch_oi_bulk`) use the tickers endpoint.
+        oi_series (dict[str, dict[int, dict]]): Recent OI records per symbol, keyed by timestamp.
+        ticker_candle (int | None): Timestamp of the latest candle stamped from a tickers snapshot.
     """
     BASE_URL = "https://api.bybit.com"
+    OI_HISTORY_PAGE_LIMIT = 200  # /v5/market/open-interest
+
+    def __init__(self, bulk_oi: bool = True):
+        """
+        Args:
+            bulk_oi (bool, optional): Enables the bulk ingestion mode. Defaults to True.
+        """
+        super().__init__(rate_limiter=BybitRateLimiter())
+        self.bulk_oi = bulk_oi
+        self.oi_series: dict[str, dict[int, dict]] = {}
+        self.ticker_candle: int | None = None
 
 
     async def fetch_usdt_symbols(self) -> list[str]:
@@ -40,21 +64,18 @@ class BybitListener(BaseExchangeListener):
         symbols = []
 
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, params=params, timeout=10) as resp:
-                    if resp.status != 200:
-                        text = await resp.text()
-                        logger.warning(f"Failed to fetch Bybit symbols: {resp.status}, {text}")
-                        return []
-
-                    data = await resp.json()
-                    if not isinstance(data, dict) or data.get("retCode") != 0:
-                        logger.warning(f"Invalid Bybit symbols response: {data}")
-                        return []
-
-                    for s in data["result"]["list"]:
-                        if s["quoteCoin"] == "USDT" and s["contractType"] == "LinearPerpetual":
-                            symbols.append(s["symbol"].upper())
+            status, data = await self.request_json(url, params)
+            if status != 200:
+                logger.warning(f"Failed to fetch Bybit symbols: {status}, {data}")
+                return []
+
+            if not isinstance(data, dict) or data.get("retCode") != 0:
+                logger.warning(f"Invalid Bybit symbols response: {data}")
+                return []
+
+            for s in data["result"]["list"]:
+                if s["quoteCoin"] == "USDT" and s["contractType"] == "LinearPerpetual":
+                    symbols.append(s["symbol"].upper())
 
         except (aiohttp.ClientError, asyncio.TimeoutError) as e:
             logger.error(f"Network error fetching Bybit symbols: {e}")
@@ -73,7 +94,7 @@ class BybitListener(BaseExchangeListener):
             symbol (str): Trading pair symbol (e.g., "BTCUSDT").
             interval (str): Time interval in minutes (e.g., "15").
             limit (int): Number of historical points to retrieve.
-            session (aiohttp.ClientSession, optional): Reusable HTTP session. Created if not provided.
+            session (aiohttp.ClientSession, optional): Defaults to the listener's pooled session.
 
         Returns:
             list[dict]: A list of OI records with timestamps and values.
@@ -87,46 +108,234 @@ class BybitListener(BaseExchangeListener):
             "intervalTime": f"{interval}min",
             "limit": str(limit)
         }
+        session = session or self.session
 
-        close_session = False
-        if session is None:
-            session = aiohttp.ClientSession()
-            close_session = True
+        try:
+            status, data = await self.request_json(url, params, session=session)
+            if status != 200:
+                logger.warning(f"OI request failed for {symbol}: {status}, {data}")
+                return []
+
+            if not isinstance(data, dict) or data.get("retCode") != 0:
+                logger.warning(f"Invalid OI data for {symbol}: {data}")
+                return []
+
+            for entry in data["result"]["list"]:
+                timestamp = int(entry["timestamp"])
+                dt = datetime.fromtimestamp(timestamp / 1000)
+                result.append({
+                    "exchange": "Bybit",
+                    "symbol": symbol,
+                    "datetime": dt,
+                    "timestamp": timestamp,
+                    "open_interest": float(entry["openInterest"]),
+                })
+
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error(f"Network error fetching OI for {symbol}: {e}")
+        except Exception as e:
+            logger.error(f"Unexpected error fetching OI for {symbol}: {e}")
+
+        return result
+
+
+    async def fetch_oi_history(self, symbol: str, interval: str = MIN_INTERVAL, limit: int = 288,
+                               session: aiohttp.ClientSession = None) -> list[dict]:
+        """
+        Fetch up to `limit` most recent OI records for a trading pair, following the response cursor
+        in pages of OI_HISTORY_PAGE_LIMIT points.
+
+        Args:
+            symbol (str): Trading pair symbol (e.g., "BTCUSDT").
+            interval (str): Time interval in minutes (e.g., "5").
+            limit (int): Number of historical points to retrieve.
+            session (aiohttp.ClientSession, optional): Defaults to the listener's pooled session.
+
+        Returns:
+            list[dict]: A list of OI records with timestamps and values, most recent first.
+                Pages received before an error are kept.
+        """
+        url = f"{self.BASE_URL}/v5/market/open-interest"
+        symbol = symbol.upper()
+        result = []
+        cursor = None
+        session = session or self.session
 
         try:
-            async with session.get(url, params=params, timeout=10) as resp:
-                if resp.status != 200:
-                    text = await resp.text()
-                    logger.warning(f"OI request failed for {symbol}: {resp.status}, {text}")
-                    return []
+            while len(result) < limit:
+                params = {
+                    "category": "linear",
+                    "symbol": symbol,
+                    "intervalTime": f"{interval}min",
+                    "limit": str(min(limit - len(result), self.OI_HISTORY_PAGE_LIMIT))
+                }
+                if cursor:
+                    params["cursor"] = cursor
+
+                status, data = await self.request_json(url, params, session=session)
+                if status != 200:
+                    logger.warning(f"OI history request failed for {symbol}: {status}, {data}")
+                    break
 
-                data = await resp.json()
                 if not isinstance(data, dict) or data.get("retCode") != 0:
-                    logger.warning(f"Invalid OI data for {symbol}: {data}")
-                    return []
+                    logger.warning(f"Invalid OI history data for {symbol}: {data}")
+                    break
 
-                for entry in data["result"]["list"]:
+                entries = data["result"]["list"]
+                for entry in entries:
                     timestamp = int(entry["timestamp"])
-                    dt = datetime.fromtimestamp(timestamp / 1000)
                     result.append({
                         "exchange": "Bybit",
                         "symbol": symbol,
-                        "datetime": dt,
+                        "datetime": datetime.fromtimestamp(timestamp / 1000),
                         "timestamp": timestamp,
                         "open_interest": float(entry["openInterest"]),
                     })
 
+                cursor = data["result"].get("nextPageCursor")
+                if not entries or not cursor:
+                    break
+
         except (aiohttp.ClientError, asyncio.TimeoutError) as e:
-            logger.error(f"Network error fetching OI for {symbol}: {e}")
+            logger.error(f"Network error fetching OI history for {symbol}: {e}")
         except Exception as e:
-            logger.error(f"Unexpected error fetching OI for {symbol}: {e}")
-        finally:
-            if close_session:
-                await session.close()
+            logger.error(f"Unexpected error fetching OI history for {symbol}: {e}")
+
+        return result[:limit]
+
+
+    async def fetch_tickers(self, session: aiohttp.ClientSession = None) -> dict[str, dict]:
+        """
+        Fetch the current ticker of every linear symbol from Bybit in a single request.
+
+        Args:
+            session (aiohttp.ClientSession, optional): Defaults to the listener's pooled session.
+
+        Returns:
+            dict[str, dict]: Maps symbols to their 'open_interest', 'price' and 'turnover_24h'.
+                Empty if the request failed.
+        """
+        url = f"{self.BASE_URL}/v5/market/tickers"
+        params = {"category": "linear"}
+        result = {}
+        session = session or self.session
+
+        try:
+            status, data = await self.request_json(url, params, session=session)
+            if status != 200:
+                logger.warning(f"Tickers request failed: {status}, {data}")
+                return {}
+
+            if not isinstance(data, dict) or data.get("retCode") != 0:
+                logger.warning(f"Invalid tickers data: {data}")
+                return {}
+
+            for entry in data["result"]["list"]:
+                if not entry.get("openInterest"):
+                    continue
+                result[entry["symbol"].upper()] = {
+                    "open_interest": float(entry["openInterest"]),
+                    "price": float(entry.get("lastPrice") or "nan"),
+                    "turnover_24h": float(entry.get("turnover24h") or "nan"),
+                }
+
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error(f"Network error fetching tickers: {e}")
+        except Exception as e:
+            logger.error(f"Unexpected error fetching tickers: {e}")
 
         return result
 
 
+    async def iter_oi_bulk(self, symbols: list[str], interval: str = MIN_INTERVAL, limit: int = 7,
+                           session: aiohttp.ClientSession = None) -> AsyncIterator[list[dict]]:
+        """
+        Fetch OI series for many symbols with a single tickers request per candle.
+
+        The tickers report the current OI, which within TICKER_SETTLE_WINDOW_SECOND after a candle
+        boundary is the OI at that boundary: it is stamped with the open time of the current candle
+        (the timestamp the history endpoint gives the same value) and added to the series kept by
+        the listener. Later in the candle the tickers hold a mid-candle value and are not used: the
+        series then end at the previous candle (or at the candle already stamped in the window).
+
+        Complete series are yielded right away; symbols missing any of the last `limit` candles are
+        backfilled with per-symbol `fetch_oi` requests and yielded as they arrive. Falls back to
+        per-symbol requests entirely if bulk mode is disabled or the tickers request fails.
+
+        Args:
+            symbols (list[str]): Trading pair symbols.
+            interval (str): Time interval in minutes (e.g., "5").
+            limit (int): Number of historical points to return per symbol.
+            session (aiohttp.ClientSession, optional): Defaults to the listener's pooled session.
+
+        Yields:
+            list[dict]: OI series of one symbol, sorted by timestamp descending.
+        """
+        if not self.bulk_oi:
+            async for coin in super().iter_oi_bulk(symbols, interval, limit, session):
+                yield coin
+            return
+
+        tickers = await self.fetch_tickers(session)
+        if not tickers:
+            async for coin in super().iter_oi_bulk(symbols, interval, limit, session):
+                yield coin
+            return
+
+        step = int(interval) * 60 * 1000
+        now_ms = int(time.time() * 1000)
+        candle_ts = now_ms // step * step
+        settled = now_ms - candle_ts <= TICKER_SETTLE_WINDOW_SECOND * 1000
+        if settled:
+            self.ticker_candle = candle_ts
+        latest = candle_ts if self.ticker_candle == candle_ts else candle_ts - step
+
+        expected = [latest - k * step for k in range(limit)]
+        dt = datetime.fromtimestamp(candle_ts / 1000)
+        gaps = []
+
+        requested = {symbol.upper() for symbol in symbols}
+        for symbol in [s for s in self.oi_series if s not in requested]:
+            del self.oi_series[symbol]
+
+        for symbol in symbols:
+            symbol = symbol.upper()
+            series = self.oi_series.setdefault(symbol, {})
+            ticker = tickers.get(symbol)
+            if ticker and settled:
+                series[candle_ts] = {
+                    "exchange": "Bybit",
+                    "symbol": symbol,
+                    "datetime": dt,
+                    "timestamp": candle_ts,
+                    "open_interest": ticker["open_interest"],
+                    "price": ticker["price"],
+                }
+
+            # Keep only the candles that can still be requested
+            for timestamp in [t for t in series if t < expected[-1]]:
+                del series[timestamp]
+
+            if all(timestamp in series for timestamp in expected):
+                yield [series[timestamp] for timestamp in expected]
+            else:
+                gaps.append(symbol)
+
+        if gaps:
+            logger.debug(f"Bybit bulk OI: backfilling {len(gaps)} of {len(symbols)} symbols")
+            async for coin in super().iter_oi_bulk(gaps, interval, limit, session):
+                # A point of the current candle reported after the settle window is a mid-candle value
+                coin = [point for point in coin if point["timestamp"] <= latest]
+                if not coin:
+                    continue
+                series = self.oi_series.setdefault(coin[0]["symbol"], {})
+                for point in coin:
+                    series.setdefault(point["timestamp"], point)
+                if all(timestamp in series for timestamp in expected):
+                    coin = [series[timestamp] for timestamp in expected]
+                yield coin
+
+
     async def fetch_ohlcv(self, symbol: str, start_date: int, end_date: int,
                           interval: str = MIN_INTERVAL,
                           session: aiohttp.ClientSession = None) -> list[dict]:
@@ -138,7 +347,7 @@ class BybitListener(BaseExchangeListener):
             start_date (int): Start time in milliseconds since epoch.
             end_date (int): End time in milliseconds since epoch.
             interval (str): Time interval in Bybit format (e.g., "15").
-            session (aiohttp.ClientSession, optional): Reusable HTTP session. Created if not provided.
+            session (aiohttp.ClientSession, optional): Defaults to the listener's pooled session.
 
         Returns:
             list[dict]: A list of candle data records with timestamp, close price, and volume.
@@ -153,39 +362,30 @@ class BybitListener(BaseExchangeListener):
             "start": int(start_date),
             "end": int(end_date)
         }
-
-        close_session = False
-        if session is None:
-            session = aiohttp.ClientSession()
-            close_session = True
+        session = session or self.session
 
         try:
-            async with session.get(url, params=params, timeout=10) as resp:
-                if resp.status != 200:
-                    text = await resp.text()
-                    logger.warning(f"OHLCV request failed for {symbol}: {resp.status}, {text}")
-                    return []
-
-                data = await resp.json()
-                if not isinstance(data, dict) or data.get("retCode") != 0:
-                    logger.warning(f"Invalid OHLCV data for {symbol}: {data}")
-                    return []
-
-                for candle in data["result"]["list"]:
-                    if len(candle) < 6:
-                        continue
-                    result.append({
-                        "timestamp": int(candle[0]),
-                        "close": float(candle[4]),
-                        "volume": float(candle[5]),
-                    })
+            status, data = await self.request_json(url, params, session=session)
+            if status != 200:
+                logger.warning(f"OHLCV request failed for {symbol}: {status}, {data}")
+                return []
+
+            if not isinstance(data, dict) or data.get("retCode") != 0:
+                logger.warning(f"Invalid OHLCV data for {symbol}: {data}")
+                return []
+
+            for candle in data["result"]["list"]:
+                if len(candle) < 6:
+                    continue
+                result.append({
+                    "timestamp": int(candle[0]),
+                    "close": float(candle[4]),
+                    "volume": float(candle[5]),
+                })
 
         except (aiohttp.ClientError, asyncio.TimeoutError) as e:
             logger.error(f"Network error fetching OHLCV for {symbol}: {e}")
         except Exception as e:
             logger.error(f"Unexpected error fetching OHLCV for {symbol}: {e}")
-        finally:
-            if close_session:
-                await session.close()
 
         return result
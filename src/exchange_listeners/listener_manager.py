@@ -4,6 +4,9 @@ listener_manager.py
 This module defines the `ListenerManager` class, which is responsible for managing
 exchange listeners (e.g., Binance, Bybit). It provides functionality to retrieve
 active listeners, all listeners, or specific ones based on the enabled exchanges.
+
+Listener instances are shared by all managers, so the whole process uses a single
+pooled HTTP session per exchange.
 """
 
 from exchange_listeners.binance_listener import BinanceListener
@@ -13,6 +16,14 @@ from logging_config import get_logger
 
 logger = get_logger(__name__)
 
+LISTENERS = {
+    "binance": BinanceListener(),
+    "bybit": BybitListener(),
+}
+"""
+dict: Process-wide listener instances per exchange, shared by all ListenerManager objects.
+"""
+
 
 class ListenerManager:
     """
@@ -30,10 +41,7 @@ class ListenerManager:
             enabled_exchanges (list[str]): List of exchange names to activate (e.g., ["binance", "bybit"]).
         """
         self.enabled_exchanges = [e.lower() for e in enabled_exchanges]
-        self.exchange_map = {
-            "binance": BinanceListener(),
-            "bybit": BybitListener(),
-        }
+        self.exchange_map = LISTENERS
 
     def get_listener(self, exchange_name: str) -> Any | None:
         """
@@ -66,3 +74,13 @@ class ListenerManager:
         return [{name: self.exchange_map[name]} for name in self.enabled_exchanges]
 
 
+async def start_listeners():
+    """Opens the pooled HTTP sessions of all exchange listeners."""
+    for listener in LISTENERS.values():
+        await listener.start()
+
+
+async def close_listeners():
+    """Closes the pooled HTTP sessions of all exchange listeners."""
+    for listener in LISTENERS.values():
+        await listener.close()
@@ -0,0 +1,254 @@
+"""
+rate_limiter.py
+
+Per-exchange request pacing for the exchange listeners.
+
+Each listener owns a rate limiter built on a token bucket. Requests consume tokens according
+to their weight, so bursts such as "fetch every symbol at once" are spread out to the sustained
+rate the exchange allows. The limiter also adapts to the exchange's feedback:
+- endpoints with a request limit of their own (Binance `/futures/data/openInterestHist`) are
+  additionally paced by a bucket per endpoint;
+- usage headers returned with every response (Binance `X-MBX-USED-WEIGHT-1M`,
+  Bybit `X-Bapi-Limit-Status` / `X-Bapi-Limit-Reset-Timestamp`) pause requests before the limit is hit;
+- rate limit responses (HTTP 429/418 on Binance, HTTP 403/429 or retCode 10006 on Bybit)
+  block requests for the `Retry-After` period and halve the request rate, which then
+  recovers gradually with successful responses.
+
+Classes:
+    TokenBucket: Asynchronous token bucket.
+    RateLimiter: Adaptive limiter with backoff, base class for exchange-specific limiters.
+    BinanceRateLimiter: Reads Binance request weight headers.
+    BybitRateLimiter: Reads Bybit limit headers.
+"""
+
+import asyncio
+import time
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class TokenBucket:
+    """
+    Asynchronous token bucket.
+
+    Attributes:
+        rate (float): Tokens added per second.
+        capacity (float): Maximum number of tokens (burst size).
+        tokens (float): Tokens currently available.
+    """
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+
+    async def acquire(self, tokens: float = 1):
+        """
+        Waits until the requested number of tokens is available and consumes them.
+
+        Args:
+            tokens (float, optional): Number of tokens to consume. Defaults to 1.
+        """
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return
+                await asyncio.sleep((tokens - self.tokens) / self.rate)
+
+
+    async def wait_full(self):
+        """
+        Waits until the bucket is full again without consuming tokens.
+        """
+        self._refill()
+        while self.tokens < self.capacity:
+            await asyncio.sleep((self.capacity - self.tokens) / self.rate)
+            self._refill()
+
+
+
+class RateLimiter:
+    """
+    Adaptive per-exchange rate limiter.
+
+    Attributes:
+        name (str): Exchange name used in log messages.
+        base_rate (float): Sustained request weight per second when no limit was hit.
+        bucket (TokenBucket): Token bucket pacing the requests.
+        endpoint_buckets (dict[str, TokenBucket]): Token buckets of the endpoints with a limit of their own,
+            one token per request.
+        blocked_until (float): Monotonic time until which no request may be sent.
+    """
+    RATE_LIMIT_STATUSES = (429,)
+    DEFAULT_RETRY_AFTER_SECOND = 5
+    MIN_RATE_FACTOR = 0.1
+    RECOVERY_STEP = 0.05
+
+    def __init__(self, name: str, rate: float, capacity: float):
+        self.name = name
+        self.base_rate = rate
+        self.bucket = TokenBucket(rate, capacity)
+        self.endpoint_buckets: dict[str, TokenBucket] = {}
+        self.blocked_until = 0.0
+
+
+    async def acquire(self, weight: float = 1, endpoint: str = None):
+        """
+        Waits for a backoff period to end (if any) and for enough tokens for the request.
+
+        Args:
+            weight (float, optional): Weight of the request. Defaults to 1.
+            endpoint (str, optional): Endpoint of the request; paced by its own bucket too if it has one.
+        """
+        endpoint_bucket = self.endpoint_buckets.get(endpoint)
+        if endpoint_bucket is not None:
+            await endpoint_bucket.acquire()
+        while (delay := self.blocked_until - time.monotonic()) > 0:
+            await asyncio.sleep(delay)
+        await self.bucket.acquire(weight)
+
+
+    def block(self, seconds: float):
+        """
+        Blocks all requests for the given number of seconds.
+
+        Args:
+            seconds (float): Duration of the pause.
+        """
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+
+    def is_rate_limited(self, status: int, payload) -> bool:
+        """
+        Checks whether a response means that the rate limit was exceeded.
+
+        Args:
+            status (int): HTTP status code.
+            payload: Decoded JSON body or response text.
+        """
+        return status in self.RATE_LIMIT_STATUSES
+
+
+    def on_rate_limited(self, headers):
+        """
+        Backs off after a rate limit response: blocks requests for the `Retry-After` period
+        and halves the request rate.
+
+        Args:
+            headers: Response headers.
+        """
+        try:
+            retry_after = float(headers.get("Retry-After", self.DEFAULT_RETRY_AFTER_SECOND))
+        except ValueError:
+            retry_after = self.DEFAULT_RETRY_AFTER_SECOND
+
+        self.block(retry_after)
+        self.bucket.rate = max(self.bucket.rate / 2, self.base_rate * self.MIN_RATE_FACTOR)
+        logger.warning(f"{self.name} rate limit hit: pausing {retry_after:.0f}s, "
+                       f"rate lowered to {self.bucket.rate:.1f}/s")
+
+
+    def on_success(self, headers):
+        """
+        Updates the limiter after a successful response: recovers the request rate
+        and applies the exchange's usage headers.
+
+        Args:
+            headers: Response headers.
+        """
+        if self.bucket.rate < self.base_rate:
+            self.bucket.rate = min(self.base_rate, self.bucket.rate + self.base_rate * self.RECOVERY_STEP)
+        self.update_from_headers(headers)
+
+
+    def update_from_headers(self, headers):
+        """
+        Applies exchange-specific usage headers. Does nothing by default.
+
+        Args:
+            headers: Response headers.
+        """
+        pass
+
+
+
+class BinanceRateLimiter(RateLimiter):
+    """
+    Rate limiter for Binance Futures.
+
+    Binance reports the request weight used in the current minute in `X-MBX-USED-WEIGHT-1M`.
+    When it gets close to the limit, requests are paused until the next minute starts.
+    `/futures/data/openInterestHist` is also limited to 1000 requests per 5 minutes per IP,
+    independently of the weight; its bucket never allows more than 90% of that in any 5 minutes.
+    HTTP 418 means the IP is banned after ignoring 429 responses.
+    """
+    RATE_LIMIT_STATUSES = (429, 418)
+    WEIGHT_LIMIT_1M = 2400
+    SAFETY_RATIO = 0.9
+    OI_HISTORY_ENDPOINT = "/futures/data/openInterestHist"
+    OI_HISTORY_LIMIT_5M = 1000
+
+    def __init__(self):
+        super().__init__("Binance", rate=self.WEIGHT_LIMIT_1M * 0.8 / 60, capacity=100)
+        # Burst plus 5 minutes of refill stays within 90% of the endpoint limit; the burst lets
+        # a poll cycle of all symbols start at full speed
+        self.endpoint_buckets[self.OI_HISTORY_ENDPOINT] = TokenBucket(
+            rate=self.OI_HISTORY_LIMIT_5M * 0.5 / 300, capacity=self.OI_HISTORY_LIMIT_5M * 0.4)
+
+
+    def update_from_headers(self, headers):
+        used = headers.get("X-MBX-USED-WEIGHT-1M")
+        if used is None:
+            return
+
+        if int(used) >= self.WEIGHT_LIMIT_1M * self.SAFETY_RATIO:
+            pause = 60 - time.time() % 60
+            self.block(pause)
+            logger.warning(f"Binance used weight {used}/{self.WEIGHT_LIMIT_1M}: pausing {pause:.0f}s")
+
+
+
+class BybitRateLimiter(RateLimiter):
+    """
+    Rate limiter for Bybit.
+
+    Bybit reports the remaining requests of the current window in `X-Bapi-Limit-Status`
+    and the end of the window in `X-Bapi-Limit-Reset-Timestamp` (milliseconds).
+    Exceeding the IP limit returns HTTP 403, exceeding the API limit returns retCode 10006.
+    """
+    RATE_LIMIT_STATUSES = (403, 429)
+    RATE_LIMIT_RET_CODE = 10006
+    MIN_REMAINING = 2
+
+    def __init__(self):
+        super().__init__("Bybit", rate=50, capacity=100)
+
+
+    def is_rate_limited(self, status: int, payload) -> bool:
+        if super().is_rate_limited(status, payload):
+            return True
+        return isinstance(payload, dict) and payload.get("retCode") == self.RATE_LIMIT_RET_CODE
+
+
+    def update_from_headers(self, headers):
+        remaining = headers.get("X-Bapi-Limit-Status")
+        reset = headers.get("X-Bapi-Limit-Reset-Timestamp")
+        if remaining is None or reset is None:
+            return
+
+        if int(remaining) <= self.MIN_REMAINING:
+            pause = int(reset) / 1000 - time.time()
+            if pause > 0:
+                self.block(pause)
+                logger.debug(f"Bybit limit window exhausted: pausing {pause:.2f}s")
@@ -4,7 +4,7 @@ main.py
 Entry point of the Telegram bot application.
 
 This module:
-- Initializes the database.
+- Initializes the databases.
 - Sets up Telegram bot commands.
 - Starts the user activity monitor.
 - Registers all command routers.
@@ -16,9 +16,16 @@ import asyncio
 from bot.bot_init import bot_, dp
 from bot.menu import set_commands
 from db.bot_users import init_db
+from db import hist_signal_db
+from bot.dispatch_queue import dispatch_queue
 from bot.commands import start, settings, exchanges
 from app_logic.user_activity import monitor_user_activity
 from app_logic.symbol_list_handler import symbol_list
+from app_logic.market_poller import market_poller
+from app_logic.history_backfill import history_backfill
+from app_logic.market_snapshot import load_snapshot, save_snapshot, run_snapshots
+from app_logic.scanner.scanner import scan_coordinator
+from exchange_listeners.listener_manager import start_listeners, close_listeners
 from app_logic import user_activity
 from logging_config import get_logger
 
@@ -29,17 +36,35 @@ async def main():
     """
     Main asynchronous function that initializes and starts the bot.
 
-    - Initializes the SQLite database for storing user settings.
+    - Initializes the SQLite databases for storing user settings and the OI history
+      (before anything writes history).
+    - Opens the pooled HTTP sessions of the exchange listeners (closed on shutdown
+      together with the history database connection and the message dispatch queue).
     - Sets bot commands for the Telegram interface.
+    - Restores the market data snapshot and backfills the OI history missing since then
+      (the full last 24h of all symbols without a snapshot). Snapshots are saved periodically and on shutdown.
+    - Launches the shared market poller and the scan coordinator serving all users.
     - Launches a background task to monitor inactive users.
     - Registers command handlers (routers) for user interaction.
     - Clears any pending updates and starts polling the Telegram API.
     """
     await init_db()
+    await hist_signal_db.init_db()
     await set_commands()
+    await start_listeners()
 
     asyncio.create_task(symbol_list.get_symbol_list())
 
+    # Restore the market data of the previous run and load the missing OI history;
+    # signal counting waits until it is complete
+    load_snapshot()
+    history_backfill.start()
+    asyncio.create_task(run_snapshots())
+
+    # Fetch OI data once per candle and scan it for all users in a single task
+    asyncio.create_task(market_poller.run_poller())
+    asyncio.create_task(scan_coordinator.run_coordinator())
+
     # Start user activity monitor in the background (checks for inactive users)
     asyncio.create_task(monitor_user_activity())
 
@@ -50,8 +75,14 @@ async def main():
     dp.include_router(user_activity.router)
 
     # Start polling the Telegram API
-    await bot_.delete_webhook(drop_pending_updates=True)
-    await dp.start_polling(bot_)
+    try:
+        await bot_.delete_webhook(drop_pending_updates=True)
+        await dp.start_polling(bot_)
+    finally:
+        await dispatch_queue.stop()
+        await close_listeners()
+        await hist_signal_db.close_db()
+        await save_snapshot()
 
 
 